@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from app.api.responses import json_response
 from app.dependencies import get_actor, get_bigquery, get_settings
 from app.models import ApiResponse, BatchVariantCreate
 from app.services.bigquery_service import BigQueryService
@@ -19,7 +20,7 @@ def create_batch_variant(
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Restrict batch-variant creation to users who may edit batch-selection data.
     require_permission(request, "batch_selection.edit")
     weight_variant = bigquery.get_weight(payload.set_code, payload.weight_code)
@@ -53,7 +54,7 @@ def create_batch_variant(
     existing = bigquery.get_batch_variant_by_hash(payload.set_code, payload.weight_code, batch_hash)
     if existing:
         base_code = f"{payload.set_code} {payload.weight_code} {existing}"
-        return ApiResponse(ok=True, data={"batch_variant_code": existing, "base_code": base_code})
+        return json_response(ApiResponse(ok=True, data={"batch_variant_code": existing, "base_code": base_code}))
 
     scope = f"{payload.set_code} {payload.weight_code}"
     next_value = bigquery.allocate_counter("batch_variant_code", scope, settings.code_start_batch)
@@ -67,7 +68,7 @@ def create_batch_variant(
         actor.email if actor else None,
     )
     base_code = f"{payload.set_code} {payload.weight_code} {batch_variant_code}"
-    return ApiResponse(ok=True, data={"batch_variant_code": batch_variant_code, "base_code": base_code})
+    return json_response(ApiResponse(ok=True, data={"batch_variant_code": batch_variant_code, "base_code": base_code}))
 
 
 @router.get("", response_model=ApiResponse)
@@ -76,8 +77,8 @@ def list_batch_variants(
     weight_code: str,
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Normalize lookup codes so lowercase user entry still resolves matching batch variants.
     require_permission(request, "batch_selection.view")
     rows = bigquery.list_batch_variants(set_code.strip().upper(), weight_code.strip().upper())
-    return ApiResponse(ok=True, data={"items": rows})
+    return json_response(ApiResponse(ok=True, data={"items": rows}))
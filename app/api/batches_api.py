@@ -4,8 +4,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, Request, Response, UploadFile, status
 
+from app.api.responses import json_response
 from app.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.dependencies import get_actor, get_bigquery, get_settings, get_storage
 from app.models import ApiResponse, IngredientBatchCreate, UploadConfirm, UploadRequest
@@ -29,7 +30,7 @@ def create_batch(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Enforce batch edit access before any batch record is created.
     require_permission(request, "batches.edit")
     ingredient = bigquery.get_ingredient(payload.sku)
@@ -69,7 +70,7 @@ def create_batch(
             "archived_by": None,
         }
     )
-    return ApiResponse(ok=True, data={"batch": payload.dict(), "owner": actor.email if actor else None})
+    return json_response(ApiResponse(ok=True, data={"batch": payload.model_dump(), "owner": actor.email if actor else None}))
 
 
 @router.get("", response_model=ApiResponse)
@@ -80,19 +81,27 @@ def list_batches(
     include_archived: bool = False,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Enforce batch listing access server-side for the supporting API endpoint.
     require_permission(request, "batches.view")
     # Support all-batch listing with optional SKU and batch-code filters for scalable lookup workflows.
-    rows, total = bigquery.list_batches_paginated(
-        sku=sku.strip() if sku else None,
-        batch_code=batch_code.strip() if batch_code else None,
-        include_archived=include_archived,
-        page=page,
-        page_size=page_size,
-    )
-    return ApiResponse(ok=True, data={"items": rows, "total": total, "page": page, "page_size": page_size})
+    try:
+        rows, total, next_cursor = bigquery.list_batches_paginated(
+            sku=sku.strip() if sku else None,
+            batch_code=batch_code.strip() if batch_code else None,
+            include_archived=include_archived,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return json_response(ApiResponse(
+        ok=True,
+        data={"items": rows, "total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor},
+    ))
 
 
 @router.patch("/{sku}/{batch_code}/archive", response_model=ApiResponse)
@@ -103,7 +112,7 @@ def archive_batch(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Restrict archive state changes to admins because this controls what appears in active formulation flows.
     access = require_permission(request, "batches.edit")
     if not access.is_admin:
@@ -114,22 +123,19 @@ def archive_batch(
     archived = bool(payload.get("archived", True))
     bigquery.set_batch_archived(sku, batch_code, archived, actor.email if actor else None)
     updated = bigquery.get_batch(sku, batch_code)
-    return ApiResponse(ok=True, data={"batch": updated})
+    return json_response(ApiResponse(ok=True, data={"batch": updated}))
 
 
 @router.get("/{sku}/{batch_code}", response_model=ApiResponse)
-def get_batch_detail(sku: str, batch_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def get_batch_detail(sku: str, batch_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Load the batch record first so we can return a clear 404 for unknown batch lookups.
     access = require_permission(request, "batches.view")
     batch = bigquery.get_batch(sku, batch_code)
     if not batch:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
-    # Fetch formulations that reference this exact SKU + batch code pairing.
-    formulations = bigquery.list_formulations_by_batch(sku, batch_code)
-    # Strip dry-weight payloads for users who are not allowed to view formulation percentages.
-    if not can_view_dry_weights(access):
-        formulations = bigquery.strip_dry_weight_data(formulations)
-    return ApiResponse(ok=True, data={"batch": batch, "formulations": formulations})
+    # Fetch formulations that reference this exact SKU + batch code pairing, omitting dry weights for users who cannot view percentages.
+    formulations = bigquery.list_formulations_by_batch(sku, batch_code, include_dry_weights=can_view_dry_weights(access))
+    return json_response(ApiResponse(ok=True, data={"batch": batch, "formulations": formulations}))
 
 
 @router.post("/{sku}/{batch_code}/coa", response_model=ApiResponse)
@@ -142,7 +148,7 @@ async def upload_coa(
     bigquery: BigQueryService = Depends(get_bigquery),
     storage: StorageService = Depends(get_storage),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Restrict CoA uploads to users with batch edit rights.
     require_permission(request, "batches.edit")
     batch = bigquery.get_batch(sku, batch_code)
@@ -173,7 +179,7 @@ async def upload_coa(
     if previous_object_path and previous_object_path != object_path:
         storage.delete_object(settings.bucket_specs, previous_object_path)
 
-    return ApiResponse(ok=True, data={"object_path": object_path, "filename": file.filename, "content_type": file.content_type})
+    return json_response(ApiResponse(ok=True, data={"object_path": object_path, "filename": file.filename, "content_type": file.content_type}))
 
 
 @router.post("/{sku}/{batch_code}/spec/upload_url", response_model=ApiResponse)
@@ -185,20 +191,20 @@ def spec_upload_url(
     bigquery: BigQueryService = Depends(get_bigquery),
     storage: StorageService = Depends(get_storage),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Restrict presigned spec uploads to users with batch edit rights.
     require_permission(request, "batches.edit")
     if payload.content_type != "application/pdf":
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="PDF only")
     if payload.content_length > MAX_UPLOAD_BYTES:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File too large")
-    batches = bigquery.list_batches(sku, include_archived=True)
+    batches = bigquery.list_batches(sku, include_archived=True, projection=("ingredient_batch_code",))
     if not any(batch["ingredient_batch_code"] == batch_code for batch in batches):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found")
     timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
     object_path = f"specs/{sku}/{batch_code}/{timestamp}_{payload.filename}"
     upload_url = storage.generate_upload_url(settings.bucket_specs, object_path, payload.content_type)
-    return ApiResponse(ok=True, data={"upload_url": upload_url, "object_path": object_path})
+    return json_response(ApiResponse(ok=True, data={"upload_url": upload_url, "object_path": object_path}))
 
 
 @router.post("/{sku}/{batch_code}/spec/confirm", response_model=ApiResponse)
@@ -210,7 +216,7 @@ def spec_confirm(
     bigquery: BigQueryService = Depends(get_bigquery),
     storage: StorageService = Depends(get_storage),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Restrict upload confirmation to users with batch edit rights.
     require_permission(request, "batches.edit")
     if payload.content_type != "application/pdf":
@@ -220,7 +226,7 @@ def spec_confirm(
     if not storage.object_exists(settings.bucket_specs, payload.object_path):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Object not found")
     bigquery.update_spec(sku, batch_code, payload.object_path)
-    return ApiResponse(ok=True, data={"object_path": payload.object_path})
+    return json_response(ApiResponse(ok=True, data={"object_path": payload.object_path}))
 
 
 @router.get("/{sku}/{batch_code}/spec/download_url", response_model=ApiResponse)
@@ -231,12 +237,12 @@ def spec_download_url(
     bigquery: BigQueryService = Depends(get_bigquery),
     storage: StorageService = Depends(get_storage),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Restrict spec downloads to users with batch view rights.
     require_permission(request, "batches.view")
-    batches = bigquery.list_batches(sku, include_archived=True)
+    batches = bigquery.list_batches(sku, include_archived=True, projection=("ingredient_batch_code", "spec_object_path"))
     match = next((batch for batch in batches if batch["ingredient_batch_code"] == batch_code), None)
     if not match or not match.get("spec_object_path"):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Spec not found")
     url = storage.generate_download_url(settings.bucket_specs, match["spec_object_path"])
-    return ApiResponse(ok=True, data={"download_url": url})
+    return json_response(ApiResponse(ok=True, data={"download_url": url}))
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.api.responses import json_response
 from app.dependencies import get_actor, get_bigquery
 from app.models import ApiResponse, CompoundingHowCreate, CompoundingHowUpdate
 from app.services.bigquery_service import BigQueryService
@@ -14,10 +15,10 @@ router = APIRouter(prefix="/api/compounding_how", tags=["compounding_how"])
 
 
 @router.get("/meta", response_model=ApiResponse)
-def get_compounding_how_meta(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def get_compounding_how_meta(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Provide dropdown metadata for location code and failure mode selectors on initial page load.
     require_permission(request, "compounding_how.view")
-    return ApiResponse(ok=True, data={"location_codes": bigquery.list_location_code_ids(), "failure_modes": bigquery.get_failure_modes()})
+    return json_response(ApiResponse(ok=True, data={"location_codes": bigquery.list_location_code_ids(), "failure_modes": bigquery.get_failure_modes()}))
 
 
 @router.get("", response_model=ApiResponse)
@@ -25,10 +26,10 @@ def list_compounding_how(
     request: Request,
     q: str | None = Query(default=None),
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Return all active compounding how entries for the table beneath the creation form.
     require_permission(request, "compounding_how.view")
-    return ApiResponse(ok=True, data={"items": bigquery.list_compounding_how(search=(q or "").strip() or None)})
+    return json_response(ApiResponse(ok=True, data={"items": bigquery.list_compounding_how(search=(q or "").strip() or None)}))
 
 
 @router.post("", response_model=ApiResponse)
@@ -37,7 +38,7 @@ def create_compounding_how(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Restrict compounding-how creation to users with edit rights.
     require_permission(request, "compounding_how.edit")
     # Guard process suffix format so processing codes remain two-letter AB-style values.
@@ -65,18 +66,18 @@ def create_compounding_how(
         notes=(payload.notes or "").strip() or None,
         created_by=actor.email if actor else None,
     )
-    return ApiResponse(ok=True, data={"processing_code": processing_code})
+    return json_response(ApiResponse(ok=True, data={"processing_code": processing_code}))
 
 
 @router.post("/allocate", response_model=ApiResponse)
-def allocate_process_suffix(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def allocate_process_suffix(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Derive suffix from the latest submitted record so repeated "generate" clicks do not consume values.
     require_permission(request, "compounding_how.edit")
     last_suffix = bigquery.get_next_compounding_process_suffix()
     if not last_suffix:
-        return ApiResponse(ok=True, data={"process_code_suffix": int_to_code(1)})
+        return json_response(ApiResponse(ok=True, data={"process_code_suffix": int_to_code(1)}))
     next_value = code_to_int(last_suffix) + 1
-    return ApiResponse(ok=True, data={"process_code_suffix": int_to_code(next_value)})
+    return json_response(ApiResponse(ok=True, data={"process_code_suffix": int_to_code(next_value)}))
 
 
 @router.put("/{processing_code}", response_model=ApiResponse)
@@ -86,7 +87,7 @@ def update_compounding_how(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Validate editable failure mode on update to enforce the same controlled vocabulary as create.
     require_permission(request, "compounding_how.edit")
     if payload.failure_mode not in bigquery.get_failure_modes():
@@ -99,4 +100,4 @@ def update_compounding_how(
         notes=(payload.notes or "").strip() or None,
         updated_by=actor.email if actor else None,
     )
-    return ApiResponse(ok=True, data={"processing_code": processing_code})
+    return json_response(ApiResponse(ok=True, data={"processing_code": processing_code}))
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from app.api.responses import json_response
 from app.dependencies import get_actor, get_bigquery
 from app.models import ApiResponse, Conversion1ProductCreate, Conversion1ProductUpdate
 from app.services.bigquery_service import BigQueryService
@@ -90,24 +91,24 @@ def _validate_update_payload(payload: dict, *, update: bool = False) -> dict:
 
 
 @router.get("/meta", response_model=ApiResponse)
-def get_conversion1_product_meta(request: Request) -> ApiResponse:
+def get_conversion1_product_meta(request: Request) -> Response:
     # Return dropdown option payload used by create and inline-edit controls.
     require_permission(request, "conversion1.view")
-    return ApiResponse(
+    return json_response(ApiResponse(
         ok=True,
         data={
             "storage_location_options": STORAGE_LOCATION_OPTIONS,
             "other_status_options": OTHER_STATUS_OPTIONS,
             "tensile_status_options": TENSILE_STATUS_OPTIONS,
         },
-    )
+    ))
 
 
 @router.get("/how_codes", response_model=ApiResponse)
-def list_conversion1_how_codes(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def list_conversion1_how_codes(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Return active Conversion 1 How codes for dropdown selection in the create panel.
     require_permission(request, "conversion1.view")
-    return ApiResponse(ok=True, data={"items": bigquery.list_conversion1_how_codes()})
+    return json_response(ApiResponse(ok=True, data={"items": bigquery.list_conversion1_how_codes()}))
 
 
 @router.get("", response_model=ApiResponse)
@@ -118,7 +119,7 @@ def list_conversion1_products(
     page: int = 1,
     page_size: int = 50,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Clamp pagination settings to safe bounds before loading table rows.
     require_permission(request, "conversion1.view")
     safe_page = max(1, page)
@@ -130,7 +131,7 @@ def list_conversion1_products(
         page=safe_page,
         page_size=safe_page_size,
     )
-    return ApiResponse(ok=True, data={"items": rows, "total": total, "page": safe_page, "page_size": safe_page_size})
+    return json_response(ApiResponse(ok=True, data={"items": rows, "total": total, "page": safe_page, "page_size": safe_page_size}))
 
 
 @router.post("", response_model=ApiResponse)
@@ -139,7 +140,7 @@ def create_conversion1_products(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Ensure create requests can only reference active existing Conversion 1 How rows.
     require_permission(request, "conversion1.edit")
     if not bigquery.conversion1_how_exists(payload.conversion1_how_code):
@@ -154,7 +155,7 @@ def create_conversion1_products(
         created_by=actor.email if actor else None,
         optional_fields=validated_optional_fields,
     )
-    return ApiResponse(ok=True, data={"items": created})
+    return json_response(ApiResponse(ok=True, data={"items": created}))
 
 
 @router.patch("/{product_code}", response_model=ApiResponse)
@@ -164,7 +165,7 @@ def update_conversion1_product(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Validate constrained update fields before issuing the patch operation.
     require_permission(request, "conversion1.edit")
     validated = _validate_update_payload(payload.dict(exclude_unset=True), update=True)
@@ -175,4 +176,4 @@ def update_conversion1_product(
     )
     if not updated:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversion 1 product not found")
-    return ApiResponse(ok=True, data={"product_code": product_code})
+    return json_response(ApiResponse(ok=True, data={"product_code": product_code}))
@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from typing import Dict
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.api.responses import json_response
 from app.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.dependencies import get_bigquery
 from app.models import ApiResponse
@@ -22,8 +23,9 @@ def list_formulations(
     sku: str | None = None,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Restrict the shared formulations API to Group 2 users and admins because it exposes dry-weight percentages.
     require_permission(request, "dry_weights.view")
     # Build optional filters from query params so users can browse all or narrow by one/more fields.
@@ -39,5 +41,11 @@ def list_formulations(
         filters["sku"] = sku
 
     # Return paginated formulations sorted newest-to-oldest by the underlying service query.
-    rows, total = bigquery.list_formulations_paginated(filters=filters, page=page, page_size=page_size)
-    return ApiResponse(ok=True, data={"items": rows, "total": total, "page": page, "page_size": page_size})
+    try:
+        rows, total, next_cursor = bigquery.list_formulations_paginated(filters=filters, page=page, page_size=page_size, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return json_response(ApiResponse(
+        ok=True,
+        data={"items": rows, "total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor},
+    ))
@@ -5,8 +5,9 @@ from pathlib import Path
 from typing import Dict
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, Response, UploadFile, status
 
+from app.api.responses import json_response
 from app.dependencies import get_actor, get_bigquery, get_settings, get_storage
 from app.models import ApiResponse, IngredientCreate, IngredientImport, UploadConfirm, UploadRequest
 from app.services.bigquery_service import BigQueryService
@@ -46,7 +47,7 @@ def create_ingredient(
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Enforce server-side ingredient edit access before any validation or writes occur.
     require_permission(request, "ingredients.edit")
     try:
@@ -104,7 +105,7 @@ def create_ingredient(
         }
     )
     ingredient = bigquery.get_ingredient(sku)
-    return ApiResponse(ok=True, data={"sku": sku, "ingredient": ingredient})
+    return json_response(ApiResponse(ok=True, data={"sku": sku, "ingredient": ingredient}))
 
 
 @router.post("/import", response_model=ApiResponse)
@@ -113,7 +114,7 @@ def import_ingredient(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Enforce server-side ingredient edit access before importing an explicit SKU.
     require_permission(request, "ingredients.edit")
     try:
@@ -184,7 +185,7 @@ def import_ingredient(
     bigquery.set_counter_at_least("ingredient_seq", "global", seq + 1)
 
     ingredient = bigquery.get_ingredient(payload.sku)
-    return ApiResponse(ok=True, data={"sku": payload.sku, "ingredient": ingredient})
+    return json_response(ApiResponse(ok=True, data={"sku": payload.sku, "ingredient": ingredient}))
 
 
 @router.get("", response_model=ApiResponse)
@@ -196,7 +197,7 @@ def list_ingredients(
     pack_size_unit: str | None = None,
     is_active: bool | None = None,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Enforce server-side ingredient view access for the listing API as well as the page route.
     require_permission(request, "ingredients.view")
     filters: Dict[str, object] = {}
@@ -211,17 +212,17 @@ def list_ingredients(
     if is_active is not None:
         filters["is_active"] = is_active
     rows = bigquery.list_ingredients(filters)
-    return ApiResponse(ok=True, data={"items": rows})
+    return json_response(ApiResponse(ok=True, data={"items": rows}))
 
 
 @router.get("/{sku}", response_model=ApiResponse)
-def get_ingredient(sku: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def get_ingredient(sku: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Enforce ingredient detail access on the API route so hidden menu items are not enough.
     require_permission(request, "ingredients.view")
     ingredient = bigquery.get_ingredient(sku)
     if not ingredient:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ingredient not found")
-    return ApiResponse(ok=True, data={"ingredient": ingredient})
+    return json_response(ApiResponse(ok=True, data={"ingredient": ingredient}))
 
 
 @router.post("/{sku}/msds", response_model=ApiResponse)
@@ -234,7 +235,7 @@ async def upload_msds(
     storage: StorageService = Depends(get_storage),
     settings=Depends(get_settings),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Restrict MSDS uploads to users with ingredient edit rights.
     require_permission(request, "ingredients.edit")
     ingredient = bigquery.get_ingredient(sku)
@@ -271,7 +272,7 @@ async def upload_msds(
     if previous_object_path and previous_object_path != object_path:
         storage.delete_object(settings.bucket_msds, previous_object_path)
 
-    return ApiResponse(ok=True, data={"object_path": object_path, "filename": file.filename, "content_type": file.content_type})
+    return json_response(ApiResponse(ok=True, data={"object_path": object_path, "filename": file.filename, "content_type": file.content_type}))
 
 
 @router.get("/{sku}/msds/download_url", response_model=ApiResponse)
@@ -280,9 +281,9 @@ def msds_download_url(
     bigquery: BigQueryService = Depends(get_bigquery),
     storage: StorageService = Depends(get_storage),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     ingredient = bigquery.get_ingredient(sku)
     if not ingredient or not ingredient.get("msds_object_path"):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="MSDS not found")
     url = storage.generate_download_url(settings.bucket_msds, ingredient["msds_object_path"], ttl_minutes=10)
-    return ApiResponse(ok=True, data={"download_url": url})
+    return json_response(ApiResponse(ok=True, data={"download_url": url}))
@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from google.api_core.exceptions import NotFound
 
+from app.api.responses import json_response
 from app.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.dependencies import get_actor, get_bigquery
 from app.models import ApiResponse, LocationCodeCreate, LocationPartnerCreate
@@ -50,7 +51,7 @@ DEFAULT_LOCATION_PARTNERS = [
 
 
 @router.get("/partners", response_model=ApiResponse)
-def list_location_partners(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def list_location_partners(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Merge requested default mappings with user-created partner rows while preserving unique partner codes.
     require_permission(request, "location_codes.view")
     try:
@@ -62,7 +63,7 @@ def list_location_partners(request: Request, bigquery: BigQueryService = Depends
     for partner in custom:
         by_code[partner["partner_code"]] = partner
     items = sorted(by_code.values(), key=lambda row: row.get("partner_code", ""))
-    return ApiResponse(ok=True, data={"items": items})
+    return json_response(ApiResponse(ok=True, data={"items": items}))
 
 
 @router.post("/partners", response_model=ApiResponse)
@@ -71,7 +72,7 @@ def create_location_partner(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor)
-) -> ApiResponse:
+) -> Response:
     # Allocate the next two-letter code after seed values so custom partners continue from code BF onwards.
     require_permission(request, "location_codes.edit")
     partner_code = None
@@ -79,28 +80,28 @@ def create_location_partner(
         # Always reserve a fresh code, even when partner or machine text matches an existing row.
         next_value = bigquery.allocate_counter("location_partner_code", "", 31)
         candidate = int_to_code(next_value)
-        if not bigquery.get_location_partner(candidate):
+        # The insert skips codes that already exist, so no separate existence lookup is needed.
+        if bigquery.insert_location_partner(
+            partner_code=candidate,
+            partner_name=payload.partner_name,
+            machine_specification=payload.machine_specification,
+            created_by=actor.email if actor else None,
+        ):
             partner_code = candidate
             break
     if not partner_code:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Unable to allocate a unique partner code")
-    bigquery.insert_location_partner(
-        partner_code=partner_code,
-        partner_name=payload.partner_name,
-        machine_specification=payload.machine_specification,
-        created_by=actor.email if actor else None,
-    )
-    return ApiResponse(ok=True, data={"partner_code": partner_code, "partner_name": payload.partner_name})
+    return json_response(ApiResponse(ok=True, data={"partner_code": partner_code, "partner_name": payload.partner_name}))
 
 
 
 
 @router.get("/formulations", response_model=ApiResponse)
-def list_location_formulations(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def list_location_formulations(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Supply selectable formulation combinations for location-code creation UX.
     require_permission(request, "location_codes.view")
     items = bigquery.list_distinct_formulation_codes()
-    return ApiResponse(ok=True, data={"items": items})
+    return json_response(ApiResponse(ok=True, data={"items": items}))
 
 
 @router.get("", response_model=ApiResponse)
@@ -109,11 +110,20 @@ def list_location_codes(
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     q: str | None = Query(default=None),
+    cursor: str | None = None,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Return paginated location IDs with optional substring filtering on the full location code string.
     require_permission(request, "location_codes.view")
-    rows, total = bigquery.list_location_codes_paginated(page=page, page_size=page_size, q=(q or "").strip() or None)
+    try:
+        rows, total, next_cursor = bigquery.list_location_codes_paginated(
+            page=page,
+            page_size=page_size,
+            q=(q or "").strip() or None,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
     # Merge partner labels for human-readable table rendering without losing canonical stored partner codes.
     partner_map = {partner["partner_code"]: partner for partner in DEFAULT_LOCATION_PARTNERS}
@@ -133,7 +143,10 @@ def list_location_codes(
                 "machine_specification": partner.get("machine_specification") or "",
             }
         )
-    return ApiResponse(ok=True, data={"items": normalized_rows, "total": total, "page": page, "page_size": page_size})
+    return json_response(ApiResponse(
+        ok=True,
+        data={"items": normalized_rows, "total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor},
+    ))
 
 @router.post("", response_model=ApiResponse)
 def create_location_code(
@@ -141,7 +154,7 @@ def create_location_code(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Validate partner code against the merged default+custom partner registry before issuing a location ID.
     require_permission(request, "location_codes.edit")
     partner_codes = {partner["partner_code"] for partner in DEFAULT_LOCATION_PARTNERS}
@@ -162,7 +175,8 @@ def create_location_code(
         f"{payload.set_code} {payload.weight_code} {payload.batch_variant_code} "
         f"{payload.partner_code} {payload.production_date}"
     )
-    bigquery.insert_location_code(
+    # The insert skips IDs that already exist, so a repeated submission is reported as a conflict.
+    if not bigquery.insert_location_code(
         set_code=payload.set_code,
         weight_code=payload.weight_code,
         batch_variant_code=payload.batch_variant_code,
@@ -170,5 +184,6 @@ def create_location_code(
         production_date=payload.production_date,
         location_id=location_id,
         created_by=actor.email if actor else None,
-    )
-    return ApiResponse(ok=True, data={"location_id": location_id, "created_at": datetime.utcnow().isoformat()})
+    ):
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Location ID already exists")
+    return json_response(ApiResponse(ok=True, data={"location_id": location_id, "created_at": datetime.utcnow().isoformat()}))
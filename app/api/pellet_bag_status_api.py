@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from app.api.responses import json_response
 from app.api.pellet_bags_api import (
     DEFAULT_ASSIGNEE_EMAILS,
     STATUS_LIST_COLUMN_WHITELIST,
@@ -23,7 +24,7 @@ def update_pellet_bag_status_list_row(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Validate user-supplied status-column names against an explicit whitelist to prevent arbitrary SQL updates.
     require_permission(request, "status_lists.edit")
     if payload.status_column not in STATUS_LIST_COLUMN_WHITELIST:
@@ -53,4 +54,4 @@ def update_pellet_bag_status_list_row(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pellet bag not found")
 
     # Return the canonical row payload expected by inline editor clients.
-    return ApiResponse(ok=True, data={"updated_row": updated_row})
+    return json_response(ApiResponse(ok=True, data={"updated_row": updated_row}))
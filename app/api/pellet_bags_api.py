@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.api.responses import json_response
 from app.dependencies import get_actor, get_bigquery
 from app.models import ApiResponse, PelletBagCreate, PelletBagUpdate
 from app.services.bigquery_service import BigQueryService
@@ -135,10 +136,10 @@ def _validate_optional_payload(payload: dict, *, update: bool = False) -> dict:
 
 
 @router.get("/meta", response_model=ApiResponse)
-def get_pellet_bag_meta(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def get_pellet_bag_meta(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Serve all dropdown options from one endpoint for predictable page bootstrap.
     require_permission(request, "pellet_bags.view")
-    return ApiResponse(
+    return json_response(ApiResponse(
         ok=True,
         data={
             "product_types": ["PR", "PF", "PI"],
@@ -150,7 +151,7 @@ def get_pellet_bag_meta(request: Request, bigquery: BigQueryService = Depends(ge
             "injection_film_status_options": ["Received" if option == "Recieved" else option for option in INJECTION_FILM_STATUS_OPTIONS],
             "assignee_emails": bigquery.list_pellet_bag_assignees(default_emails=DEFAULT_ASSIGNEE_EMAILS),
         },
-    )
+    ))
 
 
 @router.get("", response_model=ApiResponse)
@@ -158,10 +159,10 @@ def list_pellet_bags(
     request: Request,
     q: str | None = Query(default=None),
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Return all pellet bag rows for the management table.
     require_permission(request, "pellet_bags.view")
-    return ApiResponse(ok=True, data={"items": bigquery.list_pellet_bags(search=(q or "").strip() or None)})
+    return json_response(ApiResponse(ok=True, data={"items": bigquery.list_pellet_bags(search=(q or "").strip() or None)}))
 
 
 @router.post("", response_model=ApiResponse)
@@ -170,7 +171,7 @@ def create_pellet_bags(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Reject unknown compounding codes so pellet bags can only reference existing processing entries.
     require_permission(request, "pellet_bags.edit")
     # Validate against a targeted existence query so create latency does not scale with table size.
@@ -187,7 +188,7 @@ def create_pellet_bags(
         optional_fields=validated_optional,
         created_by=actor.email if actor else None,
     )
-    return ApiResponse(ok=True, data={"items": items})
+    return json_response(ApiResponse(ok=True, data={"items": items}))
 
 
 @router.patch("/{pellet_bag_id}", response_model=ApiResponse)
@@ -197,7 +198,7 @@ def update_pellet_bag(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Apply updates only to editable fields and stamp updater metadata server-side.
     require_permission(request, "pellet_bags.edit")
     validated_optional = _validate_optional_payload(payload.dict(exclude_unset=True), update=True)
@@ -208,4 +209,4 @@ def update_pellet_bag(
     )
     if not updated:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Pellet bag not found")
-    return ApiResponse(ok=True, data={"pellet_bag_id": pellet_bag_id})
+    return json_response(ApiResponse(ok=True, data={"pellet_bag_id": pellet_bag_id}))
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from fastapi import Response
+
+from app.models import ApiResponse
+
+
+def json_response(payload: ApiResponse, status_code: int = 200) -> Response:
+    # Serialize straight to JSON bytes in pydantic-core so FastAPI skips the response_model re-validate + dict walk.
+    return Response(content=payload.model_dump_json(), status_code=status_code, media_type="application/json")
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.api.responses import json_response
 from app.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from app.dependencies import get_actor, get_bigquery, get_settings
 from app.models import ApiResponse, IngredientSetCreate, IngredientSetUpdate
@@ -20,7 +21,7 @@ def create_set(
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Enforce set edit access before any formulation-set write occurs.
     require_permission(request, "sets.edit")
     # Validate all supplied SKUs in one query to avoid one BigQuery roundtrip per row on large sets.
@@ -38,7 +39,7 @@ def create_set(
         # Keep the existing deduplicated set while still allowing metadata-only saves on duplicate hashes.
         if payload.notes is not None or payload.material_workstream is not None:
             bigquery.update_set(existing, payload.notes, payload.material_workstream, actor.email if actor else None)
-        return ApiResponse(
+        return json_response(ApiResponse(
             ok=True,
             data={
                 "set_code": existing,
@@ -46,7 +47,7 @@ def create_set(
                 "notes": payload.notes,
                 "material_workstream": payload.material_workstream,
             },
-        )
+        ))
 
     # Allocate the next user-facing code and persist both parent and item rows.
     next_value = bigquery.allocate_counter("set_code", "", settings.code_start_set)
@@ -59,7 +60,7 @@ def create_set(
         payload.notes,
         payload.material_workstream,
     )
-    return ApiResponse(
+    return json_response(ApiResponse(
         ok=True,
         data={
             "set_code": set_code,
@@ -67,7 +68,7 @@ def create_set(
             "notes": payload.notes,
             "material_workstream": payload.material_workstream,
         },
-    )
+    ))
 
 
 @router.get("", response_model=ApiResponse)
@@ -76,23 +77,35 @@ def list_sets(
     q: str | None = None,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Enforce set listing access server-side for the API that powers the page.
     require_permission(request, "sets.view")
-    # Return paged set data so the table scales cleanly to 100+ rows.
-    rows, total = bigquery.list_sets_paginated(search=q.strip() if q else None, page=page, page_size=page_size)
-    return ApiResponse(ok=True, data={"items": rows, "total": total, "page": page, "page_size": page_size})
+    # Return paged set data so the table scales cleanly to 100+ rows; a cursor seeks instead of offsetting.
+    try:
+        rows, total, next_cursor = bigquery.list_sets_paginated(
+            search=q.strip() if q else None,
+            page=page,
+            page_size=page_size,
+            cursor=cursor,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return json_response(ApiResponse(
+        ok=True,
+        data={"items": rows, "total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor},
+    ))
 
 
 @router.get("/{set_code}", response_model=ApiResponse)
-def get_set(set_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def get_set(set_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Enforce set detail access server-side for direct API requests.
     require_permission(request, "sets.view")
     row = bigquery.get_set(set_code)
     if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Set not found")
-    return ApiResponse(ok=True, data=row)
+    return json_response(ApiResponse(ok=True, data=row))
 
 
 @router.put("/{set_code}", response_model=ApiResponse)
@@ -102,7 +115,7 @@ def update_set(
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
-) -> ApiResponse:
+) -> Response:
     # Restrict metadata edits to admins so non-admin users keep read-only set visibility.
     access = require_permission(request, "sets.edit")
     if not access.is_admin:
@@ -115,7 +128,7 @@ def update_set(
     # Persist optional notes and material-workstream changes to the parent set row only.
     bigquery.update_set(set_code, payload.notes, payload.material_workstream, actor.email if actor else None)
     updated = bigquery.get_set(set_code)
-    return ApiResponse(ok=True, data=updated)
+    return json_response(ApiResponse(ok=True, data=updated))
 
 
 @router.delete("/{set_code}", response_model=ApiResponse)
@@ -123,7 +136,7 @@ def delete_set(
     set_code: str,
     request: Request,
     bigquery: BigQueryService = Depends(get_bigquery),
-) -> ApiResponse:
+) -> Response:
     # Restrict set deletion to admins and block deletes when downstream variants still depend on the set.
     access = require_permission(request, "sets.edit")
     if not access.is_admin:
@@ -140,4 +153,4 @@ def delete_set(
             detail=f"Set cannot be deleted because it is referenced by: {reason}",
         )
     bigquery.delete_set(set_code)
-    return ApiResponse(ok=True, data={"set_code": set_code, "deleted": True})
+    return json_response(ApiResponse(ok=True, data={"set_code": set_code, "deleted": True}))
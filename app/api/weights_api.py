@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
+from app.api.responses import json_response
 from app.dependencies import get_actor, get_bigquery, get_settings
 from app.models import ApiResponse, DryWeightCreate
 from app.services.bigquery_service import BigQueryService
@@ -20,7 +21,7 @@ def create_weights(
     bigquery: BigQueryService = Depends(get_bigquery),
     actor=Depends(get_actor),
     settings=Depends(get_settings),
-) -> ApiResponse:
+) -> Response:
     # Enforce dry-weight edit access before any formulation percentage data is processed or saved.
     require_permission(request, "dry_weights.edit")
     set_row = bigquery.get_set(payload.set_code)
@@ -43,7 +44,7 @@ def create_weights(
     weight_hash = hash_weights(items)
     existing = bigquery.get_weight_by_hash(payload.set_code, weight_hash)
     if existing:
-        return ApiResponse(ok=True, data={"weight_code": existing, "set_code": payload.set_code})
+        return json_response(ApiResponse(ok=True, data={"weight_code": existing, "set_code": payload.set_code}))
 
     next_value = bigquery.allocate_counter("weight_code", payload.set_code, settings.code_start_weight)
     weight_code = int_to_code(next_value)
@@ -54,13 +55,13 @@ def create_weights(
         [(sku, float(wt)) for sku, wt in items],
         actor.email if actor else None,
     )
-    return ApiResponse(ok=True, data={"weight_code": weight_code, "set_code": payload.set_code})
+    return json_response(ApiResponse(ok=True, data={"weight_code": weight_code, "set_code": payload.set_code}))
 
 
 @router.get("", response_model=ApiResponse)
-def list_weights(set_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> ApiResponse:
+def list_weights(set_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> Response:
     # Normalize lookup codes so searches work the same for lowercase and uppercase user input.
     require_permission(request, "dry_weights.view")
     normalized_set_code = set_code.strip().upper()
     rows = bigquery.list_weights(normalized_set_code)
-    return ApiResponse(ok=True, data={"items": rows})
+    return json_response(ApiResponse(ok=True, data={"items": rows}))
@@ -21,6 +21,8 @@ class Settings:
     code_start_batch: int
     auth_mode: str
     app_version: str
+    # Append new rows via the BigQuery Storage Write API; false keeps the INSERT DML path.
+    bq_storage_write: bool = True
 
 
 def _resolve_app_version() -> str:
@@ -78,4 +80,5 @@ def load_settings() -> Settings:
         code_start_batch=int(os.getenv("CODE_START_BATCH", "1")),
         auth_mode=auth_mode,
         app_version=_resolve_app_version(),
+        bq_storage_write=os.getenv("BQ_STORAGE_WRITE", "true").lower() in {"1", "true", "yes"},
     )
@@ -6,6 +6,9 @@ DEFAULT_PAGE_SIZE = 50
 # Global upper bound to protect APIs from excessively large page requests.
 MAX_PAGE_SIZE = 200
 
+# Deepest row offset served by page number alone; later pages must seek with the listing's next_cursor.
+MAX_PAGE_OFFSET = 10000
+
 # Reusable formulation-set material workstream options keep dropdown values consistent across UI and API layers.
 MATERIAL_WORKSTREAM_OPTIONS = [
     # Keep the dropdown choices aligned with the current formulation workstream list provided in the launch screenshot.
@@ -29,6 +29,7 @@ def init_services(settings: Settings) -> tuple[BigQueryService, StorageService]:
         project_id=settings.project_id,
         dataset_id=settings.dataset_id,
         bq_location=settings.bq_location,
+        use_storage_write=settings.bq_storage_write,
     )
     storage = StorageService(
         project_id=settings.project_id,
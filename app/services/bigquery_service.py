@@ -1,21 +1,37 @@
 from __future__ import annotations
 
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import copy
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import functools
+import inspect
+import json
 import logging
 import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import re
+import threading
+import types
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
-from google.api_core.exceptions import NotFound
+from cachetools import TTLCache
+import google.auth
+from google.api_core.exceptions import BadRequest, NotFound
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import bigquery
+from google.cloud import bigquery_storage_v1
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from app.constants import FAILURE_MODES
+from app.constants import FAILURE_MODES, MAX_PAGE_OFFSET, MAX_PAGE_SIZE
 from app.services.codegen_service import int_to_code
 from app.services.codegen_service import code_to_int
 from app.services.metrics import add_bigquery_timing, request_id_var
 from app.services.permission_service import resolve_permissions_for_role
+from app.services.storage_write_service import StorageWriteService
 
 
 LOGGER = logging.getLogger(__name__)
@@ -28,16 +44,389 @@ STATUS_LIST_FIELD_MAPPING: Dict[str, Dict[str, str]] = {
     "film_forming_status": {"status": "film_forming_status", "assigned": "film_forming_assignee_email"},
 }
 
+# Cap rows per multi-row INSERT so statements stay well inside BigQuery query-length and parameter limits.
+INSERT_ROWS_CHUNK_SIZE = 500
+
+# Size the shared HTTP pool above urllib3's default of 10 so concurrent requests do not queue on BigQuery sockets.
+HTTP_POOL_SIZE = 64
+
+# Fail any single query that would bill more than this, so a runaway scan errors instead of draining the budget.
+QUERY_MAX_BYTES_BILLED = 10 * 2**30
+_NO_PARAMS_JOB_CONFIG = bigquery.QueryJobConfig(maximum_bytes_billed=QUERY_MAX_BYTES_BILLED)
+
+# Bound concurrently running DML jobs per write so a large insert cannot flood the project's DML concurrency limit.
+DML_MAX_CONCURRENT_JOBS = 4
+
+# Share one client per project across service instances so auth, sockets, and TLS sessions are reused process-wide.
+_CLIENTS: Dict[str, bigquery.Client] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _build_client(project_id: str) -> bigquery.Client:
+    # Mount a larger keep-alive pool with light retry/backoff for transient REST failures on idempotent calls.
+    credentials, _ = google.auth.default(scopes=bigquery.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+    )
+    session.mount("https://", adapter)
+    return bigquery.Client(project=project_id, credentials=credentials, _http=session)
+
+
+# Project only the identity fields duplicate/product matching reads so the columnar scan skips notes and MSDS metadata.
+INGREDIENT_MATCH_COLUMNS: Tuple[str, ...] = (
+    "sku", "category_code", "seq", "spec_grade", "format", "pack_size_value", "pack_size_unit", "trade_name_inci", "supplier", "is_active",
+)
+
+# Name every column each read returns so scans and downloads never pick up columns added to the tables later.
+# Typed column lists also drive the insert parameters, so each row binds through one comprehension.
+INGREDIENT_COLUMN_TYPES: Tuple[Tuple[str, str], ...] = (
+    ("sku", "STRING"), ("category_code", "INT64"), ("seq", "INT64"), ("pack_size_value", "INT64"), ("pack_size_unit", "STRING"),
+    ("trade_name_inci", "STRING"), ("supplier", "STRING"), ("spec_grade", "STRING"), ("format", "STRING"),
+    ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"), ("created_by", "STRING"), ("updated_by", "STRING"), ("is_active", "BOOL"),
+    ("msds_object_path", "STRING"), ("msds_filename", "STRING"), ("msds_content_type", "STRING"), ("msds_uploaded_at", "TIMESTAMP"),
+)
+BATCH_COLUMN_TYPES: Tuple[Tuple[str, str], ...] = (
+    ("sku", "STRING"), ("ingredient_batch_code", "STRING"), ("received_at", "TIMESTAMP"), ("notes", "STRING"),
+    ("quantity_value", "FLOAT64"), ("quantity_unit", "STRING"),
+    ("created_at", "TIMESTAMP"), ("updated_at", "TIMESTAMP"), ("created_by", "STRING"), ("updated_by", "STRING"), ("is_active", "BOOL"),
+    ("spec_object_path", "STRING"), ("spec_uploaded_at", "TIMESTAMP"), ("archived", "BOOL"), ("archived_at", "TIMESTAMP"), ("archived_by", "STRING"),
+)
+INGREDIENT_COLUMNS: Tuple[str, ...] = tuple(name for name, _ in INGREDIENT_COLUMN_TYPES)
+BATCH_COLUMNS: Tuple[str, ...] = tuple(name for name, _ in BATCH_COLUMN_TYPES)
+SET_COLUMNS: Tuple[str, ...] = ("set_code", "set_hash", "created_at", "created_by", "notes", "material_workstream", "sku_list")
+WEIGHT_VARIANT_COLUMNS: Tuple[str, ...] = ("set_code", "weight_code", "weight_hash", "created_at", "created_by", "items")
+BATCH_VARIANT_COLUMNS: Tuple[str, ...] = ("set_code", "weight_code", "batch_variant_code", "batch_hash", "created_at", "created_by", "items")
+FORMULATION_COLUMNS: Tuple[str, ...] = (
+    "set_code", "weight_code", "batch_variant_code", "base_code", "created_at", "created_by",
+    "sku_list", "sku_count", "batch_items", "dry_weight_items",
+)
+# Columns the shared formulations table renders; dry_weight_items is appended only for users allowed to see percentages.
+FORMULATION_LIST_COLUMNS: Tuple[str, ...] = (
+    "set_code", "weight_code", "batch_variant_code", "created_at", "created_by", "sku_list", "sku_count", "batch_items",
+)
+# Columns written when a location ID is created, in location_codes table order.
+LOCATION_CODE_INSERT_COLUMNS: Tuple[str, ...] = (
+    "set_code", "weight_code", "batch_variant_code", "partner_code", "production_date", "location_id", "created_at", "created_by",
+)
+LOCATION_CODE_COLUMNS: Tuple[str, ...] = (
+    "location_id", "set_code", "weight_code", "batch_variant_code", "partner_code", "production_date", "created_at", "created_by",
+)
+
+# Cluster ingredients on the duplicate/product match prefix so those lookups read one tight block range.
+INGREDIENT_CLUSTER_FIELDS = ["category_code", "trade_name_inci", "supplier"]
+# Cluster batch variant items on the ingredient batch key so "formulations using this batch/SKU" lookups prune blocks.
+BATCH_VARIANT_ITEM_CLUSTER_FIELDS = ["sku", "ingredient_batch_code"]
+# Cluster location codes on location_id so the create MERGE and the SEARCH filter prune blocks instead of scanning the table.
+LOCATION_CODE_CLUSTER_FIELDS = ["location_id"]
+# Cluster batch variants on the formulation key that the formulation roll-up joins on.
+BATCH_VARIANT_CLUSTER_FIELDS = ["set_code", "weight_code", "batch_variant_code"]
+# Cluster batches on their (sku, batch code) key so get_batch and per-SKU batch listings prune blocks.
+INGREDIENT_BATCH_CLUSTER_FIELDS = ["sku", "ingredient_batch_code"]
+# Cluster counters on their MERGE key so each allocation's match and read-back touch one block.
+CODE_COUNTER_CLUSTER_FIELDS = ["counter_name", "scope"]
+TABLE_CLUSTER_FIELDS = {
+    "ingredients": INGREDIENT_CLUSTER_FIELDS,
+    "ingredient_batches": INGREDIENT_BATCH_CLUSTER_FIELDS,
+    "code_counters": CODE_COUNTER_CLUSTER_FIELDS,
+    "batch_variant_items": BATCH_VARIANT_ITEM_CLUSTER_FIELDS,
+    "batch_variants": BATCH_VARIANT_CLUSTER_FIELDS,
+    "location_codes": LOCATION_CODE_CLUSTER_FIELDS,
+}
+
+# Bind the most common parameter names/types once so hot point lookups only supply the value.
+_SKU_PARAM = functools.partial(bigquery.ScalarQueryParameter, "sku", "STRING")
+_SET_CODE_PARAM = functools.partial(bigquery.ScalarQueryParameter, "set_code", "STRING")
+_WEIGHT_CODE_PARAM = functools.partial(bigquery.ScalarQueryParameter, "weight_code", "STRING")
+_CONTEXT_CODE_PARAM = functools.partial(bigquery.ScalarQueryParameter, "context_code", "STRING")
+_PROCESSING_CODE_PARAM = functools.partial(bigquery.ScalarQueryParameter, "processing_code", "STRING")
+
+# Map Python filter values onto BigQuery scalar types with one exact-type lookup (bool must not fall through to INT64).
+_PARAM_TYPES = {str: "STRING", bool: "BOOL", int: "INT64", float: "FLOAT64"}
+
+
+def _scalar_param(name: str, value: Any) -> bigquery.ScalarQueryParameter:
+    return bigquery.ScalarQueryParameter(name, _PARAM_TYPES[type(value)], value)
+
+
+def _job_config(params: Sequence[bigquery.ScalarQueryParameter]) -> bigquery.QueryJobConfig:
+    # The client deep-copies job configs before submitting, so parameterless jobs can share one read-only config.
+    if not params:
+        return _NO_PARAMS_JOB_CONFIG
+    return bigquery.QueryJobConfig(query_parameters=params, maximum_bytes_billed=QUERY_MAX_BYTES_BILLED)
+
+
+def _row_params(column_types: Sequence[Tuple[str, str]], row: Dict[str, Any]) -> List[bigquery.ScalarQueryParameter]:
+    # Bind one parameter per typed column; absent optional fields become NULL.
+    return [bigquery.ScalarQueryParameter(name, type_, row.get(name)) for name, type_ in column_types]
+
+# Keep found point-lookup rows briefly so repeat reads skip BigQuery's per-job scheduling floor.
+LOOKUP_CACHE_TTL_SECONDS = 60
+LOOKUP_CACHE_MAXSIZE = 4096
+
+
+def _cached_lookup(namespace: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    # Key cached rows by namespace plus bound call arguments so positional and keyword calls share entries.
+    def decorator(method: Callable[..., Any]) -> Callable[..., Any]:
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self: "BigQueryService", *args: Any, **kwargs: Any) -> Any:
+            cache = getattr(self, "_lookup_cache", None)
+            # Bypass caching for lightweight instances built without __post_init__ (tests, scripts).
+            if cache is None:
+                return method(self, *args, **kwargs)
+            bound = signature.bind(self, *args, **kwargs)
+            # Freeze list arguments (e.g. column projections) so they can take part in the hashable key.
+            key = (namespace, *(tuple(value) if isinstance(value, list) else value for value in list(bound.arguments.values())[1:]))
+            # Hand out deep copies so a caller mutating a returned row or list never edits the shared cached value.
+            with self._lookup_lock:
+                if key in cache:
+                    return copy.deepcopy(cache[key])
+            value = method(self, *args, **kwargs)
+            # Cache found rows only so a record created after a miss is visible to the next lookup.
+            if value is not None:
+                with self._lookup_lock:
+                    cache[key] = value
+                return copy.deepcopy(value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+def _encode_page_cursor(values: Sequence[Any], offset: int) -> str:
+    # Pack the last row's sort key plus the rows already served into an opaque URL-safe token for the next seek page.
+    payload = json.dumps([*(value.isoformat() if isinstance(value, datetime) else value for value in values), offset])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def _decode_page_cursor(cursor: str, param_types: Sequence[str]) -> Tuple[List[Any], int]:
+    # Reject malformed tokens with ValueError so API routes can answer 400 instead of failing inside BigQuery.
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8"))
+        if not isinstance(payload, list) or len(payload) != len(param_types) + 1:
+            raise ValueError("cursor shape mismatch")
+        *values, offset = payload
+        if type(offset) is not int or offset < 0:
+            raise ValueError("cursor offset must be a non-negative integer")
+        return [
+            datetime.fromisoformat(value) if param_type == "TIMESTAMP" and value is not None else value
+            for value, param_type in zip(values, param_types)
+        ], offset
+    except (ValueError, TypeError, UnicodeError) as exc:
+        raise ValueError("Invalid page cursor") from exc
+
+
+def _seek_predicate(columns: Sequence[str], descending: bool = False) -> str:
+    # Expand (a, b, c) > (@cursor_0, @cursor_1, @cursor_2) into nested OR terms because BigQuery lacks row-value comparison.
+    operator = "<" if descending else ">"
+    last = len(columns) - 1
+    clause = f"{columns[last]} {operator} @cursor_{last}"
+    for index in range(last - 1, -1, -1):
+        column = columns[index]
+        clause = f"({column} {operator} @cursor_{index} OR ({column} = @cursor_{index} AND {clause}))"
+    return clause
+
+
+# Equality filters accepted by list_ingredients, in the fixed order their predicates are emitted.
+LIST_INGREDIENT_EQUALITY_FILTERS = ("category_code", "format", "pack_size_unit", "is_active")
+
+
+@functools.lru_cache(maxsize=None)
+def _list_ingredients_sql(dataset: str, filter_keys: frozenset, use_search_index: bool, columns: Tuple[str, ...]) -> str:
+    # Build each filter combination's SQL once; there are only a few dozen, and identical text keeps BigQuery's cache warm.
+    where = []
+    if "q" in filter_keys and use_search_index:
+        # Probe ingredients_search_idx per column; SEARCH tokenizes case-insensitively, so no LOWER()/% wrapping.
+        where.append("(SEARCH(sku, @q) OR SEARCH(trade_name_inci, @q) OR SEARCH(supplier, @q))")
+    elif "q" in filter_keys:
+        # Partial matches use CONTAINS_SUBSTR, which is case-insensitive on its own and can still be pruned by the index.
+        where.append("(CONTAINS_SUBSTR(sku, @q) OR CONTAINS_SUBSTR(trade_name_inci, @q) OR CONTAINS_SUBSTR(supplier, @q))")
+    where.extend(f"{field} = @{field}" for field in LIST_INGREDIENT_EQUALITY_FILTERS if field in filter_keys)
+    # Only emit a WHERE clause when at least one filter predicate has been requested.
+    where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+    # Sort by the numeric sequence field so ingredient rows follow the true business order instead of SKU text order.
+    # Add stable secondary keys to avoid row jitter when two records share the same sequence value.
+    return (
+        f"SELECT {', '.join(columns)} FROM `{dataset}.ingredients` "
+        f"{where_clause} "
+        "ORDER BY seq ASC, category_code ASC, pack_size_value ASC"
+    )
+
+
+# Bound concurrent startup DDL jobs so migrations overlap scheduling latency without tripping per-table DDL limits.
+STARTUP_SQL_MAX_WORKERS = 8
+
+_SQL_OBJECT_REF = re.compile(r"`([^`]+)`")
+
+# Tokenize quoted text and comments as single units so semicolons inside them never end a statement.
+_SQL_TOKEN = re.compile(
+    r"""'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"|`[^`]*`|--[^\n]*|#[^\n]*|/\*.*?\*/|\w+|;|\s+|.""",
+    re.DOTALL,
+)
+# END followed by one of these closes a scripting loop/branch, which never opened a BEGIN/CASE block.
+_SQL_END_SUFFIXES = {"IF", "LOOP", "WHILE", "REPEAT", "FOR"}
+
+
+def _split_sql_statements(sql: str) -> List[str]:
+    # Split on top-level semicolons only, keeping BEGIN ... END scripts and CASE ... END expressions whole.
+    statements: List[str] = []
+    current: List[str] = []
+    previous = ""
+    depth = 0
+    for token in _SQL_TOKEN.findall(sql):
+        if token.isspace() or token.startswith(("--", "#", "/*")):
+            current.append(token)
+            continue
+        word = token.upper()
+        # Settle a pending END now that the next token shows whether it closed a BEGIN/CASE or an IF/LOOP/...
+        if previous == "END" and word not in _SQL_END_SUFFIXES:
+            depth = max(depth - 1, 0)
+        # BEGIN; and BEGIN TRANSACTION start a transaction rather than a scripting block.
+        if previous == "BEGIN" and word in (";", "TRANSACTION"):
+            depth -= 1
+        if token == ";" and depth == 0:
+            if previous:
+                statements.append("".join(current).strip())
+            current, previous = [], ""
+            continue
+        if word in ("BEGIN", "CASE"):
+            depth += 1
+        current.append(token)
+        previous = word
+    if previous:
+        statements.append("".join(current).strip())
+    return statements
+
+
+def _schedule_statements(statements: Sequence[str]) -> List[List[str]]:
+    # Layer statements so each waits only on earlier work it depends on: the same target object
+    # (ALTER after CREATE, backfill after ALTER), an object it reads (views over views), or its enclosing schema.
+    targets: List[Optional[str]] = []
+    levels: List[int] = []
+    for statement in statements:
+        refs = _SQL_OBJECT_REF.findall(statement)
+        target = refs[0] if refs else None
+        level = 0
+        for index, earlier in enumerate(targets):
+            if earlier is None:
+                continue
+            if earlier == target or earlier in refs or (target or "").startswith(f"{earlier}."):
+                level = max(level, levels[index] + 1)
+        targets.append(target)
+        levels.append(level)
+    layers: List[List[str]] = [[] for _ in range(max(levels, default=-1) + 1)]
+    for statement, level in zip(statements, levels):
+        layers[level].append(statement)
+    return layers
+
+
+# Row count above which list reads download Arrow record batches over the Storage Read API instead of REST pages.
+STORAGE_READ_MIN_ROWS = 1000
+
+# Share one Storage Read API client per process so large result downloads reuse a single gRPC channel.
+_READ_CLIENT: Optional[bigquery_storage_v1.BigQueryReadClient] = None
+
+
+def _get_read_client() -> bigquery_storage_v1.BigQueryReadClient:
+    global _READ_CLIENT
+    with _CLIENTS_LOCK:
+        if _READ_CLIENT is None:
+            _READ_CLIENT = bigquery_storage_v1.BigQueryReadClient()
+        return _READ_CLIENT
+
+
+def _merge_formulations_flat_sql(dataset: str, key_filter: str) -> str:
+    # Copy view rows missing from the roll-up, matched on the formulation key so concurrent writers never duplicate one.
+    columns = ", ".join(FORMULATION_COLUMNS)
+    return (
+        f"MERGE `{dataset}.formulations_flat` t "
+        f"USING (SELECT {columns} FROM `{dataset}.v_formulations_flat` {key_filter}) s "
+        "ON t.set_code = s.set_code AND t.weight_code = s.weight_code AND t.batch_variant_code = s.batch_variant_code "
+        f"WHEN NOT MATCHED THEN INSERT ({columns}) VALUES ({', '.join(f's.{column}' for column in FORMULATION_COLUMNS)})"
+    )
+
+
+def _formulation_select_list(alias: str, include_dry_weights: bool) -> str:
+    # Project only rendered formulation columns so restricted callers skip the weight-variant lookup entirely.
+    columns = (*FORMULATION_LIST_COLUMNS, "dry_weight_items") if include_dry_weights else FORMULATION_LIST_COLUMNS
+    return ", ".join(f"{alias}.{column}" for column in columns)
+
+
+def _rows_to_dicts(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    # Decode multi-row results through one Arrow table so column names are interned once and values convert in C.
+    to_arrow = getattr(rows, "to_arrow", None)
+    # Plain iterables (stubbed jobs in tests and scripts) keep the per-row dict path.
+    if to_arrow is None:
+        return [dict(row) for row in rows]
+    # Only large results stream over the Storage Read API; small reads stay on REST and skip gRPC session setup.
+    total_rows = getattr(rows, "total_rows", None) or 0
+    if total_rows > STORAGE_READ_MIN_ROWS:
+        return to_arrow(bqstorage_client=_get_read_client()).to_pylist()
+    return to_arrow(create_bqstorage_client=False).to_pylist()
+
+
+def _iter_row_dicts(rows: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    # Yield rows one Arrow record batch at a time so large results never hold every row as a dict at once.
+    to_arrow_iterable = getattr(rows, "to_arrow_iterable", None)
+    if to_arrow_iterable is None:
+        for row in rows:
+            yield dict(row)
+        return
+    total_rows = getattr(rows, "total_rows", None) or 0
+    batches = to_arrow_iterable(bqstorage_client=_get_read_client()) if total_rows > STORAGE_READ_MIN_ROWS else to_arrow_iterable()
+    for batch in batches:
+        yield from batch.to_pylist()
+
+
+def _get_client(project_id: str) -> bigquery.Client:
+    # Build each project's client once under a lock so concurrent startup paths never create duplicates.
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(project_id)
+        if client is None:
+            client = _build_client(project_id)
+            _CLIENTS[project_id] = client
+        return client
+
 
 @dataclass
 class BigQueryService:
     project_id: str
     dataset_id: str
     bq_location: Optional[str] = None
+    use_storage_write: bool = False
 
     def __post_init__(self) -> None:
-        # Create one shared BigQuery client for the service lifecycle to reuse pooled transport connections.
-        self.client = bigquery.Client(project=self.project_id)
+        # Reuse the process-wide client for this project so pooled transport connections survive across instances.
+        self.client = _get_client(self.project_id)
+        # Append new rows through the Storage Write API default stream when enabled; None keeps INSERT DML.
+        self._row_writer = StorageWriteService(self.project_id, self.dataset_id) if self.use_storage_write else None
+        # Hold recently read point-lookup rows per instance; writers below invalidate the keys they touch.
+        self._lookup_cache: TTLCache = TTLCache(maxsize=LOOKUP_CACHE_MAXSIZE, ttl=LOOKUP_CACHE_TTL_SECONDS)
+        self._lookup_lock = threading.RLock()
+
+    def _invalidate_lookups(self, namespace: str, *key_parts: Any) -> None:
+        # Drop one exact cached key, or every key in the namespace when the affected key is unknown.
+        cache = getattr(self, "_lookup_cache", None)
+        if cache is None:
+            return
+        with self._lookup_lock:
+            if key_parts:
+                cache.pop((namespace, *key_parts), None)
+                return
+            for key in [key for key in cache.keys() if key[0] == namespace]:
+                cache.pop(key, None)
+
+    def _invalidate_ingredient_lookups(self, skus: Sequence[str]) -> None:
+        # Ingredient rows are cached by SKU and by each match key, so a row update clears every ingredient namespace.
+        for sku in skus:
+            self._invalidate_lookups("ingredient", sku)
+        for namespace in ("ingredient_seq", "ingredient_duplicate", "ingredient_product", "ingredient_category_seq"):
+            self._invalidate_lookups(namespace)
 
     def _resolve_query_location(self) -> Optional[str]:
         # Build an ordered list of location candidates so explicit constructor config wins over environment defaults.
@@ -46,21 +435,161 @@ class BigQueryService:
         candidates = [value.strip() for value in raw_candidates if value and value.strip()]
         # Choose the first non-empty location value, keeping None when no location is configured.
         location = candidates[0] if candidates else None
+        # Ask BigQuery where the dataset actually lives when nothing is configured, instead of guessing from its name.
+        client = getattr(self, "client", None)
+        if location is None and client is not None:
+            try:
+                location = client.get_dataset(self.dataset).location
+            except NotFound:
+                location = None
         # Force an EU-safe default when the dataset appears to be EU-scoped but no explicit location is configured.
         if location is None and (self.dataset_id.lower().endswith("_eu") or "_eu_" in self.dataset_id.lower() or self.dataset_id.lower().endswith("eu")):
             location = "europe-west2"
         return location
 
-    @property
+    @functools.cached_property
+    def _query_location(self) -> Optional[str]:
+        # Resolve the job location once per instance; ensure_tables drops it after creating the dataset.
+        return self._resolve_query_location()
+
+    @functools.cached_property
     def dataset(self) -> str:
-        # Build the fully-qualified dataset reference used throughout all SQL statements.
+        # Build the fully-qualified dataset reference used throughout all SQL statements once per instance.
         return f"{self.project_id}.{self.dataset_id}"
 
+    @functools.cached_property
+    def _sql(self) -> types.SimpleNamespace:
+        # Render the fixed point-lookup statements once per instance instead of rebuilding f-strings per call.
+        ingredient_columns = ", ".join(INGREDIENT_COLUMNS)
+        batch_columns = ", ".join(BATCH_COLUMNS)
+        partner_columns = "partner_code, partner_name, machine_specification, created_at, created_by"
+        return types.SimpleNamespace(
+            insert_ingredient=(
+                f"INSERT `{self.dataset}.ingredients` ({ingredient_columns}) "
+                f"VALUES ({', '.join(f'@{column}' for column in INGREDIENT_COLUMNS)})"
+            ),
+            insert_batch=(
+                f"INSERT `{self.dataset}.ingredient_batches` ({batch_columns}) "
+                f"VALUES ({', '.join(f'@{column}' for column in BATCH_COLUMNS)})"
+            ),
+            get_ingredient=f"SELECT {ingredient_columns} FROM `{self.dataset}.ingredients` WHERE sku = @sku",
+            find_ingredient_by_seq=f"SELECT {ingredient_columns} FROM `{self.dataset}.ingredients` WHERE seq = @seq LIMIT 1",
+            list_batches=(
+                f"SELECT {batch_columns} FROM `{self.dataset}.ingredient_batches` "
+                "WHERE sku = @sku AND (@include_archived OR COALESCE(archived, FALSE) = FALSE) ORDER BY ingredient_batch_code"
+            ),
+            get_batch=(
+                f"SELECT {batch_columns} FROM `{self.dataset}.ingredient_batches` "
+                "WHERE sku = @sku AND ingredient_batch_code = @batch_code LIMIT 1"
+            ),
+            get_set_by_hash=f"SELECT set_code FROM `{self.dataset}.ingredient_sets` WHERE set_hash = @set_hash",
+            get_set=f"SELECT {', '.join(SET_COLUMNS)} FROM `{self.dataset}.v_sets` WHERE set_code = @set_code LIMIT 1",
+            get_weight_by_hash=(
+                f"SELECT weight_code FROM `{self.dataset}.dry_weight_variants` "
+                "WHERE set_code = @set_code AND weight_hash = @weight_hash"
+            ),
+            get_weight=(
+                f"SELECT {', '.join(WEIGHT_VARIANT_COLUMNS)} FROM `{self.dataset}.v_weight_variants` "
+                "WHERE set_code = @set_code AND weight_code = @weight_code LIMIT 1"
+            ),
+            get_batch_variant_by_hash=(
+                f"SELECT batch_variant_code FROM `{self.dataset}.batch_variants` "
+                "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_hash = @batch_hash"
+            ),
+            list_location_partners=(
+                f"SELECT {partner_columns} FROM `{self.dataset}.location_partners` ORDER BY partner_code"
+            ),
+            list_partner_machine_options=(
+                "SELECT partner_code, partner_name, machine_specification AS machine_code "
+                f"FROM `{self.dataset}.location_partners` ORDER BY partner_code"
+            ),
+            get_location_partner=(
+                f"SELECT {partner_columns} FROM `{self.dataset}.location_partners` WHERE partner_code = @partner_code LIMIT 1"
+            ),
+            insert_location_partner=(
+                f"MERGE `{self.dataset}.location_partners` t "
+                "USING (SELECT @partner_code AS partner_code) s ON t.partner_code = s.partner_code "
+                f"WHEN NOT MATCHED THEN INSERT ({partner_columns}) "
+                "VALUES (@partner_code, @partner_name, @machine_specification, CURRENT_TIMESTAMP(), @created_by)"
+            ),
+            insert_location_code=(
+                f"MERGE `{self.dataset}.location_codes` t "
+                "USING (SELECT @location_id AS location_id) s ON t.location_id = s.location_id "
+                f"WHEN NOT MATCHED THEN INSERT ({', '.join(LOCATION_CODE_INSERT_COLUMNS)}) "
+                "VALUES (@set_code, @weight_code, @batch_variant_code, @partner_code, @production_date, @location_id, "
+                "CURRENT_TIMESTAMP(), @created_by)"
+            ),
+            insert_location_codes_bulk=(
+                f"MERGE `{self.dataset}.location_codes` t "
+                "USING ("
+                "  SELECT location_id, @set_codes[OFFSET(pos)] AS set_code, @weight_codes[OFFSET(pos)] AS weight_code, "
+                "  @batch_variant_codes[OFFSET(pos)] AS batch_variant_code, @partner_codes[OFFSET(pos)] AS partner_code, "
+                "  @production_dates[OFFSET(pos)] AS production_date, NULLIF(@created_bys[OFFSET(pos)], '') AS created_by "
+                "  FROM UNNEST(@location_ids) AS location_id WITH OFFSET pos"
+                ") s ON t.location_id = s.location_id "
+                f"WHEN NOT MATCHED THEN INSERT ({', '.join(LOCATION_CODE_INSERT_COLUMNS)}) "
+                "VALUES (s.set_code, s.weight_code, s.batch_variant_code, s.partner_code, s.production_date, s.location_id, "
+                "CURRENT_TIMESTAMP(), s.created_by)"
+            ),
+            list_location_code_ids=f"SELECT DISTINCT location_id FROM `{self.dataset}.location_codes` ORDER BY location_id",
+            list_compounding_how_codes=(
+                f"SELECT processing_code FROM `{self.dataset}.compounding_how` "
+                "WHERE is_active = TRUE ORDER BY processing_code DESC"
+            ),
+            get_user_role=(
+                "SELECT email, first_name, last_name, role_group, permissions, is_active, created_at, created_by, updated_at, updated_by "
+                f"FROM `{self.dataset}.user_roles` WHERE LOWER(email) = LOWER(@email) AND is_active = TRUE LIMIT 1"
+            ),
+            find_ingredient_by_category_and_seq=(
+                f"SELECT {', '.join(INGREDIENT_MATCH_COLUMNS)} FROM `{self.dataset}.ingredients` "
+                "WHERE category_code = @category_code AND seq = @seq LIMIT 1"
+            ),
+            formulation_exists=(
+                f"SELECT 1 FROM `{self.dataset}.formulations_flat` "
+                "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_variant_code = @batch_variant_code LIMIT 1"
+            ),
+            formulation_exists_unrolled=(
+                f"SELECT 1 FROM `{self.dataset}.v_formulations_flat` "
+                "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_variant_code = @batch_variant_code LIMIT 1"
+            ),
+            merge_formulation=_merge_formulations_flat_sql(
+                self.dataset,
+                "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_variant_code = @batch_variant_code",
+            ),
+            # Compare row counts (answered from table metadata) so the full view MERGE runs only when the roll-up is behind.
+            backfill_formulations=(
+                f"IF (SELECT COUNT(1) FROM `{self.dataset}.batch_variants`) > "
+                f"(SELECT COUNT(1) FROM `{self.dataset}.formulations_flat`) THEN "
+                f"{_merge_formulations_flat_sql(self.dataset, '')}; "
+                "END IF"
+            ),
+            get_conversion1_context=(
+                "SELECT context_code, pellet_bag_code, partner_code, machine_code, date_yymmdd, created_at, created_by, updated_at, updated_by "
+                f"FROM `{self.dataset}.conversion1_context` WHERE context_code = @context_code AND is_active = TRUE LIMIT 1"
+            ),
+            conversion1_context_exists=(
+                f"SELECT 1 FROM `{self.dataset}.conversion1_context` WHERE context_code = @context_code AND is_active = TRUE LIMIT 1"
+            ),
+            conversion1_how_processing_code_exists=(
+                f"SELECT 1 FROM `{self.dataset}.conversion1_how` "
+                "WHERE context_code = @context_code AND processing_code = @processing_code AND is_active = TRUE LIMIT 1"
+            ),
+            conversion1_how_exists=(
+                f"SELECT 1 FROM `{self.dataset}.conversion1_how` WHERE conversion1_how_code = @code AND is_active = TRUE LIMIT 1"
+            ),
+            latest_compounding_suffix=(
+                f"SELECT MAX(process_code_suffix) AS process_code_suffix FROM `{self.dataset}.compounding_how` WHERE is_active = TRUE"
+            ),
+            compounding_how_exists=(
+                f"SELECT 1 FROM `{self.dataset}.compounding_how` WHERE processing_code = @processing_code AND is_active = TRUE LIMIT 1"
+            ),
+        )
+
     def _run(self, query: str, params: Sequence[bigquery.ScalarQueryParameter]) -> bigquery.job.QueryJob:
-        # Resolve the query location for each execution so runtime env updates are respected consistently.
-        location = self._resolve_query_location()
-        # Construct a query job config for typed parameters only; location must be passed to client.query itself.
-        job_config = bigquery.QueryJobConfig(query_parameters=list(params))
+        # Reuse the location resolved once for this instance so every job targets the dataset's region.
+        location = self._query_location
+        # Build the job config for typed parameters only; location must be passed to client.query itself.
+        job_config = _job_config(params)
         # Execute every query through a single helper path so all jobs target the same explicit BigQuery region.
         job = self.client.query(query, job_config=job_config, location=location)
         # Capture start time at submission so logs report end-to-end wait from submit to job completion.
@@ -99,45 +628,260 @@ class BigQueryService:
         job.result = instrumented_result  # type: ignore[assignment]
         return job
 
+    def _run_and_fetch(
+        self,
+        query: str,
+        params: Sequence[bigquery.ScalarQueryParameter],
+        max_results: Optional[int] = None,
+    ) -> bigquery.table.RowIterator:
+        # Take the jobs.query fast path so short reads return rows inline instead of submit, poll and fetch round-trips.
+        started_at = datetime.now(timezone.utc)
+        rows = self.client.query_and_wait(
+            query,
+            job_config=_job_config(params),
+            location=self._query_location,
+            max_results=max_results,
+        )
+        # Record the same timing and log line as _run so fast-path reads stay visible in request metrics.
+        elapsed_ms = (datetime.now(timezone.utc) - started_at).total_seconds() * 1000.0
+        add_bigquery_timing(elapsed_ms)
+        LOGGER.info(
+            "bigquery.query request_id=%s job_id=%s elapsed_ms=%.2f total_bytes_processed=%s sql_preview=%s",
+            request_id_var.get(),
+            rows.job_id or "",
+            elapsed_ms,
+            "unknown",
+            " ".join(query.strip().split())[:180],
+        )
+        return rows
+
+    def _fetch_first(self, query: str, params: Sequence[bigquery.ScalarQueryParameter]) -> Optional[Any]:
+        # Ask for a single inline row so point lookups without LIMIT 1 never ship or page through extra matches.
+        return next(iter(self._run_and_fetch(query, params, max_results=1)), None)
+
+    def _append_rows(self, table: str, columns: Sequence[Tuple[str, str]], rows: Sequence[Sequence[Any]]) -> bool:
+        # Report False when Storage Write is unavailable so callers fall back to their INSERT DML.
+        writer = getattr(self, "_row_writer", None)
+        if writer is None or not writer.supports(columns):
+            return False
+        started_at = datetime.now(timezone.utc)
+        for chunk_start in range(0, len(rows), INSERT_ROWS_CHUNK_SIZE):
+            writer.append_rows(table, columns, rows[chunk_start:chunk_start + INSERT_ROWS_CHUNK_SIZE])
+        add_bigquery_timing((datetime.now(timezone.utc) - started_at).total_seconds() * 1000.0)
+        return True
+
+    def _append_param_row(self, table: str, params: Sequence[bigquery.ScalarQueryParameter]) -> bool:
+        # Reuse an INSERT's typed parameters as the column list and single row for a Storage Write append.
+        columns = [(param.name, param.type_) for param in params]
+        return self._append_rows(table, columns, [[param.value for param in params]])
+
+    def _run_pipelined(self, statements: Sequence[Tuple[str, Sequence[bigquery.ScalarQueryParameter]]]) -> None:
+        # Start a window of independent DML jobs before awaiting any, so their scheduling latency overlaps.
+        for window_start in range(0, len(statements), DML_MAX_CONCURRENT_JOBS):
+            jobs = [self._run(query, params) for query, params in statements[window_start:window_start + DML_MAX_CONCURRENT_JOBS]]
+            for job in jobs:
+                job.result()
+
+    def _insert_rows(
+        self,
+        table: str,
+        columns: Sequence[Tuple[str, str]],
+        rows: Sequence[Sequence[Any]],
+        leading: Sequence[Tuple[str, Sequence[bigquery.ScalarQueryParameter]]] = (),
+    ) -> None:
+        # Pipeline any leading statements (the parent-row INSERT) with the child chunks; none depends on another.
+        statements: List[Tuple[str, Sequence[bigquery.ScalarQueryParameter]]] = list(leading)
+        if self._append_rows(table, columns, rows):
+            self._run_pipelined(statements)
+            return
+        # Write child rows with one multi-row INSERT per chunk instead of one DML job per row.
+        column_names = ", ".join(name for name, _ in columns)
+        for chunk_start in range(0, len(rows), INSERT_ROWS_CHUNK_SIZE):
+            chunk = rows[chunk_start:chunk_start + INSERT_ROWS_CHUNK_SIZE]
+            values_sql: List[str] = []
+            params: List[bigquery.ScalarQueryParameter] = []
+            for index, row in enumerate(chunk):
+                # Suffix each parameter with the row index so every row binds its own typed values.
+                placeholders = []
+                for (name, type_), value in zip(columns, row):
+                    placeholders.append(f"@{name}_{index}")
+                    params.append(bigquery.ScalarQueryParameter(f"{name}_{index}", type_, value))
+                values_sql.append(f"({', '.join(placeholders)})")
+            query = f"INSERT `{self.dataset}.{table}` ({column_names}) VALUES {', '.join(values_sql)}"
+            statements.append((query, params))
+        self._run_pipelined(statements)
+
+    def _split_window_total(
+        self,
+        rows: Iterable[Any],
+        count_query: str,
+        params: Sequence[bigquery.ScalarQueryParameter],
+        offset: int,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        # Peel the COUNT(1) OVER () column off paged rows so callers keep the original (items, total) shape.
+        items = _rows_to_dicts(rows)
+        total = int(items[0].pop("_total") or 0) if items else 0
+        for item in items[1:]:
+            item.pop("_total", None)
+        # An empty page past the first carries no window total, so fall back to an explicit count for page controls.
+        if not items and offset > 0:
+            total_rows = list(self._run_and_fetch(count_query, params))
+            total = int(total_rows[0]["total"]) if total_rows else 0
+        return items, total
+
+    def _paginate(
+        self,
+        table: str,
+        columns: Sequence[str],
+        where: Sequence[str],
+        params: Sequence[bigquery.ScalarQueryParameter],
+        order_by: Sequence[Tuple[str, str]],
+        page: int,
+        page_size: int,
+        cursor: Optional[str],
+        total_namespace: str,
+        want_total: bool = True,
+        descending: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
+        # Share one paging path so offset pages and cursor (seek) pages order and count rows identically.
+        page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+        direction = "DESC" if descending else "ASC"
+        order_clause = ", ".join(f"{column} {direction}" for column, _ in order_by)
+        # Always read the sort key so the next cursor can be built from the last row.
+        select_list = ", ".join([*columns, *(column for column, _ in order_by if column not in columns)])
+        count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.{table}` {where_clause}"
+        total_key = (total_namespace, where_clause, *(param.value for param in params))
+        limit_param = bigquery.ScalarQueryParameter("limit", "INT64", page_size)
+        cache = getattr(self, "_lookup_cache", None)
+
+        if cursor:
+            # Seek past the previous page's last sort key so BigQuery never reads and discards skipped rows.
+            values, offset = _decode_page_cursor(cursor, [param_type for _, param_type in order_by])
+            seek_where = [*where, _seek_predicate([column for column, _ in order_by], descending)]
+            seek_params = [
+                bigquery.ScalarQueryParameter(f"cursor_{index}", param_type, value)
+                for index, ((_, param_type), value) in enumerate(zip(order_by, values))
+            ]
+            data_query = (
+                f"SELECT {select_list} FROM `{self.dataset}.{table}` "
+                f"WHERE {' AND '.join(seek_where)} "
+                f"ORDER BY {order_clause} "
+                "LIMIT @limit"
+            )
+            rows = self._run(data_query, [*params, *seek_params, limit_param]).result()
+            items = _rows_to_dicts(rows)
+            total: Optional[int] = None
+            if 0 < len(items) < page_size:
+                # A short page is the last one, so the offset carried in the cursor implies the total without a count job.
+                # The token is client-supplied, so this total is returned but never cached for other requests.
+                total = offset + len(items)
+            elif cache is not None:
+                # Reuse the total counted on the first page; count again only when it has expired or was never seen.
+                with self._lookup_lock:
+                    total = cache.get(total_key)
+            if total is None and want_total:
+                total_rows = list(self._run_and_fetch(count_query, params))
+                total = int(total_rows[0]["total"]) if total_rows else 0
+                if cache is not None:
+                    with self._lookup_lock:
+                        cache[total_key] = total
+        else:
+            offset = max(page - 1, 0) * page_size
+            # Refuse deep OFFSET scans that would sort and discard the whole prefix; callers must seek with a cursor.
+            if offset > MAX_PAGE_OFFSET:
+                raise ValueError("Page is too deep to fetch by number; follow next_cursor instead")
+            data_params = [*params, limit_param, bigquery.ScalarQueryParameter("offset", "INT64", offset)]
+            if want_total:
+                # Offset pages carry the filtered total as a window column so one job serves rows and page controls.
+                data_query = (
+                    f"SELECT {select_list}, COUNT(1) OVER () AS _total FROM `{self.dataset}.{table}` "
+                    f"{where_clause} "
+                    f"ORDER BY {order_clause} "
+                    "LIMIT @limit OFFSET @offset"
+                )
+                rows = self._run(data_query, data_params).result()
+                items, total = self._split_window_total(rows, count_query, params, offset)
+            else:
+                # Callers that do not render page controls skip the window aggregate over the whole filtered set.
+                data_query = (
+                    f"SELECT {select_list} FROM `{self.dataset}.{table}` "
+                    f"{where_clause} "
+                    f"ORDER BY {order_clause} "
+                    "LIMIT @limit OFFSET @offset"
+                )
+                items = _rows_to_dicts(self._run(data_query, data_params).result())
+                total = offset + len(items) if 0 < len(items) < page_size else None
+            if cache is not None and total is not None:
+                with self._lookup_lock:
+                    cache[total_key] = total
+
+        # Hand back a cursor only when the page is full, so a short page signals the end of the listing.
+        next_cursor = (
+            _encode_page_cursor([items[-1][column] for column, _ in order_by], offset + len(items))
+            if len(items) == page_size
+            else None
+        )
+        return items, total, next_cursor
+
     def _render_sql(self, raw_sql: str) -> str:
         # Resolve template placeholders so infra SQL files can remain environment-agnostic in source control.
         return raw_sql.replace("PROJECT_ID", self.project_id).replace("DATASET_ID", self.dataset_id)
 
-    def _run_sql_file(self, sql_file: Path) -> None:
-        # Read and render one SQL file before splitting into statements for idempotent sequential execution.
+    def _read_sql_statements(self, sql_file: Path) -> List[str]:
+        # Read and render one SQL file before splitting it so one file can contain multi-statement migrations.
         rendered = self._render_sql(sql_file.read_text(encoding="utf-8"))
-        # Execute each non-empty statement separately so one file can contain multi-statement migrations.
-        for statement in (part.strip() for part in rendered.split(";") if part.strip()):
-            self._run(statement, []).result()
+        return _split_sql_statements(rendered)
+
+    def _run_statements_concurrently(self, statements: Sequence[str]) -> None:
+        # Run each dependency layer in parallel and finish it before the next starts, so ordering is kept only where needed.
+        with ThreadPoolExecutor(max_workers=STARTUP_SQL_MAX_WORKERS) as executor:
+            for layer in _schedule_statements(statements):
+                futures = [executor.submit(lambda statement=statement: self._run(statement, []).result()) for statement in layer]
+                # Log every failed statement in the layer so one broken migration does not hide another.
+                errors = [future.exception() for future in futures]
+                for statement, error in zip(layer, errors):
+                    if error is not None:
+                        LOGGER.error("Startup SQL failed: %s (%s)", " ".join(statement.split())[:180], error)
+                # Raise the first failure once the layer settles so later layers never run against a broken schema.
+                first_error = next((error for error in errors if error is not None), None)
+                if first_error is not None:
+                    raise first_error
 
     def ensure_tables(self) -> None:
-        # Apply schema + seed + views in deterministic order so startup repairs drift in empty or partially built datasets.
+        # Apply schema + seed first, then additive migrations, then views over the migrated tables.
         ordered_files = [
             Path("infra/bigquery/ddl/001_create_tables.sql"),
             Path("infra/bigquery/ddl/002_seed_counters.sql"),
-            Path("infra/bigquery/views/101_views.sql"),
         ]
         # Log effective migration context to make region/debug issues obvious in Cloud Run startup logs.
         LOGGER.info(
             "Ensuring BigQuery schema project=%s dataset=%s location=%s",
             self.project_id,
             self.dataset_id,
-            self._resolve_query_location(),
+            self._query_location,
         )
-        # Execute the required baseline files first, then run remaining DDL files for additive backfill migrations.
-        for sql_file in ordered_files:
-            if sql_file.exists():
-                self._run_sql_file(sql_file)
-
         # Include any additional DDL files not in the baseline list so later migrations are also applied at startup.
         baseline_names = {path.name for path in ordered_files}
-        for sql_file in sorted(Path("infra/bigquery/ddl").glob("*.sql")):
-            if sql_file.name in baseline_names:
-                continue
-            self._run_sql_file(sql_file)
+        ordered_files.extend(
+            sql_file for sql_file in sorted(Path("infra/bigquery/ddl").glob("*.sql")) if sql_file.name not in baseline_names
+        )
+        ordered_files.extend(sorted(Path("infra/bigquery/views").glob("*.sql")))
+
+        # Collect statements in file order, then let the scheduler overlap independent tables and views.
+        statements: List[str] = []
+        for sql_file in ordered_files:
+            if sql_file.exists():
+                statements.extend(self._read_sql_statements(sql_file))
+        self._run_statements_concurrently(statements)
+        # A dataset created by this run may report a location that was unknown before, so resolve it afresh.
+        self.__dict__.pop("_query_location", None)
+        # Backfill formulations missing from the roll-up only when it has fewer rows than there are batch variants.
+        self._run(self._sql.backfill_formulations, []).result()
 
         # Validate critical runtime columns immediately so schema drift fails fast with an actionable message.
         self.validate_required_schema()
+        self.ensure_table_clustering()
         LOGGER.info("BigQuery startup migration completed")
 
     def run_startup_sql(self) -> None:
@@ -196,55 +940,53 @@ class BigQueryService:
             LOGGER.error(message)
             raise RuntimeError(message)
 
-    def allocate_counter(self, counter_name: str, scope: str, start_value: int) -> int:
-        for _ in range(10):
-            select_query = (
-                f"SELECT next_value FROM `{self.dataset}.code_counters` "
-                "WHERE counter_name = @counter_name AND scope = @scope"
-            )
-            select_job = self._run(
-                select_query,
-                [
-                    bigquery.ScalarQueryParameter("counter_name", "STRING", counter_name),
-                    bigquery.ScalarQueryParameter("scope", "STRING", scope),
-                ],
-            )
-            rows = list(select_job.result())
-            if not rows:
-                insert_query = (
-                    f"INSERT `{self.dataset}.code_counters` (counter_name, scope, next_value, updated_at) "
-                    "VALUES (@counter_name, @scope, @next_value, CURRENT_TIMESTAMP())"
-                )
-                insert_job = self._run(
-                    insert_query,
-                    [
-                        bigquery.ScalarQueryParameter("counter_name", "STRING", counter_name),
-                        bigquery.ScalarQueryParameter("scope", "STRING", scope),
-                        bigquery.ScalarQueryParameter("next_value", "INT64", start_value),
-                    ],
-                )
-                insert_job.result()
-                current_value = start_value
-            else:
-                current_value = int(rows[0]["next_value"])
+    def ensure_table_clustering(self) -> None:
+        # Existing datasets predate CLUSTER BY in the create DDL, so patch each clustering spec in place once.
+        for table_name, fields in TABLE_CLUSTER_FIELDS.items():
+            table = self.client.get_table(f"{self.dataset}.{table_name}")
+            if table.clustering_fields == fields:
+                continue
+            table.clustering_fields = fields
+            self.client.update_table(table, ["clustering_fields"])
+            LOGGER.info("Updated %s clustering fields to %s", table_name, ", ".join(fields))
 
-            update_query = (
-                f"UPDATE `{self.dataset}.code_counters` "
-                "SET next_value = @next_value, updated_at = CURRENT_TIMESTAMP() "
-                "WHERE counter_name = @counter_name AND scope = @scope AND next_value = @current_value"
-            )
-            update_job = self._run(
-                update_query,
-                [
-                    bigquery.ScalarQueryParameter("next_value", "INT64", current_value + 1),
-                    bigquery.ScalarQueryParameter("counter_name", "STRING", counter_name),
-                    bigquery.ScalarQueryParameter("scope", "STRING", scope),
-                    bigquery.ScalarQueryParameter("current_value", "INT64", current_value),
-                ],
-            )
-            update_job.result()
-            if update_job.num_dml_affected_rows == 1:
-                return current_value
+    def allocate_counter(self, counter_name: str, scope: str, start_value: int, count: int = 1) -> int:
+        # Increment-or-seed the counter by count and read back the first reserved value inside one scripted transaction job.
+        query = (
+            "DECLARE allocated INT64; "
+            "BEGIN TRANSACTION; "
+            f"MERGE `{self.dataset}.code_counters` T "
+            "USING (SELECT @counter_name AS counter_name, @scope AS scope) S "
+            "ON T.counter_name = S.counter_name AND T.scope = S.scope "
+            "WHEN MATCHED THEN "
+            "  UPDATE SET next_value = T.next_value + @count, updated_at = CURRENT_TIMESTAMP() "
+            "WHEN NOT MATCHED THEN "
+            "  INSERT (counter_name, scope, next_value, updated_at) "
+            "  VALUES (S.counter_name, S.scope, @start_value + @count, CURRENT_TIMESTAMP()); "
+            "SET allocated = ("
+            f"  SELECT next_value - @count FROM `{self.dataset}.code_counters` "
+            "  WHERE counter_name = @counter_name AND scope = @scope"
+            "); "
+            "COMMIT TRANSACTION; "
+            "SELECT allocated AS allocated"
+        )
+        params = [
+            bigquery.ScalarQueryParameter("counter_name", "STRING", counter_name),
+            bigquery.ScalarQueryParameter("scope", "STRING", scope),
+            bigquery.ScalarQueryParameter("start_value", "INT64", start_value),
+            bigquery.ScalarQueryParameter("count", "INT64", count),
+        ]
+        for _ in range(5):
+            try:
+                # The script's final SELECT yields exactly one row, so read it without materializing a list.
+                row = next(iter(self._run_and_fetch(query, params)), None)
+            except BadRequest as exc:
+                # Retry only when BigQuery aborted the transaction because another allocation committed first.
+                if "concurrent update" not in str(exc).lower():
+                    raise
+                continue
+            if row is not None and row["allocated"] is not None:
+                return int(row["allocated"])
         raise RuntimeError("Failed to allocate counter after retries")
 
     def list_user_roles(self) -> List[Dict[str, Any]]:
@@ -254,24 +996,18 @@ class BigQueryService:
             f"FROM `{self.dataset}.user_roles` ORDER BY email"
         )
         rows = self._run(query, []).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
     def count_active_user_roles(self) -> int:
         # Count active user-role rows so the first authenticated user can bootstrap admin access safely.
         query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.user_roles` WHERE is_active = TRUE"
-        rows = list(self._run(query, []).result())
+        rows = list(self._run_and_fetch(query, []))
         return int(rows[0]["total"]) if rows else 0
 
     def get_user_role(self, email: str) -> Optional[Dict[str, Any]]:
         # Fetch the one active user-role row keyed by the Google-authenticated email address.
-        query = (
-            f"SELECT email, first_name, last_name, role_group, permissions, is_active, created_at, created_by, updated_at, updated_by "
-            f"FROM `{self.dataset}.user_roles` WHERE LOWER(email) = LOWER(@email) AND is_active = TRUE LIMIT 1"
-        )
-        rows = self._run(query, [bigquery.ScalarQueryParameter("email", "STRING", email)]).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(self._sql.get_user_role, [bigquery.ScalarQueryParameter("email", "STRING", email)])
+        return dict(row) if row is not None else None
 
     def create_or_update_user_role(
         self,
@@ -319,36 +1055,21 @@ class BigQueryService:
         ).result()
 
     def insert_ingredient(self, ingredient: Dict[str, Any]) -> None:
-        query = (
-            f"INSERT `{self.dataset}.ingredients` "
-            "(sku, category_code, seq, pack_size_value, pack_size_unit, trade_name_inci, supplier, spec_grade, "
-            "format, created_at, updated_at, created_by, updated_by, is_active, msds_object_path, msds_filename, msds_content_type, msds_uploaded_at) "
-            "VALUES (@sku, @category_code, @seq, @pack_size_value, @pack_size_unit, @trade_name_inci, "
-            "@supplier, @spec_grade, @format, @created_at, @updated_at, @created_by, @updated_by, "
-            "@is_active, @msds_object_path, @msds_filename, @msds_content_type, @msds_uploaded_at)"
+        params = _row_params(INGREDIENT_COLUMN_TYPES, ingredient)
+        if not self._append_param_row("ingredients", params):
+            self._run(self._sql.insert_ingredient, params).result()
+
+    def insert_ingredients_bulk(self, ingredients: Sequence[Dict[str, Any]]) -> None:
+        # Write many ingredient rows as Storage Write appends or chunked multi-row INSERTs instead of one DML job each.
+        if not ingredients:
+            return
+        self._insert_rows(
+            "ingredients",
+            INGREDIENT_COLUMN_TYPES,
+            [tuple(ingredient.get(name) for name in INGREDIENT_COLUMNS) for ingredient in ingredients],
         )
-        params = [
-            bigquery.ScalarQueryParameter("sku", "STRING", ingredient["sku"]),
-            bigquery.ScalarQueryParameter("category_code", "INT64", ingredient["category_code"]),
-            bigquery.ScalarQueryParameter("seq", "INT64", ingredient["seq"]),
-            bigquery.ScalarQueryParameter("pack_size_value", "INT64", ingredient["pack_size_value"]),
-            bigquery.ScalarQueryParameter("pack_size_unit", "STRING", ingredient["pack_size_unit"]),
-            bigquery.ScalarQueryParameter("trade_name_inci", "STRING", ingredient["trade_name_inci"]),
-            bigquery.ScalarQueryParameter("supplier", "STRING", ingredient["supplier"]),
-            bigquery.ScalarQueryParameter("spec_grade", "STRING", ingredient.get("spec_grade")),
-            bigquery.ScalarQueryParameter("format", "STRING", ingredient["format"]),
-            bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", ingredient["created_at"]),
-            bigquery.ScalarQueryParameter("updated_at", "TIMESTAMP", ingredient["updated_at"]),
-            bigquery.ScalarQueryParameter("created_by", "STRING", ingredient.get("created_by")),
-            bigquery.ScalarQueryParameter("updated_by", "STRING", ingredient.get("updated_by")),
-            bigquery.ScalarQueryParameter("is_active", "BOOL", ingredient["is_active"]),
-            bigquery.ScalarQueryParameter("msds_object_path", "STRING", ingredient.get("msds_object_path")),
-            bigquery.ScalarQueryParameter("msds_filename", "STRING", ingredient.get("msds_filename")),
-            bigquery.ScalarQueryParameter("msds_content_type", "STRING", ingredient.get("msds_content_type")),
-            bigquery.ScalarQueryParameter("msds_uploaded_at", "TIMESTAMP", ingredient.get("msds_uploaded_at")),
-        ]
-        self._run(query, params).result()
 
+    @_cached_lookup("ingredient_duplicate")
     def find_ingredient_duplicate(
         self,
         category_code: int,
@@ -358,9 +1079,11 @@ class BigQueryService:
         format: str,
         pack_size_value: int,
         pack_size_unit: str,
+        columns: Sequence[str] = INGREDIENT_MATCH_COLUMNS,
     ) -> Optional[Dict[str, Any]]:
+        # Select only the requested columns; callers check existence and the matched SKU/sequence.
         query = (
-            f"SELECT * FROM `{self.dataset}.ingredients` "
+            f"SELECT {', '.join(columns)} FROM `{self.dataset}.ingredients` "
             "WHERE category_code = @category_code "
             "AND trade_name_inci = @trade_name_inci "
             "AND supplier = @supplier "
@@ -379,11 +1102,10 @@ class BigQueryService:
             bigquery.ScalarQueryParameter("pack_size_unit", "STRING", pack_size_unit),
             bigquery.ScalarQueryParameter("spec_grade", "STRING", spec_grade),
         ]
-        rows = self._run(query, params).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(query, params)
+        return dict(row) if row is not None else None
 
+    @_cached_lookup("ingredient_product")
     def find_ingredient_product(
         self,
         category_code: int,
@@ -392,9 +1114,11 @@ class BigQueryService:
         spec_grade: Optional[str],
         format: str,
         pack_size_unit: str,
+        columns: Sequence[str] = INGREDIENT_MATCH_COLUMNS,
     ) -> Optional[Dict[str, Any]]:
+        # Select only the requested columns; callers reuse the matched product's sequence number.
         query = (
-            f"SELECT * FROM `{self.dataset}.ingredients` "
+            f"SELECT {', '.join(columns)} FROM `{self.dataset}.ingredients` "
             "WHERE category_code = @category_code "
             "AND trade_name_inci = @trade_name_inci "
             "AND supplier = @supplier "
@@ -411,35 +1135,26 @@ class BigQueryService:
             bigquery.ScalarQueryParameter("pack_size_unit", "STRING", pack_size_unit),
             bigquery.ScalarQueryParameter("spec_grade", "STRING", spec_grade),
         ]
-        rows = self._run(query, params).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(query, params)
+        return dict(row) if row is not None else None
 
+    @_cached_lookup("ingredient_seq")
     def find_ingredient_by_seq(self, seq: int) -> Optional[Dict[str, Any]]:
         # Preserve compatibility for legacy callers that looked up a sequence without category scope.
-        query = f"SELECT * FROM `{self.dataset}.ingredients` WHERE seq = @seq LIMIT 1"
-        rows = self._run(query, [bigquery.ScalarQueryParameter("seq", "INT64", seq)]).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(self._sql.find_ingredient_by_seq, [bigquery.ScalarQueryParameter("seq", "INT64", seq)])
+        return dict(row) if row is not None else None
 
+    @_cached_lookup("ingredient_category_seq")
     def find_ingredient_by_category_and_seq(self, category_code: int, seq: int) -> Optional[Dict[str, Any]]:
         # Enforce uniqueness within category+sequence, matching the SKU structure <category>_<seq>_<pack_size>.
-        query = (
-            f"SELECT * FROM `{self.dataset}.ingredients` "
-            "WHERE category_code = @category_code AND seq = @seq LIMIT 1"
-        )
-        rows = self._run(
-            query,
+        row = self._fetch_first(
+            self._sql.find_ingredient_by_category_and_seq,
             [
                 bigquery.ScalarQueryParameter("category_code", "INT64", category_code),
                 bigquery.ScalarQueryParameter("seq", "INT64", seq),
             ],
-        ).result()
-        for row in rows:
-            return dict(row)
-        return None
+        )
+        return dict(row) if row is not None else None
 
     def set_counter_at_least(self, counter_name: str, scope: str, minimum_next_value: int) -> None:
         # Raise a counter floor without consuming a value so imported IDs are respected by later generated codes.
@@ -463,40 +1178,98 @@ class BigQueryService:
             ],
         ).result()
 
-    def list_ingredients(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        # Build optional WHERE predicates from supplied filters while keeping query parameters fully typed.
-        where = []
+    def list_ingredients(
+        self,
+        filters: Dict[str, Any],
+        use_search_index: bool = True,
+        projection: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        search = str(filters["q"]).strip() if "q" in filters else ""
+        # A leading * asks for partial matches, which the token index cannot answer, so those keep the substring scan.
+        if search.startswith("*"):
+            use_search_index = False
+            search = search[1:].strip()
+        # Look up the pre-built SQL for this filter combination instead of assembling it per request.
+        filter_keys = frozenset(filters).intersection(("q", *LIST_INGREDIENT_EQUALITY_FILTERS))
+        query = _list_ingredients_sql(self.dataset, filter_keys, use_search_index, tuple(projection or INGREDIENT_COLUMNS))
         # Collect query parameters centrally so all filters remain SQL-injection safe.
         params: List[bigquery.ScalarQueryParameter] = []
+        # Both SEARCH() and CONTAINS_SUBSTR fold case themselves, so the raw term is bound without LOWER()/% wrapping.
         if "q" in filters:
-            # Apply case-insensitive search by comparing lower-cased columns to a lower-cased search token.
-            where.append(
-                "(LOWER(sku) LIKE @q OR LOWER(trade_name_inci) LIKE @q OR LOWER(supplier) LIKE @q)"
-            )
-            # Normalise the search term to lower case so user input casing never affects matches.
-            params.append(bigquery.ScalarQueryParameter("q", "STRING", f"%{str(filters['q']).lower()}%"))
-        for field in ("category_code", "format", "pack_size_unit", "is_active"):
+            params.append(bigquery.ScalarQueryParameter("q", "STRING", search))
+        for field in LIST_INGREDIENT_EQUALITY_FILTERS:
             if field in filters:
-                where.append(f"{field} = @{field}")
-                params.append(bigquery.ScalarQueryParameter(field, "STRING" if isinstance(filters[field], str) else "INT64", filters[field]))
-        # Only emit a WHERE clause when at least one filter predicate has been requested.
-        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-        # Sort by the numeric sequence field so ingredient rows follow the true business order instead of SKU text order.
-        # Add stable secondary keys to avoid row jitter when two records share the same sequence value.
-        query = (
-            f"SELECT * FROM `{self.dataset}.ingredients` "
-            f"{where_clause} "
-            "ORDER BY seq ASC, category_code ASC, pack_size_value ASC"
-        )
+                params.append(_scalar_param(field, filters[field]))
         rows = self._run(query, params).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
+    @_cached_lookup("ingredient")
     def get_ingredient(self, sku: str) -> Optional[Dict[str, Any]]:
-        query = f"SELECT * FROM `{self.dataset}.ingredients` WHERE sku = @sku"
-        rows = self._run(query, [bigquery.ScalarQueryParameter("sku", "STRING", sku)]).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(self._sql.get_ingredient, [_SKU_PARAM(sku)])
+        return dict(row) if row is not None else None
+
+    def _cached_rows(self, namespace: str, keys: Iterable[Tuple[Any, ...]]) -> Tuple[Dict[Tuple[Any, ...], Dict[str, Any]], List[Tuple[Any, ...]]]:
+        # Split bulk keys into rows already held by the point-lookup cache and keys that still need a query.
+        cache = getattr(self, "_lookup_cache", None)
+        found: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        missing: List[Tuple[Any, ...]] = []
+        for key in keys:
+            if cache is not None:
+                with self._lookup_lock:
+                    row = cache.get((namespace, *key))
+                if row is not None:
+                    found[key] = copy.deepcopy(row)
+                    continue
+            missing.append(key)
+        return found, missing
+
+    def _remember_rows(self, namespace: str, rows: Dict[Tuple[Any, ...], Dict[str, Any]]) -> None:
+        # Warm the point-lookup cache so later single-row getters for the same keys skip BigQuery.
+        cache = getattr(self, "_lookup_cache", None)
+        if cache is None:
+            return
+        with self._lookup_lock:
+            for key, row in rows.items():
+                cache[(namespace, *key)] = copy.deepcopy(row)
+
+    def get_ingredients_bulk(self, skus: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        # Resolve many SKUs with one IN UNNEST query instead of one get_ingredient job per SKU.
+        unique_skus = sorted({str(sku).strip() for sku in skus if str(sku).strip()})
+        found, missing = self._cached_rows("ingredient", [(sku,) for sku in unique_skus])
+        if missing:
+            query = f"SELECT {', '.join(INGREDIENT_COLUMNS)} FROM `{self.dataset}.ingredients` WHERE sku IN UNNEST(@skus)"
+            rows = self._run_and_fetch(query, [bigquery.ArrayQueryParameter("skus", "STRING", [sku for sku, in missing])])
+            fetched = {(row["sku"],): row for row in _rows_to_dicts(rows)}
+            self._remember_rows("ingredient", fetched)
+            found.update(fetched)
+        return {key[0]: row for key, row in found.items()}
+
+    def get_batches_bulk(self, sku_batch_pairs: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        # Resolve many (sku, batch_code) keys with one query instead of one get_batch job per pair.
+        unique_pairs = sorted({(str(sku).strip(), str(batch_code).strip()) for sku, batch_code in sku_batch_pairs})
+        found, missing = self._cached_rows("batch", unique_pairs)
+        if missing:
+            # Filter on both key columns, then match exact pairs in memory to avoid array-of-struct parameters.
+            query = (
+                f"SELECT {', '.join(BATCH_COLUMNS)} FROM `{self.dataset}.ingredient_batches` "
+                "WHERE sku IN UNNEST(@skus) AND ingredient_batch_code IN UNNEST(@batch_codes)"
+            )
+            rows = self._run_and_fetch(
+                query,
+                [
+                    bigquery.ArrayQueryParameter("skus", "STRING", sorted({sku for sku, _ in missing})),
+                    bigquery.ArrayQueryParameter("batch_codes", "STRING", sorted({code for _, code in missing})),
+                ],
+            )
+            wanted = set(missing)
+            fetched = {
+                (row["sku"], row["ingredient_batch_code"]): row
+                for row in _rows_to_dicts(rows)
+                if (row["sku"], row["ingredient_batch_code"]) in wanted
+            }
+            self._remember_rows("batch", fetched)
+            found.update(fetched)
+        return found
 
     def list_existing_ingredient_skus(self, skus: Sequence[str]) -> set[str]:
         # Return only SKUs that currently exist so API validation avoids one-query-per-SKU fan-out.
@@ -524,49 +1297,69 @@ class BigQueryService:
                 bigquery.ScalarQueryParameter("sku", "STRING", sku),
             ],
         ).result()
-
-    def insert_batch(self, batch: Dict[str, Any]) -> None:
+        # Drop cached ingredient rows so the next read returns the new MSDS metadata.
+        self._invalidate_ingredient_lookups([sku])
+
+    def update_msds_bulk(self, updates: Sequence[Dict[str, Any]]) -> None:
+        # Apply many MSDS uploads with one UPDATE job so backfills stay inside the per-table DML quota.
+        # Later entries for the same SKU win, because UPDATE ... FROM may match at most one source row.
+        by_sku = {str(update["sku"]): update for update in updates}
+        if not by_sku:
+            return
+        skus = list(by_sku)
+        # Zip parallel scalar arrays by offset instead of binding ARRAY<STRUCT>; arrays cannot hold NULL, so "" stands in.
         query = (
-            f"INSERT `{self.dataset}.ingredient_batches` "
-            "(sku, ingredient_batch_code, received_at, notes, quantity_value, quantity_unit, created_at, updated_at, created_by, updated_by, "
-            "is_active, spec_object_path, spec_uploaded_at, archived, archived_at, archived_by) "
-            "VALUES (@sku, @ingredient_batch_code, @received_at, @notes, @quantity_value, @quantity_unit, @created_at, @updated_at, "
-            "@created_by, @updated_by, @is_active, @spec_object_path, @spec_uploaded_at, @archived, @archived_at, @archived_by)"
+            f"UPDATE `{self.dataset}.ingredients` i "
+            "SET msds_object_path = u.object_path, msds_filename = u.filename, msds_content_type = u.content_type, "
+            "msds_uploaded_at = CURRENT_TIMESTAMP(), updated_at = CURRENT_TIMESTAMP(), updated_by = NULLIF(u.updated_by, '') "
+            "FROM ("
+            "  SELECT sku, @object_paths[OFFSET(pos)] AS object_path, @filenames[OFFSET(pos)] AS filename, "
+            "  @content_types[OFFSET(pos)] AS content_type, @updated_bys[OFFSET(pos)] AS updated_by "
+            "  FROM UNNEST(@skus) AS sku WITH OFFSET pos"
+            ") u "
+            "WHERE i.sku = u.sku"
         )
-        params = [
-            bigquery.ScalarQueryParameter("sku", "STRING", batch["sku"]),
-            bigquery.ScalarQueryParameter("ingredient_batch_code", "STRING", batch["ingredient_batch_code"]),
-            bigquery.ScalarQueryParameter("received_at", "TIMESTAMP", batch.get("received_at")),
-            bigquery.ScalarQueryParameter("notes", "STRING", batch.get("notes")),
-            bigquery.ScalarQueryParameter("quantity_value", "FLOAT64", batch.get("quantity_value")),
-            bigquery.ScalarQueryParameter("quantity_unit", "STRING", batch.get("quantity_unit")),
-            bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", batch["created_at"]),
-            bigquery.ScalarQueryParameter("updated_at", "TIMESTAMP", batch["updated_at"]),
-            bigquery.ScalarQueryParameter("created_by", "STRING", batch.get("created_by")),
-            bigquery.ScalarQueryParameter("updated_by", "STRING", batch.get("updated_by")),
-            bigquery.ScalarQueryParameter("is_active", "BOOL", batch["is_active"]),
-            bigquery.ScalarQueryParameter("spec_object_path", "STRING", batch.get("spec_object_path")),
-            bigquery.ScalarQueryParameter("spec_uploaded_at", "TIMESTAMP", batch.get("spec_uploaded_at")),
-            bigquery.ScalarQueryParameter("archived", "BOOL", batch.get("archived", False)),
-            bigquery.ScalarQueryParameter("archived_at", "TIMESTAMP", batch.get("archived_at")),
-            bigquery.ScalarQueryParameter("archived_by", "STRING", batch.get("archived_by")),
-        ]
-        self._run(query, params).result()
+        self._run(
+            query,
+            [
+                bigquery.ArrayQueryParameter("skus", "STRING", skus),
+                bigquery.ArrayQueryParameter("object_paths", "STRING", [by_sku[sku]["object_path"] for sku in skus]),
+                bigquery.ArrayQueryParameter("filenames", "STRING", [by_sku[sku]["filename"] for sku in skus]),
+                bigquery.ArrayQueryParameter("content_types", "STRING", [by_sku[sku]["content_type"] for sku in skus]),
+                bigquery.ArrayQueryParameter("updated_bys", "STRING", [by_sku[sku].get("updated_by") or "" for sku in skus]),
+            ],
+        ).result()
+        self._invalidate_ingredient_lookups(skus)
 
-    def list_batches(self, sku: str, include_archived: bool = False) -> List[Dict[str, Any]]:
+    def insert_batch(self, batch: Dict[str, Any]) -> None:
+        # Unset archive flags default to FALSE rather than NULL so the listing filter treats new batches as active.
+        params = _row_params(BATCH_COLUMN_TYPES, {"archived": False, **batch})
+        if not self._append_param_row("ingredient_batches", params):
+            self._run(self._sql.insert_batch, params).result()
+        # Cached listing totals no longer match once a batch is added.
+        self._invalidate_lookups("batch_total")
+
+    def insert_batches_bulk(self, batches: Sequence[Dict[str, Any]]) -> None:
+        # Write many batch rows in one append or chunked multi-row INSERT; archive flags default to FALSE as in insert_batch.
+        if not batches:
+            return
+        self._insert_rows(
+            "ingredient_batches",
+            BATCH_COLUMN_TYPES,
+            [tuple({"archived": False, **batch}.get(name) for name in BATCH_COLUMNS) for batch in batches],
+        )
+        self._invalidate_lookups("batch_total")
+
+    def list_batches(self, sku: str, include_archived: bool = False, projection: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         # Keep the legacy SKU-specific listing helper for endpoints that need exact SKU scope.
-        query = (
-            f"SELECT * FROM `{self.dataset}.ingredient_batches` "
-            "WHERE sku = @sku AND (@include_archived OR COALESCE(archived, FALSE) = FALSE) ORDER BY ingredient_batch_code"
-        )
+        query = self._sql.list_batches
+        if projection:
+            query = query.replace(", ".join(BATCH_COLUMNS), ", ".join(projection), 1)
         rows = self._run(
             query,
-            [
-                bigquery.ScalarQueryParameter("sku", "STRING", sku),
-                bigquery.ScalarQueryParameter("include_archived", "BOOL", include_archived),
-            ],
+            [_SKU_PARAM(sku), bigquery.ScalarQueryParameter("include_archived", "BOOL", include_archived)],
         ).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
     def list_batches_paginated(
         self,
@@ -575,7 +1368,10 @@ class BigQueryService:
         include_archived: bool,
         page: int,
         page_size: int,
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        cursor: Optional[str] = None,
+        projection: Optional[Sequence[str]] = None,
+        want_total: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
         # Build dynamic filter clauses so the same query can support all/sku/batch lookup combinations.
         where: List[str] = []
         params: List[bigquery.ScalarQueryParameter] = []
@@ -589,45 +1385,27 @@ class BigQueryService:
             # Exclude archived rows from default selection/list APIs so new formulation workflows see only live batches.
             where.append("COALESCE(archived, FALSE) = FALSE")
 
-        # Assemble the WHERE clause only when one or more optional filters are provided.
-        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-        offset = max(page - 1, 0) * page_size
-
-        # Count first so the UI can render correct total pages for the current filter set.
-        count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.ingredient_batches` {where_clause}"
-        total_rows = list(self._run(count_query, params).result())
-        total = int(total_rows[0]["total"]) if total_rows else 0
-
-        # Return oldest-to-newest records and add deterministic tie-breakers for stable pagination.
-        data_query = (
-            f"SELECT * FROM `{self.dataset}.ingredient_batches` "
-            f"{where_clause} "
-            "ORDER BY created_at ASC, sku ASC, ingredient_batch_code ASC "
-            "LIMIT @limit OFFSET @offset"
-        )
-        data_params = [
-            *params,
-            bigquery.ScalarQueryParameter("limit", "INT64", page_size),
-            bigquery.ScalarQueryParameter("offset", "INT64", offset),
-        ]
-        rows = self._run(data_query, data_params).result()
-        return [dict(row) for row in rows], total
-
+        # Return oldest-to-newest records with deterministic tie-breakers so seek cursors resume exactly.
+        return self._paginate(
+            "ingredient_batches",
+            projection or BATCH_COLUMNS,
+            where,
+            params,
+            [("created_at", "TIMESTAMP"), ("sku", "STRING"), ("ingredient_batch_code", "STRING")],
+            page,
+            page_size,
+            cursor,
+            "batch_total",
+            want_total,
+        )
+
+    @_cached_lookup("batch")
     def get_batch(self, sku: str, batch_code: str) -> Optional[Dict[str, Any]]:
-        query = (
-            f"SELECT * FROM `{self.dataset}.ingredient_batches` "
-            "WHERE sku = @sku AND ingredient_batch_code = @batch_code LIMIT 1"
+        row = self._fetch_first(
+            self._sql.get_batch,
+            [_SKU_PARAM(sku), bigquery.ScalarQueryParameter("batch_code", "STRING", batch_code)],
         )
-        rows = self._run(
-            query,
-            [
-                bigquery.ScalarQueryParameter("sku", "STRING", sku),
-                bigquery.ScalarQueryParameter("batch_code", "STRING", batch_code),
-            ],
-        ).result()
-        for row in rows:
-            return dict(row)
-        return None
+        return dict(row) if row is not None else None
 
     def list_existing_batches(self, sku_batch_pairs: Sequence[Tuple[str, str]]) -> set[Tuple[str, str]]:
         # Normalize and validate caller-provided pairs defensively so malformed payloads return clear 4xx errors upstream.
@@ -689,6 +1467,9 @@ class BigQueryService:
                 bigquery.ScalarQueryParameter("batch_code", "STRING", batch_code),
             ],
         ).result()
+        self._invalidate_lookups("batch", sku, batch_code)
+        # Archiving moves the batch in or out of the default listing filter, so drop cached totals too.
+        self._invalidate_lookups("batch_total")
 
     def update_spec(self, sku: str, batch_code: str, object_path: str) -> None:
         query = (
@@ -704,13 +1485,38 @@ class BigQueryService:
                 bigquery.ScalarQueryParameter("batch_code", "STRING", batch_code),
             ],
         ).result()
+        self._invalidate_lookups("batch", sku, batch_code)
+
+    def update_spec_bulk(self, updates: Sequence[Dict[str, Any]]) -> None:
+        # Attach many batch spec uploads with one UPDATE job; later entries for the same batch win.
+        by_key = {(str(update["sku"]), str(update["batch_code"])): update for update in updates}
+        if not by_key:
+            return
+        keys = list(by_key)
+        query = (
+            f"UPDATE `{self.dataset}.ingredient_batches` b "
+            "SET spec_object_path = u.object_path, spec_uploaded_at = CURRENT_TIMESTAMP(), updated_at = CURRENT_TIMESTAMP() "
+            "FROM ("
+            "  SELECT sku, @batch_codes[OFFSET(pos)] AS batch_code, @object_paths[OFFSET(pos)] AS object_path "
+            "  FROM UNNEST(@skus) AS sku WITH OFFSET pos"
+            ") u "
+            "WHERE b.sku = u.sku AND b.ingredient_batch_code = u.batch_code"
+        )
+        self._run(
+            query,
+            [
+                bigquery.ArrayQueryParameter("skus", "STRING", [sku for sku, _ in keys]),
+                bigquery.ArrayQueryParameter("batch_codes", "STRING", [batch_code for _, batch_code in keys]),
+                bigquery.ArrayQueryParameter("object_paths", "STRING", [by_key[key]["object_path"] for key in keys]),
+            ],
+        ).result()
+        for sku, batch_code in keys:
+            self._invalidate_lookups("batch", sku, batch_code)
 
+    @_cached_lookup("set_hash")
     def get_set_by_hash(self, set_hash: str) -> Optional[str]:
-        query = f"SELECT set_code FROM `{self.dataset}.ingredient_sets` WHERE set_hash = @set_hash"
-        rows = self._run(query, [bigquery.ScalarQueryParameter("set_hash", "STRING", set_hash)]).result()
-        for row in rows:
-            return row["set_code"]
-        return None
+        row = self._fetch_first(self._sql.get_set_by_hash, [bigquery.ScalarQueryParameter("set_hash", "STRING", set_hash)])
+        return row["set_code"] if row is not None else None
 
     def insert_set(
         self,
@@ -727,31 +1533,22 @@ class BigQueryService:
             f"INSERT `{self.dataset}.ingredient_sets` (set_code, set_hash, created_at, created_by, notes, material_workstream) "
             "VALUES (@set_code, @set_hash, @created_at, @created_by, @notes, @material_workstream)"
         )
-        self._run(
-            insert_set_query,
-            [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("set_hash", "STRING", set_hash),
-                bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
-                bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                bigquery.ScalarQueryParameter("notes", "STRING", notes),
-                bigquery.ScalarQueryParameter("material_workstream", "STRING", material_workstream),
-            ],
-        ).result()
-        insert_items_query = (
-            f"INSERT `{self.dataset}.ingredient_set_items` (set_code, sku, created_at, created_by) "
-            "VALUES (@set_code, @sku, @created_at, @created_by)"
+        set_params = [
+            bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
+            bigquery.ScalarQueryParameter("set_hash", "STRING", set_hash),
+            bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
+            bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+            bigquery.ScalarQueryParameter("notes", "STRING", notes),
+            bigquery.ScalarQueryParameter("material_workstream", "STRING", material_workstream),
+        ]
+        pending = [] if self._append_param_row("ingredient_sets", set_params) else [(insert_set_query, set_params)]
+        self._insert_rows(
+            "ingredient_set_items",
+            [("set_code", "STRING"), ("sku", "STRING"), ("created_at", "TIMESTAMP"), ("created_by", "STRING")],
+            [(set_code, sku, now, created_by) for sku in skus],
+            pending,
         )
-        for sku in skus:
-            self._run(
-                insert_items_query,
-                [
-                    bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                    bigquery.ScalarQueryParameter("sku", "STRING", sku),
-                    bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
-                    bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                ],
-            ).result()
+        self._invalidate_lookups("set_total")
 
     def update_set(
         self,
@@ -775,8 +1572,17 @@ class BigQueryService:
                 bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
             ],
         ).result()
+        self._invalidate_lookups("set", set_code)
 
-    def list_sets_paginated(self, search: Optional[str], page: int, page_size: int) -> Tuple[List[Dict[str, Any]], int]:
+    def list_sets_paginated(
+        self,
+        search: Optional[str],
+        page: int,
+        page_size: int,
+        cursor: Optional[str] = None,
+        projection: Optional[Sequence[str]] = None,
+        want_total: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[str]]:
         # Support set lookup by set code or contained SKU while keeping a single source of query truth.
         where: List[str] = []
         params: List[bigquery.ScalarQueryParameter] = []
@@ -787,42 +1593,30 @@ class BigQueryService:
             )
             params.append(bigquery.ScalarQueryParameter("search", "STRING", search))
 
-        # Apply optional filtering and compute the offset for 1-indexed page navigation.
-        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-        offset = max(page - 1, 0) * page_size
-
-        # Count rows for pagination controls so the frontend can show page totals accurately.
-        count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.v_sets` {where_clause}"
-        total_rows = list(self._run(count_query, params).result())
-        total = int(total_rows[0]["total"]) if total_rows else 0
-
-        # Default ordering is oldest-to-newest, with set_code as a deterministic tie-breaker.
-        data_query = (
-            f"SELECT * FROM `{self.dataset}.v_sets` "
-            f"{where_clause} "
-            "ORDER BY created_at ASC, set_code ASC "
-            "LIMIT @limit OFFSET @offset"
-        )
-        data_params = [
-            *params,
-            bigquery.ScalarQueryParameter("limit", "INT64", page_size),
-            bigquery.ScalarQueryParameter("offset", "INT64", offset),
-        ]
-        rows = self._run(data_query, data_params).result()
-        return [dict(row) for row in rows], total
-
-    def list_sets(self) -> List[Dict[str, Any]]:
+        # Default ordering is oldest-to-newest, with set_code as a deterministic tie-breaker for offset and seek pages.
+        return self._paginate(
+            "v_sets",
+            projection or SET_COLUMNS,
+            where,
+            params,
+            [("created_at", "TIMESTAMP"), ("set_code", "STRING")],
+            page,
+            page_size,
+            cursor,
+            "set_total",
+            want_total,
+        )
+
+    def list_sets(self, projection: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         # Preserve existing method behavior for any legacy callers that still require a full set list.
-        query = f"SELECT * FROM `{self.dataset}.v_sets` ORDER BY set_code"
+        query = f"SELECT {', '.join(projection or SET_COLUMNS)} FROM `{self.dataset}.v_sets` ORDER BY set_code"
         rows = self._run(query, []).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
+    @_cached_lookup("set")
     def get_set(self, set_code: str) -> Optional[Dict[str, Any]]:
-        query = f"SELECT * FROM `{self.dataset}.v_sets` WHERE set_code = @set_code LIMIT 1"
-        rows = self._run(query, [bigquery.ScalarQueryParameter("set_code", "STRING", set_code)]).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(self._sql.get_set, [_SET_CODE_PARAM(set_code)])
+        return dict(row) if row is not None else None
 
     def get_set_dependency_counts(self, set_code: str) -> Dict[str, int]:
         # Collect downstream reference counts so delete flows can block when formulation data already exists.
@@ -836,7 +1630,7 @@ class BigQueryService:
             "SELECT 'location_codes' AS source, COUNT(1) AS total "
             f"FROM `{self.dataset}.location_codes` WHERE set_code = @set_code"
         )
-        rows = self._run(query, [bigquery.ScalarQueryParameter("set_code", "STRING", set_code)]).result()
+        rows = self._run_and_fetch(query, [bigquery.ScalarQueryParameter("set_code", "STRING", set_code)])
         return {str(row["source"]): int(row["total"] or 0) for row in rows}
 
     def delete_set(self, set_code: str) -> None:
@@ -846,22 +1640,18 @@ class BigQueryService:
         params = [bigquery.ScalarQueryParameter("set_code", "STRING", set_code)]
         self._run(delete_items_query, params).result()
         self._run(delete_set_query, params).result()
+        # The deleted set's hash is not known here, so clear every cached hash mapping.
+        self._invalidate_lookups("set", set_code)
+        self._invalidate_lookups("set_hash")
+        self._invalidate_lookups("set_total")
 
+    @_cached_lookup("weight_hash")
     def get_weight_by_hash(self, set_code: str, weight_hash: str) -> Optional[str]:
-        query = (
-            f"SELECT weight_code FROM `{self.dataset}.dry_weight_variants` "
-            "WHERE set_code = @set_code AND weight_hash = @weight_hash"
+        row = self._fetch_first(
+            self._sql.get_weight_by_hash,
+            [_SET_CODE_PARAM(set_code), bigquery.ScalarQueryParameter("weight_hash", "STRING", weight_hash)],
         )
-        rows = self._run(
-            query,
-            [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("weight_hash", "STRING", weight_hash),
-            ],
-        ).result()
-        for row in rows:
-            return row["weight_code"]
-        return None
+        return row["weight_code"] if row is not None else None
 
     def insert_weight_variant(
         self,
@@ -878,78 +1668,56 @@ class BigQueryService:
             "(set_code, weight_code, weight_hash, created_at, created_by, notes) "
             "VALUES (@set_code, @weight_code, @weight_hash, @created_at, @created_by, @notes)"
         )
-        self._run(
-            insert_variant_query,
+        variant_params = [
+            bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
+            bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
+            bigquery.ScalarQueryParameter("weight_hash", "STRING", weight_hash),
+            bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
+            bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+            bigquery.ScalarQueryParameter("notes", "STRING", notes),
+        ]
+        pending = [] if self._append_param_row("dry_weight_variants", variant_params) else [(insert_variant_query, variant_params)]
+        self._insert_rows(
+            "dry_weight_items",
             [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                bigquery.ScalarQueryParameter("weight_hash", "STRING", weight_hash),
-                bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
-                bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                bigquery.ScalarQueryParameter("notes", "STRING", notes),
+                ("set_code", "STRING"),
+                ("weight_code", "STRING"),
+                ("sku", "STRING"),
+                ("wt_percent", "NUMERIC"),
+                ("created_at", "TIMESTAMP"),
+                ("created_by", "STRING"),
             ],
-        ).result()
-        insert_items_query = (
-            f"INSERT `{self.dataset}.dry_weight_items` "
-            "(set_code, weight_code, sku, wt_percent, created_at, created_by) "
-            "VALUES (@set_code, @weight_code, @sku, @wt_percent, @created_at, @created_by)"
+            [(set_code, weight_code, sku, wt, now, created_by) for sku, wt in items],
+            pending,
         )
-        for sku, wt in items:
-            self._run(
-                insert_items_query,
-                [
-                    bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                    bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                    bigquery.ScalarQueryParameter("sku", "STRING", sku),
-                    bigquery.ScalarQueryParameter("wt_percent", "NUMERIC", wt),
-                    bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
-                    bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                ],
-            ).result()
 
-    def list_weights(self, set_code: str) -> List[Dict[str, Any]]:
+    def list_weights(self, set_code: str, projection: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         query = (
-            f"SELECT * FROM `{self.dataset}.v_weight_variants` "
+            f"SELECT {', '.join(projection or WEIGHT_VARIANT_COLUMNS)} FROM `{self.dataset}.v_weight_variants` "
             "WHERE set_code = @set_code ORDER BY weight_code"
         )
         rows = self._run(
             query,
             [bigquery.ScalarQueryParameter("set_code", "STRING", set_code)],
         ).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
+    @_cached_lookup("weight")
     def get_weight(self, set_code: str, weight_code: str) -> Optional[Dict[str, Any]]:
-        query = (
-            f"SELECT * FROM `{self.dataset}.v_weight_variants` "
-            "WHERE set_code = @set_code AND weight_code = @weight_code LIMIT 1"
-        )
-        rows = self._run(
-            query,
-            [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-            ],
-        ).result()
-        for row in rows:
-            return dict(row)
-        return None
+        row = self._fetch_first(self._sql.get_weight, [_SET_CODE_PARAM(set_code), _WEIGHT_CODE_PARAM(weight_code)])
+        return dict(row) if row is not None else None
 
+    @_cached_lookup("batch_variant_hash")
     def get_batch_variant_by_hash(self, set_code: str, weight_code: str, batch_hash: str) -> Optional[str]:
-        query = (
-            f"SELECT batch_variant_code FROM `{self.dataset}.batch_variants` "
-            "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_hash = @batch_hash"
-        )
-        rows = self._run(
-            query,
+        row = self._fetch_first(
+            self._sql.get_batch_variant_by_hash,
             [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
+                _SET_CODE_PARAM(set_code),
+                _WEIGHT_CODE_PARAM(weight_code),
                 bigquery.ScalarQueryParameter("batch_hash", "STRING", batch_hash),
             ],
-        ).result()
-        for row in rows:
-            return row["batch_variant_code"]
-        return None
+        )
+        return row["batch_variant_code"] if row is not None else None
 
     def insert_batch_variant(
         self,
@@ -967,40 +1735,40 @@ class BigQueryService:
             "(set_code, weight_code, batch_variant_code, batch_hash, created_at, created_by, notes) "
             "VALUES (@set_code, @weight_code, @batch_variant_code, @batch_hash, @created_at, @created_by, @notes)"
         )
-        self._run(
-            insert_variant_query,
+        variant_params = [
+            bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
+            bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
+            bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
+            bigquery.ScalarQueryParameter("batch_hash", "STRING", batch_hash),
+            bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
+            bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+            bigquery.ScalarQueryParameter("notes", "STRING", notes),
+        ]
+        pending = [] if self._append_param_row("batch_variants", variant_params) else [(insert_variant_query, variant_params)]
+        self._insert_rows(
+            "batch_variant_items",
             [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
-                bigquery.ScalarQueryParameter("batch_hash", "STRING", batch_hash),
-                bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
-                bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                bigquery.ScalarQueryParameter("notes", "STRING", notes),
+                ("set_code", "STRING"),
+                ("weight_code", "STRING"),
+                ("batch_variant_code", "STRING"),
+                ("sku", "STRING"),
+                ("ingredient_batch_code", "STRING"),
+                ("created_at", "TIMESTAMP"),
+                ("created_by", "STRING"),
             ],
-        ).result()
-        insert_items_query = (
-            f"INSERT `{self.dataset}.batch_variant_items` "
-            "(set_code, weight_code, batch_variant_code, sku, ingredient_batch_code, created_at, created_by) "
-            "VALUES (@set_code, @weight_code, @batch_variant_code, @sku, @ingredient_batch_code, @created_at, @created_by)"
+            [(set_code, weight_code, batch_variant_code, sku, batch_code, now, created_by) for sku, batch_code in items],
+            pending,
         )
-        for sku, batch_code in items:
-            self._run(
-                insert_items_query,
-                [
-                    bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                    bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                    bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
-                    bigquery.ScalarQueryParameter("sku", "STRING", sku),
-                    bigquery.ScalarQueryParameter("ingredient_batch_code", "STRING", batch_code),
-                    bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
-                    bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                ],
-            ).result()
+        # Merge the flattened formulation into the roll-up table so listings read it without re-aggregating the view.
+        self._run(self._sql.merge_formulation, variant_params[:3]).result()
+        # Each batch variant is a new formulation row, so cached formulation listing totals are stale.
+        self._invalidate_lookups("formulation_total")
+        # The location-code form's formulation dropdown gains this code combination.
+        self._invalidate_lookups("formulation_codes")
 
-    def list_batch_variants(self, set_code: str, weight_code: str) -> List[Dict[str, Any]]:
+    def list_batch_variants(self, set_code: str, weight_code: str, projection: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
         query = (
-            f"SELECT * FROM `{self.dataset}.v_batch_variants` "
+            f"SELECT {', '.join(projection or BATCH_VARIANT_COLUMNS)} FROM `{self.dataset}.v_batch_variants` "
             "WHERE set_code = @set_code AND weight_code = @weight_code ORDER BY batch_variant_code"
         )
         rows = self._run(
@@ -1010,51 +1778,69 @@ class BigQueryService:
                 bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
             ],
         ).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
     def list_formulations_paginated(
         self,
         filters: Dict[str, Any],
         page: int,
         page_size: int,
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        where, params = self._formulation_filters(filters)
+        # Keep newest-to-oldest sort and include extra tie-breakers so offset and seek paging are deterministic.
+        return self._paginate(
+            "formulations_flat",
+            (*FORMULATION_LIST_COLUMNS, "dry_weight_items"),
+            where,
+            params,
+            [
+                ("created_at", "TIMESTAMP"),
+                ("set_code", "STRING"),
+                ("weight_code", "STRING"),
+                ("batch_variant_code", "STRING"),
+            ],
+            page,
+            page_size,
+            cursor,
+            "formulation_total",
+            descending=True,
+        )
+
+    def _formulation_filters(self, filters: Dict[str, Any]) -> Tuple[List[str], List[bigquery.ScalarQueryParameter]]:
         where = []
         params: List[bigquery.ScalarQueryParameter] = []
         # Apply exact-match filters that map directly to formulation columns.
         for field in ("set_code", "weight_code", "batch_variant_code"):
             if field in filters:
-                where.append(f"f.{field} = @{field}")
+                where.append(f"{field} = @{field}")
                 params.append(bigquery.ScalarQueryParameter(field, "STRING", filters[field]))
-        # Apply a SKU containment filter by searching the JSON-encoded SKU list payload.
+        # Match whole SKU elements through the NO_OP search index on sku_list instead of substring-scanning serialized JSON.
         if "sku" in filters:
-            where.append("CONTAINS_SUBSTR(TO_JSON_STRING(f.sku_list), @sku)")
-            params.append(bigquery.ScalarQueryParameter("sku", "STRING", filters["sku"]))
-        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
-        # Build a count query for accurate page controls under all active filter combinations.
-        count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.v_formulations_flat` f {where_clause}"
-        total_rows = list(self._run(count_query, params).result())
-        total = int(total_rows[0]["total"]) if total_rows else 0
+            where.append("SEARCH(sku_list, @sku, analyzer => 'NO_OP_ANALYZER')")
+            params.append(bigquery.ScalarQueryParameter("sku", "STRING", str(filters["sku"]).strip()))
+        return where, params
 
-        # Keep newest-to-oldest sort and include extra tie-breakers so paging is deterministic.
+    def iter_formulations(self, filters: Dict[str, Any], limit: Optional[int] = 1000) -> Iterator[Dict[str, Any]]:
+        # Stream newest-first formulations batch by batch instead of building the whole result list up front.
+        where, params = self._formulation_filters(filters)
+        where_clause = f"WHERE {' AND '.join(where)}" if where else ""
+        # A limit of None streams every matching row rather than silently truncating.
+        limit_clause = "LIMIT @limit" if limit is not None else ""
+        if limit is not None:
+            params = [*params, bigquery.ScalarQueryParameter("limit", "INT64", limit)]
         query = (
-            f"SELECT f.* FROM `{self.dataset}.v_formulations_flat` f "
+            f"SELECT {', '.join(FORMULATION_COLUMNS)} FROM `{self.dataset}.formulations_flat` "
             f"{where_clause} "
-            "ORDER BY f.created_at DESC, f.set_code DESC, f.weight_code DESC, f.batch_variant_code DESC "
-            "LIMIT @limit OFFSET @offset"
+            "ORDER BY created_at DESC, set_code DESC, weight_code DESC, batch_variant_code DESC "
+            f"{limit_clause}"
         )
-        offset = max(page - 1, 0) * page_size
-        data_params = [
-            *params,
-            bigquery.ScalarQueryParameter("limit", "INT64", page_size),
-            bigquery.ScalarQueryParameter("offset", "INT64", offset),
-        ]
-        rows = self._run(query, data_params).result()
-        return [dict(row) for row in rows], total
+        rows = self._run(query, params).result()
+        yield from _iter_row_dicts(rows)
 
     def list_formulations(self, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
-        # Preserve pre-pagination method for backward compatibility.
-        rows, _ = self.list_formulations_paginated(filters=filters, page=1, page_size=1000)
-        return rows
+        # Preserve pre-pagination method for backward compatibility; callers asking for the full list get every row.
+        return list(self.iter_formulations(filters, limit=None))
 
     def strip_dry_weight_data(self, formulations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         # Remove dry-weight payloads entirely so restricted users never receive percentages from the backend.
@@ -1065,56 +1851,59 @@ class BigQueryService:
             sanitized_rows.append(sanitized_row)
         return sanitized_rows
 
-    def list_formulations_by_batch(self, sku: str, batch_code: str) -> List[Dict[str, Any]]:
-        # Find every formulation where the nested batch items include the requested SKU + batch code pair.
+    def list_formulations_by_batch(self, sku: str, batch_code: str, include_dry_weights: bool = True) -> List[Dict[str, Any]]:
+        # Keep the single-batch lookup as a one-pair call into the bulk resolver.
+        return self.list_formulations_by_batches([(sku, batch_code)], include_dry_weights)
+
+    def list_formulations_by_batches(
+        self,
+        sku_batch_pairs: Sequence[Tuple[str, str]],
+        include_dry_weights: bool = True,
+    ) -> List[Dict[str, Any]]:
+        # Resolve formulations using any of many (sku, batch_code) pairs in one job instead of one query per pair.
+        unique_pairs = sorted({(str(sku).strip(), str(batch_code).strip()) for sku, batch_code in sku_batch_pairs})
+        if not unique_pairs:
+            return []
+        # Zip parallel scalar arrays by offset to match exact pairs; the alias avoids colliding with batch_variant_items.sku.
         query = (
-            f"SELECT f.* FROM `{self.dataset}.v_formulations_flat` f "
-            "WHERE EXISTS ("
-            "  SELECT 1 FROM UNNEST(f.batch_items) AS batch_item "
-            "  WHERE batch_item.sku = @sku AND batch_item.ingredient_batch_code = @batch_code"
-            ") "
+            f"SELECT {_formulation_select_list('f', include_dry_weights)} FROM `{self.dataset}.formulations_flat` f "
+            "JOIN ("
+            "  SELECT DISTINCT i.set_code, i.weight_code, i.batch_variant_code "
+            "  FROM UNNEST(@skus) AS pair_sku WITH OFFSET pos "
+            f"  JOIN `{self.dataset}.batch_variant_items` i "
+            "  ON i.sku = pair_sku AND i.ingredient_batch_code = @batch_codes[OFFSET(pos)]"
+            ") m USING (set_code, weight_code, batch_variant_code) "
             "ORDER BY f.created_at DESC"
         )
         rows = self._run(
             query,
             [
-                bigquery.ScalarQueryParameter("sku", "STRING", sku),
-                bigquery.ScalarQueryParameter("batch_code", "STRING", batch_code),
+                bigquery.ArrayQueryParameter("skus", "STRING", [sku for sku, _ in unique_pairs]),
+                bigquery.ArrayQueryParameter("batch_codes", "STRING", [code for _, code in unique_pairs]),
             ],
         ).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
+    @_cached_lookup("location_partners")
     def list_location_partners(self) -> List[Dict[str, Any]]:
         # Return all persisted custom partner-code mappings in code order for predictable dropdown rendering.
-        query = (
-            f"SELECT partner_code, partner_name, machine_specification, created_at, created_by "
-            f"FROM `{self.dataset}.location_partners` ORDER BY partner_code"
-        )
-        rows = self._run(query, []).result()
-        return [dict(row) for row in rows]
+        # Small dropdown reads take the inline-rows fast path and are served from the query result cache when unchanged.
+        rows = self._run_and_fetch(self._sql.list_location_partners, [])
+        return _rows_to_dicts(rows)
 
+    @_cached_lookup("partner_machine_options")
     def get_mixing_partner_machine_options(self) -> List[Dict[str, Any]]:
         # Reuse existing location-partner records as machine+partner options for conversion workflows.
-        query = (
-            f"SELECT partner_code, partner_name, machine_specification AS machine_code "
-            f"FROM `{self.dataset}.location_partners` ORDER BY partner_code"
-        )
-        rows = self._run(query, []).result()
-        return [dict(row) for row in rows]
+        rows = self._run_and_fetch(self._sql.list_partner_machine_options, [])
+        return _rows_to_dicts(rows)
 
     def get_location_partner(self, partner_code: str) -> Optional[Dict[str, Any]]:
         # Fetch a single custom location partner row by its two-letter partner code.
-        query = (
-            f"SELECT partner_code, partner_name, machine_specification, created_at, created_by "
-            f"FROM `{self.dataset}.location_partners` WHERE partner_code = @partner_code LIMIT 1"
-        )
-        rows = self._run(
-            query,
+        row = self._fetch_first(
+            self._sql.get_location_partner,
             [bigquery.ScalarQueryParameter("partner_code", "STRING", partner_code)],
-        ).result()
-        for row in rows:
-            return dict(row)
-        return None
+        )
+        return dict(row) if row is not None else None
 
     def insert_location_partner(
         self,
@@ -1122,52 +1911,44 @@ class BigQueryService:
         partner_name: str,
         machine_specification: str,
         created_by: Optional[str],
-    ) -> None:
-        # Persist a newly created custom partner and machine specification to support future selection.
-        query = (
-            f"INSERT `{self.dataset}.location_partners` "
-            "(partner_code, partner_name, machine_specification, created_at, created_by) "
-            "VALUES (@partner_code, @partner_name, @machine_specification, @created_at, @created_by)"
-        )
-        self._run(
-            query,
-            [
-                bigquery.ScalarQueryParameter("partner_code", "STRING", partner_code),
-                bigquery.ScalarQueryParameter("partner_name", "STRING", partner_name),
-                bigquery.ScalarQueryParameter("machine_specification", "STRING", machine_specification),
-                bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", datetime.now(timezone.utc)),
-                bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-            ],
-        ).result()
+    ) -> bool:
+        # Persist a newly created custom partner unless the code is already taken, reporting whether the row was added.
+        params = [
+            bigquery.ScalarQueryParameter("partner_code", "STRING", partner_code),
+            bigquery.ScalarQueryParameter("partner_name", "STRING", partner_name),
+            bigquery.ScalarQueryParameter("machine_specification", "STRING", machine_specification),
+            bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+        ]
+        # Check and insert in one MERGE so concurrent creators cannot both claim the same code.
+        job = self._run(self._sql.insert_location_partner, params)
+        job.result()
+        # Drop cached partner dropdowns so the new partner is selectable immediately.
+        self._invalidate_lookups("location_partners")
+        self._invalidate_lookups("partner_machine_options")
+        return job.num_dml_affected_rows == 1
 
     def formulation_exists(self, set_code: str, weight_code: str, batch_variant_code: str) -> bool:
         # Verify requested location-code formulation components reference an existing formulation record.
-        query = (
-            f"SELECT 1 FROM `{self.dataset}.v_formulations_flat` "
-            "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_variant_code = @batch_variant_code "
-            "LIMIT 1"
-        )
-        rows = list(
-            self._run(
-                query,
-                [
-                    bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                    bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                    bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
-                ],
-            ).result()
-        )
-        return bool(rows)
+        params = [
+            _SET_CODE_PARAM(set_code),
+            _WEIGHT_CODE_PARAM(weight_code),
+            bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
+        ]
+        if self._fetch_first(self._sql.formulation_exists, params) is not None:
+            return True
+        # Fall back to the view so a formulation whose roll-up merge failed is still found before the next backfill.
+        return self._fetch_first(self._sql.formulation_exists_unrolled, params) is not None
 
+    @_cached_lookup("formulation_codes")
     def list_distinct_formulation_codes(self) -> List[Dict[str, str]]:
         # Provide unique formulation code parts for dropdown/manual assist in the location-code create form.
         primary_query = (
-            f"SELECT DISTINCT set_code, weight_code, batch_variant_code FROM `{self.dataset}.v_formulations_flat` "
+            f"SELECT DISTINCT set_code, weight_code, batch_variant_code FROM `{self.dataset}.formulations_flat` "
             "ORDER BY set_code, weight_code, batch_variant_code"
         )
         try:
             rows = self._run(primary_query, []).result()
-            return [dict(row) for row in rows]
+            return _rows_to_dicts(rows)
         except NotFound:
             # Fall back to the base batch-variant table when the flat view is temporarily missing in a region.
             fallback_query = (
@@ -1175,47 +1956,45 @@ class BigQueryService:
                 "ORDER BY set_code, weight_code, batch_variant_code"
             )
             rows = self._run(fallback_query, []).result()
-            return [dict(row) for row in rows]
+            return _rows_to_dicts(rows)
 
     def list_location_codes_paginated(
         self,
         page: int,
         page_size: int,
         q: Optional[str] = None,
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
         # Return paginated location code rows ordered newest-first for predictable table navigation.
-        where_clause = ""
+        where: List[str] = []
         params: List[bigquery.ScalarQueryParameter] = []
-        if q:
-            # Apply substring filtering over the full location code text, matching the UI search behavior.
-            where_clause = "WHERE CONTAINS_SUBSTR(location_id, @query)"
+        if q and q.startswith("*"):
+            # A leading * asks for partial matches, which only a substring scan over every location ID can answer.
+            where.append("CONTAINS_SUBSTR(location_id, @query)")
+            params.append(bigquery.ScalarQueryParameter("query", "STRING", q[1:].strip()))
+        elif q:
+            # Match whole code tokens through location_codes_search_idx instead of scanning every ID.
+            where.append("SEARCH(location_id, @query)")
             params.append(bigquery.ScalarQueryParameter("query", "STRING", q))
 
-        count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.location_codes` {where_clause}"
-        total_rows = list(self._run(count_query, params).result())
-        total = int(total_rows[0]["total"]) if total_rows else 0
-
         # Include deterministic tie-breakers to keep pagination stable for equal timestamps.
-        query = (
-            f"SELECT location_id, set_code, weight_code, batch_variant_code, partner_code, production_date, created_at, created_by "
-            f"FROM `{self.dataset}.location_codes` "
-            f"{where_clause} "
-            "ORDER BY created_at DESC, location_id DESC "
-            "LIMIT @limit OFFSET @offset"
-        )
-        offset = max(page - 1, 0) * page_size
-        data_params = [
-            *params,
-            bigquery.ScalarQueryParameter("limit", "INT64", page_size),
-            bigquery.ScalarQueryParameter("offset", "INT64", offset),
-        ]
-        rows = self._run(query, data_params).result()
-        return [dict(row) for row in rows], total
-
+        return self._paginate(
+            "location_codes",
+            LOCATION_CODE_COLUMNS,
+            where,
+            params,
+            [("created_at", "TIMESTAMP"), ("location_id", "STRING")],
+            page,
+            page_size,
+            cursor,
+            "location_code_total",
+            descending=True,
+        )
+
+    @_cached_lookup("location_code_ids")
     def list_location_code_ids(self) -> List[str]:
         # Return active location IDs for dropdown options used when generating processing codes.
-        query = f"SELECT DISTINCT location_id FROM `{self.dataset}.location_codes` ORDER BY location_id"
-        rows = self._run(query, []).result()
+        rows = self._run_and_fetch(self._sql.list_location_code_ids, [])
         return [row["location_id"] for row in rows]
 
     def create_or_get_conversion1_context(
@@ -1232,13 +2011,18 @@ class BigQueryService:
         existing = self.get_conversion1_context(context_code)
         if existing:
             return existing
-        # Insert a new conversion context row for first-time deterministic code creation.
+        # Insert-if-absent and read the row back in one script job, so a concurrent save cannot add a duplicate code.
         query = (
-            f"INSERT `{self.dataset}.conversion1_context` "
-            "(context_code, pellet_bag_code, partner_code, machine_code, date_yymmdd, created_at, created_by, updated_at, updated_by, is_active) "
-            "VALUES (@context_code, @pellet_bag_code, @partner_code, @machine_code, @date_yymmdd, CURRENT_TIMESTAMP(), @created_by, CURRENT_TIMESTAMP(), @updated_by, TRUE)"
+            f"MERGE `{self.dataset}.conversion1_context` T "
+            "USING (SELECT @context_code AS context_code) S "
+            "ON T.context_code = S.context_code AND T.is_active = TRUE "
+            "WHEN NOT MATCHED THEN "
+            "  INSERT (context_code, pellet_bag_code, partner_code, machine_code, date_yymmdd, created_at, created_by, updated_at, updated_by, is_active) "
+            "  VALUES (@context_code, @pellet_bag_code, @partner_code, @machine_code, @date_yymmdd, CURRENT_TIMESTAMP(), @created_by, CURRENT_TIMESTAMP(), @updated_by, TRUE); "
+            "SELECT context_code, pellet_bag_code, partner_code, machine_code, date_yymmdd, created_at, created_by, updated_at, updated_by "
+            f"FROM `{self.dataset}.conversion1_context` WHERE context_code = @context_code AND is_active = TRUE LIMIT 1"
         )
-        self._run(
+        row = self._fetch_first(
             query,
             [
                 bigquery.ScalarQueryParameter("context_code", "STRING", context_code),
@@ -1249,17 +2033,13 @@ class BigQueryService:
                 bigquery.ScalarQueryParameter("created_by", "STRING", user_email),
                 bigquery.ScalarQueryParameter("updated_by", "STRING", user_email),
             ],
-        ).result()
-        return self.get_conversion1_context(context_code) or {"context_code": context_code}
+        )
+        return dict(row) if row is not None else {"context_code": context_code}
 
     def get_conversion1_context(self, context_code: str) -> Optional[Dict[str, Any]]:
         # Retrieve one active Conversion 1 Context row for deterministic code generation reuse.
-        query = (
-            f"SELECT context_code, pellet_bag_code, partner_code, machine_code, date_yymmdd, created_at, created_by, updated_at, updated_by "
-            f"FROM `{self.dataset}.conversion1_context` WHERE context_code = @context_code AND is_active = TRUE LIMIT 1"
-        )
-        rows = list(self._run(query, [bigquery.ScalarQueryParameter("context_code", "STRING", context_code)]).result())
-        return dict(rows[0]) if rows else None
+        row = self._fetch_first(self._sql.get_conversion1_context, [_CONTEXT_CODE_PARAM(context_code)])
+        return dict(row) if row is not None else None
 
     def list_conversion1_codes_paginated(
         self,
@@ -1275,18 +2055,17 @@ class BigQueryService:
             where.append("CONTAINS_SUBSTR(c.context_code, @search)")
             params.append(bigquery.ScalarQueryParameter("search", "STRING", search))
         where_clause = "WHERE " + " AND ".join(where)
-        # Count rows separately so pagination controls can report accurate total pages.
+        # Keep a standalone count only for empty pages past the end, which carry no window total.
         count_query = (
             "SELECT COUNT(1) AS total "
             f"FROM `{self.dataset}.conversion1_context` c "
             f"{where_clause}"
         )
-        total_rows = list(self._run(count_query, params).result())
-        total = int(total_rows[0]["total"]) if total_rows else 0
         # Join partner names to render one combined partner-machine display string for each context code row.
         query = (
             "SELECT c.context_code AS conversion_code, c.created_by AS owner, c.created_at, "
-            "CONCAT(COALESCE(lp.partner_name, c.partner_code, ''), ' - ', COALESCE(c.machine_code, '')) AS conversion_partner "
+            "CONCAT(COALESCE(lp.partner_name, c.partner_code, ''), ' - ', COALESCE(c.machine_code, '')) AS conversion_partner, "
+            "COUNT(1) OVER () AS _total "
             f"FROM `{self.dataset}.conversion1_context` c "
             f"LEFT JOIN `{self.dataset}.location_partners` lp ON lp.partner_code = c.partner_code "
             f"{where_clause} "
@@ -1295,17 +2074,12 @@ class BigQueryService:
         offset = max(page - 1, 0) * page_size
         data_params = [*params, bigquery.ScalarQueryParameter("limit", "INT64", page_size), bigquery.ScalarQueryParameter("offset", "INT64", offset)]
         rows = self._run(query, data_params).result()
-        return [dict(row) for row in rows], total
+        return self._split_window_total(rows, count_query, params, offset)
 
 
     def conversion1_context_exists(self, context_code: str) -> bool:
         # Check whether one active Conversion 1 Context row exists for submitted/pasted full context codes.
-        query = (
-            f"SELECT 1 FROM `{self.dataset}.conversion1_context` "
-            "WHERE context_code = @context_code AND is_active = TRUE LIMIT 1"
-        )
-        rows = list(self._run(query, [bigquery.ScalarQueryParameter("context_code", "STRING", context_code)]).result())
-        return bool(rows)
+        return self._fetch_first(self._sql.conversion1_context_exists, [_CONTEXT_CODE_PARAM(context_code)]) is not None
 
     def get_failure_modes(self) -> List[str]:
         # Return canonical failure modes from one shared constant used by pellet-bag and conversion workflows.
@@ -1324,7 +2098,7 @@ class BigQueryService:
             f"WHERE {' AND '.join(where)} "
             "ORDER BY created_at DESC LIMIT 5000"
         )
-        rows = [dict(row) for row in self._run(query, params).result()]
+        rows = [dict(row) for row in self._run_and_fetch(query, params)]
         # Track the highest seen numeric code value and increment from that value.
         highest_value = code_to_int(start_code) - 1
         for row in rows:
@@ -1339,18 +2113,8 @@ class BigQueryService:
 
     def conversion1_how_processing_code_exists(self, context_code: str, processing_code: str) -> bool:
         # Enforce per-context uniqueness so one context cannot reuse the same processing code.
-        query = (
-            f"SELECT 1 FROM `{self.dataset}.conversion1_how` "
-            "WHERE context_code = @context_code "
-            "AND processing_code = @processing_code "
-            "AND is_active = TRUE LIMIT 1"
-        )
-        params = [
-            bigquery.ScalarQueryParameter("context_code", "STRING", context_code),
-            bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code),
-        ]
-        rows = list(self._run(query, params).result())
-        return bool(rows)
+        params = [_CONTEXT_CODE_PARAM(context_code), _PROCESSING_CODE_PARAM(processing_code)]
+        return self._fetch_first(self._sql.conversion1_how_processing_code_exists, params) is not None
 
     def create_or_update_conversion1_how(self, entry: Dict[str, Any]) -> None:
         # Insert a new Conversion 1 How row after route-level validation and duplicate checks complete.
@@ -1392,13 +2156,11 @@ class BigQueryService:
         where_clause = "WHERE " + " AND ".join(where)
 
         count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.conversion1_how` h {where_clause}"
-        total_rows = list(self._run(count_query, params).result())
-        total = int(total_rows[0]["total"]) if total_rows else 0
-
         offset = max(page - 1, 0) * page_size
+        # Carry the filtered total as a window column so one job serves both rows and page controls.
         query = (
             "SELECT h.conversion1_how_code, h.context_code, h.process_code, h.processing_code, h.failure_mode, "
-            "h.machine_setup_url, h.processed_data_url, h.created_at, h.created_by "
+            "h.machine_setup_url, h.processed_data_url, h.created_at, h.created_by, COUNT(1) OVER () AS _total "
             f"FROM `{self.dataset}.conversion1_how` h "
             f"{where_clause} "
             "ORDER BY h.created_at DESC, h.conversion1_how_code DESC "
@@ -1409,8 +2171,8 @@ class BigQueryService:
             bigquery.ScalarQueryParameter("limit", "INT64", page_size),
             bigquery.ScalarQueryParameter("offset", "INT64", offset),
         ]
-        rows = [dict(row) for row in self._run(query, data_params).result()]
-        return rows, total
+        rows = self._run(query, data_params).result()
+        return self._split_window_total(rows, count_query, params, offset)
 
     def list_conversion1_how_codes(self) -> List[str]:
         # Return unique active Conversion 1 How codes for product-create dropdown validation.
@@ -1424,12 +2186,7 @@ class BigQueryService:
 
     def conversion1_how_exists(self, code: str) -> bool:
         # Validate create requests by checking an active row exists for the selected/pasted how code.
-        query = (
-            f"SELECT 1 FROM `{self.dataset}.conversion1_how` "
-            "WHERE conversion1_how_code = @code AND is_active = TRUE LIMIT 1"
-        )
-        rows = list(self._run(query, [bigquery.ScalarQueryParameter("code", "STRING", code)]).result())
-        return bool(rows)
+        return self._fetch_first(self._sql.conversion1_how_exists, [bigquery.ScalarQueryParameter("code", "STRING", code)]) is not None
 
     def allocate_conversion1_product_suffix_range(self, count: int) -> int:
         # Atomically reserve a contiguous block of global 4-digit suffix values from the dedicated counter row.
@@ -1554,26 +2311,24 @@ class BigQueryService:
             params.append(bigquery.ScalarQueryParameter("mixed_product", "STRING", mixed_product))
         where_clause = "WHERE " + " AND ".join(where)
 
-        count_rows = list(self._run(f"SELECT COUNT(1) AS total FROM `{self.dataset}.conversion1_products` {where_clause}", params).result())
-        total = int(count_rows[0]["total"]) if count_rows else 0
+        count_query = f"SELECT COUNT(1) AS total FROM `{self.dataset}.conversion1_products` {where_clause}"
         offset = max(page - 1, 0) * page_size
+        # Carry the filtered total as a window column so one job serves both rows and page controls.
 
         query = (
             "SELECT product_code, conversion1_how_code, product_suffix, storage_location, notes, number_units_produced, numbered_in_order, "
             "tensile_rigid_status, tensile_films_status, seal_strength_status, shelf_stability_status, solubility_status, "
             "defect_analysis_status, blocking_status, film_emc_status, friction_status, width_mm, length_m, avg_film_thickness_um, "
-            "sd_film_thickness, film_thickness_variation_percent, created_at, created_by, updated_at, updated_by "
+            "sd_film_thickness, film_thickness_variation_percent, created_at, created_by, updated_at, updated_by, "
+            "COUNT(1) OVER () AS _total "
             f"FROM `{self.dataset}.conversion1_products` {where_clause} "
             "ORDER BY created_at DESC, product_suffix DESC LIMIT @limit OFFSET @offset"
         )
-        rows = [
-            dict(row)
-            for row in self._run(
-                query,
-                [*params, bigquery.ScalarQueryParameter("limit", "INT64", page_size), bigquery.ScalarQueryParameter("offset", "INT64", offset)],
-            ).result()
-        ]
-        return rows, total
+        rows = self._run(
+            query,
+            [*params, bigquery.ScalarQueryParameter("limit", "INT64", page_size), bigquery.ScalarQueryParameter("offset", "INT64", offset)],
+        ).result()
+        return self._split_window_total(rows, count_query, params, offset)
 
     def update_conversion1_product(self, product_code: str, patch_fields: Dict[str, Any], updated_by: Optional[str]) -> bool:
         # Update only editable columns on one active row and report whether a row was matched.
@@ -1629,44 +2384,38 @@ class BigQueryService:
             "(processing_code, location_code, process_code_suffix, failure_mode, machine_setup_url, processed_data_url, "
             "notes, created_at, updated_at, created_by, updated_by, is_active) "
             "VALUES (@processing_code, @location_code, @process_code_suffix, @failure_mode, @machine_setup_url, @processed_data_url, "
-            "@notes, CURRENT_TIMESTAMP(), CURRENT_TIMESTAMP(), @created_by, @updated_by, TRUE)"
+            "@notes, @created_at, @updated_at, @created_by, @updated_by, @is_active)"
         )
-        self._run(
-            query,
-            [
-                bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code),
-                bigquery.ScalarQueryParameter("location_code", "STRING", location_code),
-                bigquery.ScalarQueryParameter("process_code_suffix", "STRING", process_code_suffix),
-                bigquery.ScalarQueryParameter("failure_mode", "STRING", failure_mode),
-                bigquery.ScalarQueryParameter("machine_setup_url", "STRING", machine_setup_url),
-                bigquery.ScalarQueryParameter("processed_data_url", "STRING", processed_data_url),
-                bigquery.ScalarQueryParameter("notes", "STRING", notes),
-                bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
-                bigquery.ScalarQueryParameter("updated_by", "STRING", created_by),
-            ],
-        ).result()
+        # Bind the timestamps and active flag as parameters so the same row can be appended without a DML job.
+        now = datetime.now(timezone.utc)
+        params = [
+            bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code),
+            bigquery.ScalarQueryParameter("location_code", "STRING", location_code),
+            bigquery.ScalarQueryParameter("process_code_suffix", "STRING", process_code_suffix),
+            bigquery.ScalarQueryParameter("failure_mode", "STRING", failure_mode),
+            bigquery.ScalarQueryParameter("machine_setup_url", "STRING", machine_setup_url),
+            bigquery.ScalarQueryParameter("processed_data_url", "STRING", processed_data_url),
+            bigquery.ScalarQueryParameter("notes", "STRING", notes),
+            bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", now),
+            bigquery.ScalarQueryParameter("updated_at", "TIMESTAMP", now),
+            bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+            bigquery.ScalarQueryParameter("updated_by", "STRING", created_by),
+            bigquery.ScalarQueryParameter("is_active", "BOOL", True),
+        ]
+        if not self._append_param_row("compounding_how", params):
+            self._run(query, params).result()
+        # Drop the cached pellet-bag dropdown so the new processing code is selectable immediately.
+        self._invalidate_lookups("compounding_how_codes")
 
     def get_next_compounding_process_suffix(self, start_value: int = 1) -> Optional[str]:
         # Compute the next suffix from persisted submissions only, ignoring unsaved UI generations.
-        query = (
-            f"SELECT process_code_suffix FROM `{self.dataset}.compounding_how` "
-            "WHERE is_active = TRUE ORDER BY process_code_suffix DESC LIMIT 1"
-        )
-        rows = list(self._run(query, []).result())
-        if not rows:
-            return None
-        return rows[0].get("process_code_suffix")
+        # Aggregate with MAX instead of sorting every suffix; an empty table yields one NULL row.
+        row = self._fetch_first(self._sql.latest_compounding_suffix, [])
+        return row["process_code_suffix"] if row is not None else None
 
     def processing_code_exists(self, processing_code: str) -> bool:
         # Allow API-layer conflict checks before inserting immutable processing codes.
-        query = (
-            f"SELECT 1 FROM `{self.dataset}.compounding_how` "
-            "WHERE processing_code = @processing_code AND is_active = TRUE LIMIT 1"
-        )
-        rows = list(
-            self._run(query, [bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code)]).result()
-        )
-        return bool(rows)
+        return self._fetch_first(self._sql.compounding_how_exists, [_PROCESSING_CODE_PARAM(processing_code)]) is not None
 
     def list_compounding_how(self, search: Optional[str] = None) -> List[Dict[str, Any]]:
         # List active compounding records for the table below the form.
@@ -1683,27 +2432,17 @@ class BigQueryService:
             "ORDER BY created_at DESC, processing_code DESC"
         )
         rows = self._run(query, params).result()
-        return [dict(row) for row in rows]
+        return _rows_to_dicts(rows)
 
+    @_cached_lookup("compounding_how_codes")
     def list_compounding_how_codes(self) -> List[str]:
         # Return only active processing codes so forms can enforce valid compounding references.
-        query = (
-            f"SELECT processing_code FROM `{self.dataset}.compounding_how` "
-            "WHERE is_active = TRUE ORDER BY processing_code DESC"
-        )
-        rows = self._run(query, []).result()
+        rows = self._run_and_fetch(self._sql.list_compounding_how_codes, [])
         return [str(row["processing_code"]) for row in rows if row.get("processing_code")]
 
     def compounding_how_exists(self, processing_code: str) -> bool:
         # Provide constant-time existence validation for create flows without fetching full code lists.
-        query = (
-            f"SELECT 1 FROM `{self.dataset}.compounding_how` "
-            "WHERE is_active = TRUE AND processing_code = @processing_code LIMIT 1"
-        )
-        rows = list(
-            self._run(query, [bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code)]).result()
-        )
-        return bool(rows)
+        return self._fetch_first(self._sql.compounding_how_exists, [_PROCESSING_CODE_PARAM(processing_code)]) is not None
 
     def update_compounding_how(
         self,
@@ -1738,28 +2477,8 @@ class BigQueryService:
         # Allocate an atomic contiguous range of counter values and return the starting value.
         if count < 1:
             raise ValueError("count must be >= 1")
-        for _ in range(20):
-            current_value = self.allocate_counter(counter_name=counter_name, scope=scope, start_value=start_value)
-            if count == 1:
-                return current_value
-            update_query = (
-                f"UPDATE `{self.dataset}.code_counters` "
-                "SET next_value = @next_value, updated_at = CURRENT_TIMESTAMP() "
-                "WHERE counter_name = @counter_name AND scope = @scope AND next_value = @expected_next_value"
-            )
-            update_job = self._run(
-                update_query,
-                [
-                    bigquery.ScalarQueryParameter("next_value", "INT64", current_value + count),
-                    bigquery.ScalarQueryParameter("counter_name", "STRING", counter_name),
-                    bigquery.ScalarQueryParameter("scope", "STRING", scope),
-                    bigquery.ScalarQueryParameter("expected_next_value", "INT64", current_value + 1),
-                ],
-            )
-            update_job.result()
-            if update_job.num_dml_affected_rows == 1:
-                return current_value
-        raise RuntimeError("Failed to allocate counter range after retries")
+        # Reserve the whole block in the same transactional MERGE so no follow-up compare-and-set job can lose a race.
+        return self.allocate_counter(counter_name=counter_name, scope=scope, start_value=start_value, count=count)
 
     def list_pellet_bag_assignees(self, default_emails: Optional[List[str]] = None) -> List[str]:
         # Return active assignee emails from table, seeding defaults once when table is empty.
@@ -1875,22 +2594,20 @@ class BigQueryService:
 
     def get_sku_summary(self, sku: str) -> Dict[str, List[Dict[str, Any]] | Optional[Dict[str, Any]]]:
         # Fetch ingredient record plus related formulation and pellet bag links for the SKU detail page.
-        ingredient = self.get_ingredient(sku)
         formulations_query = (
-            f"SELECT set_code, weight_code, batch_variant_code, base_code, created_at "
-            f"FROM `{self.dataset}.v_formulations_flat` "
-            "WHERE EXISTS (SELECT 1 FROM UNNEST(sku_list) AS listed_sku WHERE listed_sku = @sku) "
-            "ORDER BY created_at DESC"
+            f"SELECT f.set_code, f.weight_code, f.batch_variant_code, f.base_code, f.created_at "
+            f"FROM `{self.dataset}.formulations_flat` f "
+            "JOIN ("
+            "  SELECT DISTINCT set_code, weight_code, batch_variant_code "
+            f"  FROM `{self.dataset}.batch_variant_items` WHERE sku = @sku"
+            ") m USING (set_code, weight_code, batch_variant_code) "
+            "ORDER BY f.created_at DESC"
         )
-        formulations = [
-            dict(row)
-            for row in self._run(formulations_query, [bigquery.ScalarQueryParameter("sku", "STRING", sku)]).result()
-        ]
         pellet_query = (
             f"SELECT DISTINCT p.pellet_bag_id, p.pellet_bag_code, p.compounding_how_code, p.updated_at, p.created_at "
             f"FROM `{self.dataset}.pellet_bags` p "
             f"JOIN `{self.dataset}.compounding_how` c ON c.processing_code = p.compounding_how_code "
-            f"JOIN `{self.dataset}.v_formulations_flat` f "
+            f"JOIN `{self.dataset}.formulations_flat` f "
             "ON f.set_code = SPLIT(c.location_code, ' ')[SAFE_OFFSET(0)] "
             "AND f.weight_code = SPLIT(c.location_code, ' ')[SAFE_OFFSET(1)] "
             "AND f.batch_variant_code = SPLIT(c.location_code, ' ')[SAFE_OFFSET(2)] "
@@ -1898,10 +2615,12 @@ class BigQueryService:
             "AND EXISTS (SELECT 1 FROM UNNEST(f.sku_list) AS listed_sku WHERE LOWER(listed_sku) = LOWER(@sku)) "
             "ORDER BY updated_at DESC, created_at DESC"
         )
-        pellet_bags = [
-            dict(row)
-            for row in self._run(pellet_query, [bigquery.ScalarQueryParameter("sku", "STRING", sku)]).result()
-        ]
+        # Submit both independent listing jobs before blocking so they run alongside the ingredient lookup.
+        formulations_job = self._run(formulations_query, [bigquery.ScalarQueryParameter("sku", "STRING", sku)])
+        pellet_job = self._run(pellet_query, [bigquery.ScalarQueryParameter("sku", "STRING", sku)])
+        ingredient = self.get_ingredient(sku)
+        formulations = _rows_to_dicts(formulations_job.result())
+        pellet_bags = _rows_to_dicts(pellet_job.result())
         return {"ingredient": ingredient, "formulations": formulations, "pellet_bags": pellet_bags}
 
     def get_sku_summary_filtered(self, sku: str, include_formulations: bool) -> Dict[str, List[Dict[str, Any]] | Optional[Dict[str, Any]]]:
@@ -1911,7 +2630,7 @@ class BigQueryService:
             summary["formulations"] = []
         return summary
 
-    def get_pellet_bag_detail(self, pellet_bag_code: str) -> Optional[Dict[str, Any]]:
+    def get_pellet_bag_detail(self, pellet_bag_code: str, include_dry_weights: bool = True) -> Optional[Dict[str, Any]]:
         # Load one pellet bag row and enrich it with compounding + location partner context for the detail page.
         pellet_query = (
             f"SELECT p.*, "
@@ -1927,7 +2646,7 @@ class BigQueryService:
             f"LEFT JOIN `{self.dataset}.location_partners` lp ON lp.partner_code = lc.partner_code "
             "WHERE p.pellet_bag_code = @pellet_bag_code AND p.is_active = TRUE LIMIT 1"
         )
-        rows = list(self._run(pellet_query, [bigquery.ScalarQueryParameter("pellet_bag_code", "STRING", pellet_bag_code)]).result())
+        rows = list(self._run_and_fetch(pellet_query, [bigquery.ScalarQueryParameter("pellet_bag_code", "STRING", pellet_bag_code)]))
         if not rows:
             return None
         pellet = dict(rows[0])
@@ -1937,20 +2656,20 @@ class BigQueryService:
                 f"SELECT * FROM `{self.dataset}.compounding_how` "
                 "WHERE processing_code = @processing_code AND is_active = TRUE LIMIT 1"
             )
-            comp_rows = list(self._run(comp_query, [bigquery.ScalarQueryParameter("processing_code", "STRING", pellet["compounding_how_code"])]).result())
+            comp_rows = list(self._run_and_fetch(comp_query, [bigquery.ScalarQueryParameter("processing_code", "STRING", pellet["compounding_how_code"])]))
             if comp_rows:
                 compounding = dict(comp_rows[0])
         # Attach related formulation rows by decoding set/weight/batch tokens from the compounding location code.
-        formulations = self.list_formulations_for_pellet_bag(pellet_bag_code)
+        formulations = self.list_formulations_for_pellet_bag(pellet_bag_code, include_dry_weights)
         return {"pellet_bag": pellet, "compounding_how": compounding, "formulations": formulations}
 
-    def list_formulations_for_pellet_bag(self, pellet_bag_code: str) -> List[Dict[str, Any]]:
+    def list_formulations_for_pellet_bag(self, pellet_bag_code: str, include_dry_weights: bool = True) -> List[Dict[str, Any]]:
         # Resolve formulation rows connected to a pellet bag via compounding_how.location_code token mapping.
         query = (
-            f"SELECT f.* "
+            f"SELECT {_formulation_select_list('f', include_dry_weights)} "
             f"FROM `{self.dataset}.pellet_bags` p "
             f"JOIN `{self.dataset}.compounding_how` c ON c.processing_code = p.compounding_how_code AND c.is_active = TRUE "
-            f"JOIN `{self.dataset}.v_formulations_flat` f "
+            f"JOIN `{self.dataset}.formulations_flat` f "
             "ON f.set_code = SPLIT(c.location_code, ' ')[SAFE_OFFSET(0)] "
             "AND f.weight_code = SPLIT(c.location_code, ' ')[SAFE_OFFSET(1)] "
             "AND f.batch_variant_code = SPLIT(c.location_code, ' ')[SAFE_OFFSET(2)] "
@@ -1958,14 +2677,11 @@ class BigQueryService:
             "ORDER BY f.created_at DESC"
         )
         params = [bigquery.ScalarQueryParameter("pellet_bag_code", "STRING", pellet_bag_code)]
-        return [dict(row) for row in self._run(query, params).result()]
+        return _rows_to_dicts(self._run(query, params).result())
 
     def get_pellet_bag_detail_filtered(self, pellet_bag_code: str, include_dry_weights: bool) -> Optional[Dict[str, Any]]:
-        # Reuse the full pellet-bag detail query and then strip restricted formulation payloads when required.
-        detail = self.get_pellet_bag_detail(pellet_bag_code)
-        if detail and not include_dry_weights:
-            detail["formulations"] = self.strip_dry_weight_data(detail.get("formulations") or [])
-        return detail
+        # Leave dry-weight percentages out of the formulation query itself when the caller lacks access.
+        return self.get_pellet_bag_detail(pellet_bag_code, include_dry_weights)
 
     def list_pellet_bags_with_meaningful_status(self, status_column: str, limit: int = 25) -> List[Dict[str, Any]]:
         # Restrict status filters to known columns to avoid unsafe dynamic SQL.
@@ -1998,7 +2714,7 @@ class BigQueryService:
             f"AND LOWER(TRIM({status_column})) NOT IN ('not requested', 'not received', 'complete') "
             "ORDER BY COALESCE(updated_at, created_at) DESC LIMIT @limit"
         )
-        return [dict(row) for row in self._run(query, [bigquery.ScalarQueryParameter("limit", "INT64", limit)]).result()]
+        return _rows_to_dicts(self._run(query, [bigquery.ScalarQueryParameter("limit", "INT64", limit)]).result())
 
     def list_pellet_bags(self, search: Optional[str] = None) -> List[Dict[str, Any]]:
         # Return active pellet bag records newest-first for the management table.
@@ -2015,7 +2731,7 @@ class BigQueryService:
             "long_moisture_assignee_email, density_assignee_email, injection_moulding_assignee_email, film_forming_assignee_email, notes, customer, created_at, updated_at, created_by, updated_by "
             f"FROM `{self.dataset}.pellet_bags` WHERE {' AND '.join(where_clauses)} ORDER BY created_at DESC, sequence_number DESC"
         )
-        return [dict(row) for row in self._run(query, params).result()]
+        return _rows_to_dicts(self._run(query, params).result())
 
     def get_compounding_how_detail(self, processing_code: str) -> Optional[Dict[str, Any]]:
         # Load one compounding-how record and attach all related pellet bags that reference its processing code.
@@ -2025,7 +2741,7 @@ class BigQueryService:
             f"FROM `{self.dataset}.compounding_how` "
             "WHERE processing_code = @processing_code AND is_active = TRUE LIMIT 1"
         )
-        rows = list(self._run(compounding_query, [bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code)]).result())
+        rows = list(self._run_and_fetch(compounding_query, [bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code)]))
         if not rows:
             return None
         compounding = dict(rows[0])
@@ -2037,7 +2753,7 @@ class BigQueryService:
         )
         pellet_bags = [
             dict(row)
-            for row in self._run(pellet_bag_query, [bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code)]).result()
+            for row in self._run_and_fetch(pellet_bag_query, [bigquery.ScalarQueryParameter("processing_code", "STRING", processing_code)])
         ]
         return {"compounding_how": compounding, "pellet_bags": pellet_bags}
 
@@ -2048,7 +2764,7 @@ class BigQueryService:
             return {"base_code": base_code, "formulation": None, "location_codes": [], "compounding_how": [], "pellet_bags": []}
         set_code, weight_code, batch_variant_code = parts
         formulation_query = (
-            f"SELECT * FROM `{self.dataset}.v_formulations_flat` "
+            f"SELECT * FROM `{self.dataset}.formulations_flat` "
             "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_variant_code = @batch_variant_code "
             "ORDER BY created_at DESC LIMIT 1"
         )
@@ -2068,17 +2784,15 @@ class BigQueryService:
             "WHERE set_code = @set_code AND weight_code = @weight_code AND batch_variant_code = @batch_variant_code "
             "ORDER BY created_at DESC"
         )
-        location_codes = [
-            dict(row)
-            for row in self._run(
-                location_query,
-                [
-                    bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                    bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                    bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
-                ],
-            ).result()
-        ]
+        location_rows = self._run(
+            location_query,
+            [
+                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
+                bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
+                bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
+            ],
+        ).result()
+        location_codes = _rows_to_dicts(location_rows)
         location_ids = [row["location_id"] for row in location_codes if row.get("location_id")]
         compounding_how: List[Dict[str, Any]] = []
         pellet_bags: List[Dict[str, Any]] = []
@@ -2089,10 +2803,7 @@ class BigQueryService:
                 "WHERE is_active = TRUE AND location_code IN UNNEST(@location_ids) "
                 "ORDER BY created_at DESC"
             )
-            compounding_how = [
-                dict(row)
-                for row in self._run(compounding_query, [bigquery.ArrayQueryParameter("location_ids", "STRING", location_ids)]).result()
-            ]
+            compounding_how = _rows_to_dicts(self._run(compounding_query, [bigquery.ArrayQueryParameter("location_ids", "STRING", location_ids)]).result())
             processing_codes = [row["processing_code"] for row in compounding_how if row.get("processing_code")]
             if processing_codes:
                 pellet_query = (
@@ -2101,10 +2812,7 @@ class BigQueryService:
                     "WHERE is_active = TRUE AND compounding_how_code IN UNNEST(@processing_codes) "
                     "ORDER BY created_at DESC"
                 )
-                pellet_bags = [
-                    dict(row)
-                    for row in self._run(pellet_query, [bigquery.ArrayQueryParameter("processing_codes", "STRING", processing_codes)]).result()
-                ]
+                pellet_bags = _rows_to_dicts(self._run(pellet_query, [bigquery.ArrayQueryParameter("processing_codes", "STRING", processing_codes)]).result())
         return {
             "base_code": f"{set_code} {weight_code} {batch_variant_code}",
             "formulation": dict(formulation_rows[0]) if formulation_rows else None,
@@ -2132,7 +2840,7 @@ class BigQueryService:
             f"(SELECT COUNT(1) FROM `{self.dataset}.pellet_bags` WHERE is_active = TRUE) AS active_pellet_bags, "
             f"(SELECT COALESCE(SUM(bag_mass_kg), 0) FROM `{self.dataset}.pellet_bags` WHERE is_active = TRUE) AS total_pellets_produced_kg"
         )
-        rows = list(self._run(query, []).result())
+        rows = list(self._run_and_fetch(query, []))
         if not rows:
             return {"sku_count": 0, "active_pellet_bags": 0, "total_pellets_produced_kg": 0.0}
         row = dict(rows[0])
@@ -2245,23 +2953,53 @@ class BigQueryService:
         production_date: str,
         location_id: str,
         created_by: Optional[str],
-    ) -> None:
-        # Store generated location IDs so batch traceability records can be audited later.
-        query = (
-            f"INSERT `{self.dataset}.location_codes` "
-            "(set_code, weight_code, batch_variant_code, partner_code, production_date, location_id, created_at, created_by) "
-            "VALUES (@set_code, @weight_code, @batch_variant_code, @partner_code, @production_date, @location_id, @created_at, @created_by)"
-        )
-        self._run(
-            query,
+    ) -> bool:
+        # Store a generated location ID unless it already exists, reporting whether the row was added.
+        params = [
+            _SET_CODE_PARAM(set_code),
+            _WEIGHT_CODE_PARAM(weight_code),
+            bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
+            bigquery.ScalarQueryParameter("partner_code", "STRING", partner_code),
+            bigquery.ScalarQueryParameter("production_date", "STRING", production_date),
+            bigquery.ScalarQueryParameter("location_id", "STRING", location_id),
+            bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+        ]
+        # Check and insert in one MERGE so a repeated submission cannot store the same location ID twice.
+        job = self._run(self._sql.insert_location_code, params)
+        job.result()
+        if job.num_dml_affected_rows != 1:
+            return False
+        # Cached listing totals and dropdown IDs no longer match once a location code is added.
+        self._invalidate_lookups("location_code_total")
+        self._invalidate_lookups("location_code_ids")
+        return True
+
+    def insert_location_codes_bulk(self, rows: Sequence[Dict[str, Any]]) -> int:
+        # Merge many location IDs in one job, skipping IDs that already exist, and return how many were added.
+        # Keep the first row per location ID so duplicates within one import never reach the MERGE source.
+        by_location_id: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            by_location_id.setdefault(row["location_id"], row)
+        unique_rows = list(by_location_id.values())
+        if not unique_rows:
+            return 0
+        job = self._run(
+            self._sql.insert_location_codes_bulk,
             [
-                bigquery.ScalarQueryParameter("set_code", "STRING", set_code),
-                bigquery.ScalarQueryParameter("weight_code", "STRING", weight_code),
-                bigquery.ScalarQueryParameter("batch_variant_code", "STRING", batch_variant_code),
-                bigquery.ScalarQueryParameter("partner_code", "STRING", partner_code),
-                bigquery.ScalarQueryParameter("production_date", "STRING", production_date),
-                bigquery.ScalarQueryParameter("location_id", "STRING", location_id),
-                bigquery.ScalarQueryParameter("created_at", "TIMESTAMP", datetime.now(timezone.utc)),
-                bigquery.ScalarQueryParameter("created_by", "STRING", created_by),
+                bigquery.ArrayQueryParameter("location_ids", "STRING", [row["location_id"] for row in unique_rows]),
+                bigquery.ArrayQueryParameter("set_codes", "STRING", [row["set_code"] for row in unique_rows]),
+                bigquery.ArrayQueryParameter("weight_codes", "STRING", [row["weight_code"] for row in unique_rows]),
+                bigquery.ArrayQueryParameter("batch_variant_codes", "STRING", [row["batch_variant_code"] for row in unique_rows]),
+                bigquery.ArrayQueryParameter("partner_codes", "STRING", [row["partner_code"] for row in unique_rows]),
+                bigquery.ArrayQueryParameter("production_dates", "STRING", [row["production_date"] for row in unique_rows]),
+                # Arrays cannot hold NULL, so a missing creator travels as '' and is restored by NULLIF.
+                bigquery.ArrayQueryParameter("created_bys", "STRING", [row.get("created_by") or "" for row in unique_rows]),
             ],
-        ).result()
+        )
+        job.result()
+        inserted = job.num_dml_affected_rows or 0
+        if inserted:
+            # Cached listing totals and dropdown IDs no longer match once a location code is added.
+            self._invalidate_lookups("location_code_total")
+            self._invalidate_lookups("location_code_ids")
+        return inserted
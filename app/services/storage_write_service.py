@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import threading
+from typing import Any, Dict, Sequence, Tuple
+
+from google.cloud.bigquery_storage_v1 import BigQueryWriteClient, types
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+
+
+# Map BigQuery scalar types onto proto2 field types accepted by the Storage Write API.
+_PROTO_TYPES = {
+    "STRING": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+    "INT64": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+    "FLOAT64": descriptor_pb2.FieldDescriptorProto.TYPE_DOUBLE,
+    "BOOL": descriptor_pb2.FieldDescriptorProto.TYPE_BOOL,
+    # TIMESTAMP travels as microseconds since the epoch; NUMERIC as its decimal string.
+    "TIMESTAMP": descriptor_pb2.FieldDescriptorProto.TYPE_INT64,
+    "NUMERIC": descriptor_pb2.FieldDescriptorProto.TYPE_STRING,
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Share one gRPC write client per process so channels are reused across service instances.
+_WRITE_CLIENT: BigQueryWriteClient | None = None
+_WRITE_CLIENT_LOCK = threading.Lock()
+
+
+def _get_write_client() -> BigQueryWriteClient:
+    global _WRITE_CLIENT
+    with _WRITE_CLIENT_LOCK:
+        if _WRITE_CLIENT is None:
+            _WRITE_CLIENT = BigQueryWriteClient()
+        return _WRITE_CLIENT
+
+
+def _to_proto_value(type_: str, value: Any) -> Any:
+    # Convert Python values into the wire representation chosen for each BigQuery column type.
+    if type_ == "TIMESTAMP":
+        if isinstance(value, datetime):
+            moment = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+            return (moment - _EPOCH) // timedelta(microseconds=1)
+        return int(value)
+    if type_ == "NUMERIC":
+        return str(value)
+    if type_ == "FLOAT64":
+        return float(value)
+    if type_ == "INT64":
+        return int(value)
+    if type_ == "BOOL":
+        return bool(value)
+    return str(value)
+
+
+@dataclass
+class StorageWriteService:
+    project_id: str
+    dataset_id: str
+
+    def __post_init__(self) -> None:
+        self.client = _get_write_client()
+        self._schemas: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Tuple[descriptor_pb2.DescriptorProto, Any]] = {}
+        self._lock = threading.Lock()
+
+    def supports(self, columns: Sequence[Tuple[str, str]]) -> bool:
+        # Let callers keep the DML path for column types this writer does not encode.
+        return all(type_ in _PROTO_TYPES for _, type_ in columns)
+
+    def _schema(self, table: str, columns: Sequence[Tuple[str, str]]) -> Tuple[descriptor_pb2.DescriptorProto, Any]:
+        # Build and memoize one proto2 row descriptor per table/column list so hot paths skip descriptor setup.
+        key = (table, tuple(columns))
+        with self._lock:
+            cached = self._schemas.get(key)
+            if cached is not None:
+                return cached
+            descriptor = descriptor_pb2.DescriptorProto(name="Row")
+            for number, (name, type_) in enumerate(columns, start=1):
+                descriptor.field.add(
+                    name=name,
+                    number=number,
+                    type=_PROTO_TYPES[type_],
+                    label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL,
+                )
+            file_proto = descriptor_pb2.FileDescriptorProto(name=f"{table}.proto", package=table, syntax="proto2")
+            file_proto.message_type.add().CopyFrom(descriptor)
+            # Use a private pool per schema so identically named row messages never collide.
+            pool = descriptor_pool.DescriptorPool()
+            pool.Add(file_proto)
+            message_class = message_factory.GetMessageClass(pool.FindMessageTypeByName(f"{table}.Row"))
+            self._schemas[key] = (descriptor, message_class)
+            return descriptor, message_class
+
+    def append_rows(self, table: str, columns: Sequence[Tuple[str, str]], rows: Sequence[Sequence[Any]]) -> None:
+        # Append rows to the table's default stream, which commits on ack with no query job or DML quota.
+        if not rows:
+            return
+        descriptor, message_class = self._schema(table, columns)
+        proto_rows = types.ProtoRows()
+        for row in rows:
+            message = message_class()
+            for (name, type_), value in zip(columns, row):
+                # Leave NULL columns unset so BigQuery stores NULL rather than a proto default.
+                if value is not None:
+                    setattr(message, name, _to_proto_value(type_, value))
+            proto_rows.serialized_rows.append(message.SerializeToString())
+
+        write_stream = f"{self.client.table_path(self.project_id, self.dataset_id, table)}/streams/_default"
+        request = types.AppendRowsRequest(
+            write_stream=write_stream,
+            proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=descriptor),
+                rows=proto_rows,
+            ),
+        )
+        # Route the bidi call to the stream's backend the same way the library's AppendRowsStream does.
+        responses = self.client.append_rows(
+            iter([request]),
+            metadata=(("x-goog-request-params", f"write_stream={write_stream}"),),
+        )
+        for response in responses:
+            if response.error.code or response.row_errors:
+                detail = response.error.message or "; ".join(error.message for error in response.row_errors)
+                raise RuntimeError(f"Storage Write append to {table} failed: {detail}")
+            return
+        raise RuntimeError(f"Storage Write append to {table} returned no acknowledgement")
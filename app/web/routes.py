@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import date, datetime
 from urllib.parse import urlparse
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
+from starlette.concurrency import run_in_threadpool
 from pydantic import ValidationError
 
 from app.dependencies import get_bigquery, get_settings, get_storage
@@ -20,6 +22,11 @@ router = APIRouter()
 
 templates = Jinja2Templates(directory="app/web/templates")
 
+# Read only the columns the ingredient table renders; audit timestamps and MSDS file metadata stay on the detail paths.
+INGREDIENT_TABLE_COLUMNS = (
+    "sku", "trade_name_inci", "supplier", "spec_grade", "format", "pack_size_value", "pack_size_unit", "created_by", "msds_object_path",
+)
+
 # Keep role options centralized so GET and POST render paths always show the same valid choices.
 USER_ROLE_OPTIONS = ["sku_codes", "formulations", "formulations_mix", "mixing_1", "admin"]
 
@@ -100,27 +107,35 @@ def _resolve_conversion1_how_codes(process_code: str, processing_code: str, subm
 async def dashboard(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> HTMLResponse:
     # Enforce dashboard access server-side before loading any shared operational data.
     require_permission(request, "dashboard.view")
+    # Run the independent status panels and stats on worker threads together so the event loop stays free.
+    long_moisture, density, injection_moulding, film_forming, dashboard_stats = await asyncio.gather(
+        run_in_threadpool(bigquery.list_pellet_bags_with_meaningful_status, "long_moisture_status"),
+        run_in_threadpool(bigquery.list_pellet_bags_with_meaningful_status, "density_status"),
+        run_in_threadpool(bigquery.list_pellet_bags_with_meaningful_status, "injection_moulding_status"),
+        run_in_threadpool(bigquery.list_pellet_bags_with_meaningful_status, "film_forming_status"),
+        run_in_threadpool(bigquery.get_dashboard_stats),
+    )
     # Build dashboard sections grouped into quality control and processing workstreams.
     status_sections = [
         {
             "title": "Quality Control",
             "items": [
-                {"title": "Long Moisture Status", "column": "long_moisture_status", "items": bigquery.list_pellet_bags_with_meaningful_status("long_moisture_status")},
-                {"title": "Density Status", "column": "density_status", "items": bigquery.list_pellet_bags_with_meaningful_status("density_status")},
+                {"title": "Long Moisture Status", "column": "long_moisture_status", "items": long_moisture},
+                {"title": "Density Status", "column": "density_status", "items": density},
             ],
         },
         {
             "title": "Processing",
             "items": [
-                {"title": "Injection Moulding Status", "column": "injection_moulding_status", "items": bigquery.list_pellet_bags_with_meaningful_status("injection_moulding_status")},
-                {"title": "Film Forming Status", "column": "film_forming_status", "items": bigquery.list_pellet_bags_with_meaningful_status("film_forming_status")},
+                {"title": "Injection Moulding Status", "column": "injection_moulding_status", "items": injection_moulding},
+                {"title": "Film Forming Status", "column": "film_forming_status", "items": film_forming},
             ],
         },
     ]
     # Render the dashboard at root so Cloud Run domain root lands on operational status panels.
     return templates.TemplateResponse(
         "dashboard.html",
-        {"request": request, "title": "Dashboard", "status_sections": status_sections, "dashboard_stats": bigquery.get_dashboard_stats()},
+        {"request": request, "title": "Dashboard", "status_sections": status_sections, "dashboard_stats": dashboard_stats},
     )
 
 
@@ -129,7 +144,7 @@ async def about(request: Request, q: str | None = None, bigquery: BigQueryServic
     # Preserve previous landing page behaviour under a dedicated informational route.
     require_permission(request, "ingredients.view")
     filters = {"q": q} if q else {}
-    items = bigquery.list_ingredients(filters)
+    items = await run_in_threadpool(bigquery.list_ingredients, filters, projection=INGREDIENT_TABLE_COLUMNS)
     return templates.TemplateResponse(
         "ingredients.html",
         {"request": request, "title": "Ingredient SKUs", "items": items, "q": q or ""},
@@ -141,7 +156,7 @@ async def ingredients(request: Request, q: str | None = None, bigquery: BigQuery
     # Enforce Group 1 access for the ingredient listing page.
     require_permission(request, "ingredients.view")
     filters = {"q": q} if q else {}
-    items = bigquery.list_ingredients(filters)
+    items = await run_in_threadpool(bigquery.list_ingredients, filters, projection=INGREDIENT_TABLE_COLUMNS)
     return templates.TemplateResponse(
         "ingredients.html",
         {"request": request, "title": "Ingredient SKUs", "items": items, "q": q or ""},
@@ -172,7 +187,8 @@ async def utilities(request: Request) -> HTMLResponse:
 async def batches(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> HTMLResponse:
     # Allow only users with batch visibility to browse batch lookup entry points.
     require_permission(request, "batches.view")
-    items = bigquery.list_ingredients({})
+    # The SKU picker only renders the code and trade name, so skip the remaining ingredient columns.
+    items = await run_in_threadpool(bigquery.list_ingredients, {}, projection=("sku", "trade_name_inci"))
     return templates.TemplateResponse(
         "batches.html",
         {"request": request, "title": "Ingredient Batches", "items": items},
@@ -184,7 +200,7 @@ async def batch_detail(sku: str, batch_code: str, request: Request, bigquery: Bi
     # Enforce batch-detail access before querying the requested record.
     access = require_permission(request, "batches.view")
     # Retrieve full batch details for the selected SKU + batch code pair.
-    batch = bigquery.get_batch(sku, batch_code)
+    batch = await run_in_threadpool(bigquery.get_batch, sku, batch_code)
     if not batch:
         raise HTTPException(status_code=404, detail="Batch not found")
     return templates.TemplateResponse(
@@ -204,7 +220,8 @@ async def batch_detail(sku: str, batch_code: str, request: Request, bigquery: Bi
 async def sets(request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> HTMLResponse:
     # Load ingredient options for set creation; existing set rows are fetched client-side with pagination.
     require_permission(request, "sets.view")
-    items = bigquery.list_ingredients({})
+    # The SKU picker only renders the code and trade name, so skip the remaining ingredient columns.
+    items = await run_in_threadpool(bigquery.list_ingredients, {}, projection=("sku", "trade_name_inci"))
     return templates.TemplateResponse(
         "sets.html",
         {
@@ -271,14 +288,15 @@ async def conversion1_context_page(
     safe_page_size = max(1, min(page_size, MAX_PAGE_SIZE))
     safe_page = max(1, page)
     # Load conversion-code rows for the Context page table and apply optional text filtering.
-    rows, total = bigquery.list_conversion1_codes_paginated(
+    rows, total = await run_in_threadpool(
+        bigquery.list_conversion1_codes_paginated,
         search=(q or "").strip() or None,
         page=safe_page,
         page_size=safe_page_size,
     )
     # Fetch active pellet codes for the dropdown and partner-machine options for conversion partner selection.
-    pellet_codes = bigquery.list_pellet_bag_codes()
-    raw_options = bigquery.get_mixing_partner_machine_options()
+    pellet_codes = await run_in_threadpool(bigquery.list_pellet_bag_codes)
+    raw_options = await run_in_threadpool(bigquery.get_mixing_partner_machine_options)
     # Normalize partner-machine rows so one select option resolves to one deterministic partner + machine pair.
     partner_machine_options = [
         {
@@ -326,8 +344,8 @@ async def conversion1_context_submit(request: Request, bigquery: BigQueryService
     pellet_code = pellet_code_manual or pellet_code_select
     errors: list[str] = []
     # Fetch reference data used by both validation and dropdown rendering.
-    pellet_codes = bigquery.list_pellet_bag_codes()
-    raw_options = bigquery.get_mixing_partner_machine_options()
+    pellet_codes = await run_in_threadpool(bigquery.list_pellet_bag_codes)
+    raw_options = await run_in_threadpool(bigquery.get_mixing_partner_machine_options)
     partner_machine_options = [
         {
             "key": f"{(option.get('partner_code') or '').strip()}||{(option.get('machine_code') or '').strip()}",
@@ -361,7 +379,8 @@ async def conversion1_context_submit(request: Request, bigquery: BigQueryService
     result = None
     if not errors and selected_option:
         # Ensure deterministic context exists before minting the final Conversion ID row.
-        context = bigquery.create_or_get_conversion1_context(
+        context = await run_in_threadpool(
+            bigquery.create_or_get_conversion1_context,
             pellet_code=pellet_code,
             partner_code=selected_option["partner_code"],
             machine_code=selected_option["machine_code"],
@@ -371,7 +390,8 @@ async def conversion1_context_submit(request: Request, bigquery: BigQueryService
         # Return the generated Context code directly because Conversion 1 How is intentionally removed.
         result = {"conversion_code": str(context.get("context_code") or "")}
     # Reload first page after submission so newest entry appears immediately with any validation feedback.
-    rows, total = bigquery.list_conversion1_codes_paginated(
+    rows, total = await run_in_threadpool(
+        bigquery.list_conversion1_codes_paginated,
         search=None,
         page=1,
         page_size=DEFAULT_PAGE_SIZE,
@@ -418,9 +438,9 @@ async def conversion1_how_page(
     safe_page_size = max(1, min(page_size, MAX_PAGE_SIZE))
     safe_page = max(1, page)
     # Load newest Conversion 1 How entries and optional filter state for table rendering.
-    rows, total = bigquery.list_conversion1_how_entries(search=(q or "").strip() or None, page=safe_page, page_size=safe_page_size)
+    rows, total = await run_in_threadpool(bigquery.list_conversion1_how_entries, search=(q or "").strip() or None, page=safe_page, page_size=safe_page_size)
     # Load active context codes so users can either select an existing code or paste one manually.
-    context_rows, _ = bigquery.list_conversion1_codes_paginated(search=None, page=1, page_size=MAX_PAGE_SIZE)
+    context_rows, _ = await run_in_threadpool(bigquery.list_conversion1_codes_paginated, search=None, page=1, page_size=MAX_PAGE_SIZE)
     context_codes = [str(row.get("conversion_code") or "").strip() for row in context_rows if str(row.get("conversion_code") or "").strip()]
     return templates.TemplateResponse(
         "conversion1_how.html",
@@ -441,7 +461,7 @@ async def conversion1_how_page(
             },
             "form_data": {},
             "context_codes": context_codes,
-            "failure_modes": bigquery.get_failure_modes(),
+            "failure_modes": await run_in_threadpool(bigquery.get_failure_modes),
         },
     )
 
@@ -465,9 +485,9 @@ async def conversion1_how_submit(request: Request, bigquery: BigQueryService = D
     context_code = context_code_manual or context_code_select
     errors: list[str] = []
     # Re-hydrate dropdown options and table state for full-page re-render in both success and error flows.
-    context_rows, _ = bigquery.list_conversion1_codes_paginated(search=None, page=1, page_size=MAX_PAGE_SIZE)
+    context_rows, _ = await run_in_threadpool(bigquery.list_conversion1_codes_paginated, search=None, page=1, page_size=MAX_PAGE_SIZE)
     context_codes = [str(row.get("conversion_code") or "").strip() for row in context_rows if str(row.get("conversion_code") or "").strip()]
-    failure_modes = bigquery.get_failure_modes()
+    failure_modes = await run_in_threadpool(bigquery.get_failure_modes)
 
     # Validate that context code is present because both generation and save require this field.
     if not context_code:
@@ -501,7 +521,7 @@ async def conversion1_how_submit(request: Request, bigquery: BigQueryService = D
 
     # Generate button only allocates next Processing Code for the selected/typed context code.
     if submit_action == "generate" and context_code and not errors:
-        resolved_processing_code = bigquery.get_next_conversion1_how_process_code(context_code=context_code, start_code="AB")
+        resolved_processing_code = await run_in_threadpool(bigquery.get_next_conversion1_how_process_code, context_code=context_code, start_code="AB")
 
     # Build full code preview exactly as context code + one space + the resolved effective processing code.
     generated_how_code = f"{context_code} {resolved_processing_code}".strip() if context_code and resolved_processing_code else ""
@@ -512,12 +532,13 @@ async def conversion1_how_submit(request: Request, bigquery: BigQueryService = D
         failure_mode = "N/A"
 
     # Save action blocks duplicates when context_code + effective processing_code already exists as active.
-    if submit_action == "save" and not errors and bigquery.conversion1_how_processing_code_exists(context_code, resolved_processing_code):
+    if submit_action == "save" and not errors and await run_in_threadpool(bigquery.conversion1_how_processing_code_exists, context_code, resolved_processing_code):
         errors.append("Processing code already exists for this context code. Please use a different processing code.")
 
     if submit_action == "save" and not errors:
         # Persist Conversion 1 How row without writing legacy fields and without regenerating any codes.
-        bigquery.create_or_update_conversion1_how(
+        await run_in_threadpool(
+            bigquery.create_or_update_conversion1_how,
             {
                 "conversion1_how_code": generated_how_code,
                 "context_code": context_code,
@@ -531,7 +552,7 @@ async def conversion1_how_submit(request: Request, bigquery: BigQueryService = D
         )
 
     # Reload first page after submit so newest save appears immediately and pagination resets predictably.
-    rows, total = bigquery.list_conversion1_how_entries(search=None, page=1, page_size=DEFAULT_PAGE_SIZE)
+    rows, total = await run_in_threadpool(bigquery.list_conversion1_how_entries, search=None, page=1, page_size=DEFAULT_PAGE_SIZE)
     status_code = 400 if errors else 200
     return templates.TemplateResponse(
         "conversion1_how.html",
@@ -589,7 +610,7 @@ async def pellet_bag_status_list(status_column: str, request: Request, bigquery:
         raise HTTPException(status_code=404, detail="Status page not found")
 
     # Load table rows and normalize legacy typo statuses for consistent display.
-    items = bigquery.list_pellet_bags_with_meaningful_status(status_column, limit=500)
+    items = await run_in_threadpool(bigquery.list_pellet_bags_with_meaningful_status, status_column, limit=500)
     normalized_items = [
         {
             **item,
@@ -606,7 +627,7 @@ async def pellet_bag_status_list(status_column: str, request: Request, bigquery:
             "title": "Pellet Bag Status List",
             "status_column": status_column,
             "status_options": get_allowed_status_options(status_column),
-            "assignee_options": bigquery.list_pellet_bag_assignees(default_emails=DEFAULT_ASSIGNEE_EMAILS),
+            "assignee_options": await run_in_threadpool(bigquery.list_pellet_bag_assignees, default_emails=DEFAULT_ASSIGNEE_EMAILS),
             "items": normalized_items,
         },
     )
@@ -618,7 +639,7 @@ async def pellet_bags(request: Request, bigquery: BigQueryService = Depends(get_
     require_permission(request, "pellet_bags.view")
     return templates.TemplateResponse(
         "pellet_bags.html",
-        {"request": request, "title": "Pellet Bags", "compounding_how_codes": bigquery.list_compounding_how_codes()},
+        {"request": request, "title": "Pellet Bags", "compounding_how_codes": await run_in_threadpool(bigquery.list_compounding_how_codes)},
     )
 
 
@@ -626,7 +647,7 @@ async def pellet_bags(request: Request, bigquery: BigQueryService = Depends(get_
 async def ingredient_edit(sku: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> HTMLResponse:
     # Restrict ingredient edits to users with ingredient edit rights.
     require_permission(request, "ingredients.edit")
-    ingredient = bigquery.get_ingredient(sku)
+    ingredient = await run_in_threadpool(bigquery.get_ingredient, sku)
     if not ingredient:
         raise HTTPException(status_code=404, detail="Ingredient not found")
     return templates.TemplateResponse(
@@ -640,7 +661,7 @@ async def sku_detail(sku: str, request: Request, bigquery: BigQueryService = Dep
     # Render a SKU summary page with linked formulation and pellet bag context.
     access = require_permission(request, "ingredients.view")
     # Filter formulation sections entirely for users who may not view dry weights.
-    summary = bigquery.get_sku_summary_filtered(sku, include_formulations=can_view_dry_weights(access))
+    summary = await run_in_threadpool(bigquery.get_sku_summary_filtered, sku, include_formulations=can_view_dry_weights(access))
     if not summary.get("ingredient"):
         raise HTTPException(status_code=404, detail="Ingredient not found")
     return templates.TemplateResponse(
@@ -654,7 +675,7 @@ async def pellet_bag_detail(pellet_bag_code: str, request: Request, bigquery: Bi
     # Render one pellet bag detail page with all known fields and compounding context.
     access = require_permission(request, "pellet_bags.view")
     # Filter embedded formulation percentage payloads before rendering the page for restricted users.
-    detail = bigquery.get_pellet_bag_detail_filtered(pellet_bag_code, include_dry_weights=can_view_dry_weights(access))
+    detail = await run_in_threadpool(bigquery.get_pellet_bag_detail_filtered, pellet_bag_code, include_dry_weights=can_view_dry_weights(access))
     if not detail:
         raise HTTPException(status_code=404, detail="Pellet bag not found")
     return templates.TemplateResponse(
@@ -667,7 +688,7 @@ async def pellet_bag_detail(pellet_bag_code: str, request: Request, bigquery: Bi
 async def compounding_how_detail(processing_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> HTMLResponse:
     # Render one compounding-how detail page and include linked pellet-bag records for contextual drilldown.
     require_permission(request, "compounding_how.view")
-    detail = bigquery.get_compounding_how_detail(processing_code)
+    detail = await run_in_threadpool(bigquery.get_compounding_how_detail, processing_code)
     if not detail:
         raise HTTPException(status_code=404, detail="Compounding how not found")
     return templates.TemplateResponse(
@@ -680,7 +701,7 @@ async def compounding_how_detail(processing_code: str, request: Request, bigquer
 async def batch_selection_detail(base_code: str, request: Request, bigquery: BigQueryService = Depends(get_bigquery)) -> HTMLResponse:
     # Render one batch-selection code detail page with all currently linked location/compounding/pellet records.
     require_permission(request, "batch_selection.view")
-    detail = bigquery.get_batch_selection_detail(base_code)
+    detail = await run_in_threadpool(bigquery.get_batch_selection_detail, base_code)
     if not detail.get("formulation"):
         raise HTTPException(status_code=404, detail="Batch selection code not found")
     return templates.TemplateResponse(
@@ -699,7 +720,7 @@ async def ingredient_msds_download(
 ):
     # Apply the same ingredient page guard to direct MSDS downloads.
     require_permission(request, "ingredients.view")
-    ingredient = bigquery.get_ingredient(sku)
+    ingredient = await run_in_threadpool(bigquery.get_ingredient, sku)
     if not ingredient or not ingredient.get("msds_object_path"):
         raise HTTPException(status_code=404, detail="MSDS not found")
     url = storage.generate_download_url(settings.bucket_msds, ingredient["msds_object_path"], ttl_minutes=10)
@@ -711,7 +732,7 @@ async def user_roles_page(request: Request, bigquery: BigQueryService = Depends(
     # Restrict the admin page to users allowed to manage roles.
     require_permission(request, "admin.user_roles.view")
     # Load all user-role rows for the admin grid and include resolved permissions for clarity.
-    rows = bigquery.list_user_roles()
+    rows = await run_in_threadpool(bigquery.list_user_roles)
     return templates.TemplateResponse(
         "user_roles.html",
         {
@@ -739,7 +760,7 @@ async def user_roles_submit(
     # Re-render helper keeps validation failures user-friendly instead of surfacing an internal server error.
     async def _render_with_error(error_message: str, status_code: int = status.HTTP_422_UNPROCESSABLE_ENTITY) -> HTMLResponse:
         # Reload rows so admins still see current assignments while fixing invalid form input.
-        rows = bigquery.list_user_roles()
+        rows = await run_in_threadpool(bigquery.list_user_roles)
         return templates.TemplateResponse(
             "user_roles.html",
             {
@@ -791,7 +812,8 @@ async def user_roles_submit(
     except ValidationError as exc:
         # Preserve admin UX by returning 422 + inline message when required fields are missing/invalid.
         return await _render_with_error("; ".join(error.get("msg", "Invalid value") for error in exc.errors()))
-    bigquery.create_or_update_user_role(
+    await run_in_threadpool(
+        bigquery.create_or_update_user_role,
         email=parsed_payload.email,
         first_name=parsed_payload.first_name,
         last_name=parsed_payload.last_name,
@@ -752,6 +752,8 @@ function attachBatchLookupForm() {
   let pageSize = DEFAULT_PAGE_SIZE;
   let page = 1;
   let lastTotal = 0;
+  // Remember the seek cursor that fetches each visited page so prev/next avoid deep OFFSET scans.
+  let pageCursors = [null];
 
   // Load paginated batches for current filters and render rows into the table body.
   async function loadBatches(targetPage) {
@@ -767,8 +769,10 @@ function attachBatchLookupForm() {
     }
     // Keep ingredient-batches lookup as a full listing view so users can review both live and archived rows.
     params.set('include_archived', 'true');
+    if (targetPage <= 1) pageCursors = [null];
     params.set('page', String(targetPage));
     params.set('page_size', String(pageSize));
+    if (pageCursors[targetPage - 1]) params.set('cursor', pageCursors[targetPage - 1]);
 
     const response = await fetch(`/api/ingredient_batches?${params.toString()}`);
     const data = await response.json();
@@ -779,6 +783,7 @@ function attachBatchLookupForm() {
     const items = data.data.items || [];
     page = Number(data.data.page || targetPage);
     lastTotal = Number(data.data.total || 0);
+    pageCursors[page] = data.data.next_cursor || null;
     clearElement(output);
 
     if (items.length === 0) {
@@ -938,6 +943,8 @@ function attachSetForm() {
   let pageSize = DEFAULT_PAGE_SIZE;
   let page = 1;
   let lastTotal = 0;
+  // Remember the seek cursor that fetches each visited page so prev/next avoid deep OFFSET scans.
+  let pageCursors = [null];
 
   // Populate the detail panel so users can review full notes and edit metadata for one set.
   async function loadSetDetail(setCode) {
@@ -1009,8 +1016,10 @@ function attachSetForm() {
     if (q) {
       params.set('q', q);
     }
+    if (targetPage <= 1) pageCursors = [null];
     params.set('page', String(targetPage));
     params.set('page_size', String(pageSize));
+    if (pageCursors[targetPage - 1]) params.set('cursor', pageCursors[targetPage - 1]);
 
     const response = await fetch(`/api/sets?${params.toString()}`);
     const data = await response.json();
@@ -1021,6 +1030,7 @@ function attachSetForm() {
     const items = data.data.items || [];
     page = Number(data.data.page || targetPage);
     lastTotal = Number(data.data.total || 0);
+    pageCursors[page] = data.data.next_cursor || null;
     clearElement(output);
 
     if (items.length === 0) {
@@ -1689,6 +1699,8 @@ function attachFormulationsFilterForm() {
   let pageSize = DEFAULT_PAGE_SIZE;
   let page = 1;
   let lastTotal = 0;
+  // Remember the seek cursor that fetches each visited page so prev/next avoid deep OFFSET scans.
+  let pageCursors = [null];
 
   // Fetch formulations with current filters and requested page, then render a formatted summary table.
   async function loadFormulations(targetPage) {
@@ -1708,8 +1720,10 @@ function attachFormulationsFilterForm() {
         }
       }
     });
+    if (targetPage <= 1) pageCursors = [null];
     params.set('page', String(targetPage));
     params.set('page_size', String(pageSize));
+    if (pageCursors[targetPage - 1]) params.set('cursor', pageCursors[targetPage - 1]);
 
     const response = await fetch(`/api/formulations?${params.toString()}`);
     const data = await response.json();
@@ -1720,6 +1734,7 @@ function attachFormulationsFilterForm() {
     const items = data.data.items || [];
     page = Number(data.data.page || targetPage);
     lastTotal = Number(data.data.total || 0);
+    pageCursors[page] = data.data.next_cursor || null;
     renderFormulationsTable(output, items);
     updatePagerControls({ prevButton, nextButton, label: pageLabel, page, total: lastTotal, pageSize });
     const table = output.querySelector('table');
@@ -1804,6 +1819,8 @@ function attachLocationCodePage() {
   let pageSize = DEFAULT_PAGE_SIZE;
   let page = 1;
   let lastTotal = 0;
+  // Remember the seek cursor that fetches each visited page so prev/next avoid deep OFFSET scans.
+  let pageCursors = [null];
 
   // Parse the formulation code from dropdown/manual input and enforce AB AB AC formatting.
   function parseFormulationCode(rawCode) {
@@ -1860,8 +1877,10 @@ function attachLocationCodePage() {
   // Render paginated location code table rows with owner, partner label, and creation date metadata.
   async function loadLocationCodes(targetPage) {
     const params = new URLSearchParams();
+    if (targetPage <= 1) pageCursors = [null];
     params.set('page', String(targetPage));
     params.set('page_size', String(pageSize));
+    if (pageCursors[targetPage - 1]) params.set('cursor', pageCursors[targetPage - 1]);
     if (filterForm) {
       const query = ((new FormData(filterForm).get('q') || '').toString().trim());
       if (query) params.set('q', query);
@@ -1870,6 +1889,7 @@ function attachLocationCodePage() {
     const items = Array.isArray(data.items) ? data.items : [];
     page = Number(data.page || targetPage);
     lastTotal = Number(data.total || 0);
+    pageCursors[page] = data.next_cursor || null;
     clearElement(tableBody);
 
     if (!items.length) {
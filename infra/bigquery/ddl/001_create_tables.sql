@@ -19,7 +19,8 @@ CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.ingredients` (
   msds_filename STRING,
   msds_content_type STRING,
   msds_uploaded_at TIMESTAMP
-);
+)
+CLUSTER BY category_code, trade_name_inci, supplier;
 
 CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.ingredient_batches` (
   sku STRING NOT NULL,
@@ -38,7 +39,8 @@ CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.ingredient_batches` (
   archived BOOL NOT NULL,
   archived_at TIMESTAMP,
   archived_by STRING
-);
+)
+CLUSTER BY sku, ingredient_batch_code;
 
 CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.ingredient_sets` (
   set_code STRING NOT NULL,
@@ -80,7 +82,8 @@ CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.batch_variants` (
   created_at TIMESTAMP NOT NULL,
   created_by STRING,
   notes STRING
-);
+)
+CLUSTER BY set_code, weight_code, batch_variant_code;
 
 CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.batch_variant_items` (
   set_code STRING NOT NULL,
@@ -90,14 +93,31 @@ CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.batch_variant_items` (
   ingredient_batch_code STRING NOT NULL,
   created_at TIMESTAMP NOT NULL,
   created_by STRING
-);
+)
+CLUSTER BY sku, ingredient_batch_code;
+
+-- Roll-up of v_formulations_flat, appended on batch-variant creation so listings skip the per-read aggregation.
+CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.formulations_flat` (
+  set_code STRING NOT NULL,
+  weight_code STRING NOT NULL,
+  batch_variant_code STRING NOT NULL,
+  base_code STRING,
+  created_at TIMESTAMP NOT NULL,
+  created_by STRING,
+  sku_list ARRAY<STRING>,
+  sku_count INT64,
+  batch_items ARRAY<STRUCT<sku STRING, ingredient_batch_code STRING>>,
+  dry_weight_items ARRAY<STRUCT<sku STRING, wt_percent NUMERIC>>
+)
+CLUSTER BY set_code, weight_code, batch_variant_code;
 
 CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.code_counters` (
   counter_name STRING NOT NULL,
   scope STRING NOT NULL,
   next_value INT64 NOT NULL,
   updated_at TIMESTAMP NOT NULL
-);
+)
+CLUSTER BY counter_name, scope;
 
 CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.audit_log` (
   event_id STRING NOT NULL,
@@ -126,4 +146,5 @@ CREATE TABLE IF NOT EXISTS `PROJECT_ID.DATASET_ID.location_codes` (
   location_id STRING NOT NULL,
   created_at TIMESTAMP NOT NULL,
   created_by STRING
-);
+)
+CLUSTER BY location_id;
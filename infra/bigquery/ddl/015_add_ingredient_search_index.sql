@@ -0,0 +1,3 @@
+-- Index searchable ingredient text columns so list filters use token probes instead of full LIKE scans.
+CREATE SEARCH INDEX IF NOT EXISTS ingredients_search_idx
+ON `PROJECT_ID.DATASET_ID.ingredients` (sku, trade_name_inci, supplier);
@@ -0,0 +1,3 @@
+-- Index location ID tokens so the location-code filter probes the index instead of scanning every ID.
+CREATE SEARCH INDEX IF NOT EXISTS location_codes_search_idx
+ON `PROJECT_ID.DATASET_ID.location_codes` (location_id);
@@ -0,0 +1,4 @@
+-- Index whole SKU values in the formulation roll-up so the SKU filter probes the index instead of scanning every list.
+CREATE SEARCH INDEX IF NOT EXISTS formulations_flat_sku_idx
+ON `PROJECT_ID.DATASET_ID.formulations_flat` (sku_list)
+OPTIONS (analyzer = 'NO_OP_ANALYZER');
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock
+
+from app.services import bigquery_service
+from app.services.bigquery_service import BigQueryService
+
+
+def _build_service() -> BigQueryService:
+    # Build a service instance without creating a real BigQuery client.
+    service = BigQueryService.__new__(BigQueryService)
+    service.project_id = "project"
+    service.dataset_id = "dataset"
+    # Stub query execution so each submitted statement is captured instead of sent to BigQuery.
+    fake_job = MagicMock()
+    fake_job.result.return_value = []
+    service._run = MagicMock(return_value=fake_job)
+    return service
+
+
+class BatchedInsertTests(unittest.TestCase):
+    def test_insert_set_writes_all_items_in_one_statement(self) -> None:
+        # Confirm N set items produce one parent insert plus one multi-row child insert.
+        service = _build_service()
+
+        service.insert_set("AB", "hash", ["A_1", "B_2", "C_3"], "tester@example.com", None, None)
+
+        self.assertEqual(service._run.call_count, 2)
+        items_query, items_params = service._run.call_args_list[1].args
+        self.assertIn("ingredient_set_items", items_query)
+        self.assertEqual(items_query.count("(@set_code_"), 3)
+        self.assertEqual([param.value for param in items_params if param.name.startswith("sku_")], ["A_1", "B_2", "C_3"])
+
+    def test_insert_batch_variant_chunks_large_item_lists(self) -> None:
+        # Confirm very large variants are split so one statement never exceeds the configured chunk size.
+        service = _build_service()
+        items = [(f"SKU_{index}", f"BATCH_{index}") for index in range(bigquery_service.INSERT_ROWS_CHUNK_SIZE + 1)]
+
+        service.insert_batch_variant("AB", "AC", "AD", "hash", items, "tester@example.com")
+
+        # One parent insert plus two child chunks, then the formulation roll-up merge.
+        self.assertEqual(service._run.call_count, 4)
+        rollup_query = service._run.call_args.args[0]
+        self.assertIn("MERGE `project.dataset.formulations_flat` t", rollup_query)
+        # Matching on the formulation key keeps concurrent creators and startup backfills from duplicating the row.
+        self.assertIn("ON t.set_code = s.set_code AND t.weight_code = s.weight_code AND t.batch_variant_code = s.batch_variant_code", rollup_query)
+        self.assertIn("WHEN NOT MATCHED THEN INSERT", rollup_query)
+
+    def test_insert_weight_variant_skips_child_insert_without_items(self) -> None:
+        # Confirm an empty item list never issues an invalid INSERT with no VALUES rows.
+        service = _build_service()
+
+        service.insert_weight_variant("AB", "AC", "hash", [], "tester@example.com")
+
+        self.assertEqual(service._run.call_count, 1)
+
+    def test_parent_and_child_inserts_are_started_before_awaiting(self) -> None:
+        # Confirm the parent INSERT and child chunk INSERT jobs overlap instead of running back to back.
+        service = _build_service()
+        events = []
+
+        def fake_run(query, params):
+            events.append("start")
+            job = MagicMock()
+            job.result.side_effect = lambda: events.append("wait")
+            return job
+
+        service._run = MagicMock(side_effect=fake_run)
+
+        service.insert_weight_variant("AB", "AC", "hash", [("A_1", 50.0), ("B_2", 50.0)], "tester@example.com")
+
+        self.assertEqual(events, ["start", "start", "wait", "wait"])
+
+
+    def test_insert_location_codes_bulk_merges_in_one_statement(self) -> None:
+        # Confirm many generated location IDs are merged by one job that skips IDs already stored.
+        service = _build_service()
+        rows = [
+            {
+                "set_code": "AB",
+                "weight_code": "AC",
+                "batch_variant_code": "AD",
+                "partner_code": "AA",
+                "production_date": "240102",
+                "location_id": f"AB AC AD AA 240102 {index % 2}",
+                "created_by": "tester@example.com",
+            }
+            for index in range(3)
+        ]
+
+        service.insert_location_codes_bulk(rows)
+
+        service._run.assert_called_once()
+        query, params = service._run.call_args.args
+        self.assertIn("MERGE `project.dataset.location_codes` t", query)
+        self.assertIn("ON t.location_id = s.location_id WHEN NOT MATCHED THEN INSERT", query)
+        # Repeated IDs inside one import are collapsed before they reach the MERGE source.
+        self.assertEqual(params[0].values, ["AB AC AD AA 240102 0", "AB AC AD AA 240102 1"])
+
+    def test_insert_location_code_reports_existing_id(self) -> None:
+        # Confirm a resubmitted location ID inserts nothing and is reported back so the API can answer 409.
+        service = _build_service()
+        service._run.return_value.num_dml_affected_rows = 0
+
+        inserted = service.insert_location_code("AB", "AC", "AD", "AA", "240102", "AB AC AD AA 240102", None)
+
+        self.assertFalse(inserted)
+        self.assertIn("ON t.location_id = s.location_id", service._run.call_args.args[0])
+
+
+    def test_insert_batch_binds_typed_columns_with_archive_default(self) -> None:
+        # Confirm the prebuilt INSERT names every batch column and unset archive flags bind FALSE.
+        service = _build_service()
+
+        service.insert_batch({"sku": "A_1", "ingredient_batch_code": "AB", "quantity_value": 2.5, "is_active": True})
+
+        query, params = service._run.call_args.args
+        self.assertIs(query, service._sql.insert_batch)
+        self.assertEqual([param.name for param in params], list(bigquery_service.BATCH_COLUMNS))
+        by_name = {param.name: param for param in params}
+        self.assertEqual((by_name["quantity_value"].type_, by_name["archived"].value), ("FLOAT64", False))
+        self.assertIsNone(by_name["notes"].value)
+
+    def test_insert_batches_bulk_writes_one_statement(self) -> None:
+        # Confirm several batches share one multi-row INSERT with per-row typed parameters.
+        service = _build_service()
+
+        service.insert_batches_bulk([
+            {"sku": "A_1", "ingredient_batch_code": "AB", "is_active": True},
+            {"sku": "B_2", "ingredient_batch_code": "AC", "is_active": True, "archived": True},
+        ])
+
+        query, params = service._run.call_args.args
+        self.assertEqual(service._run.call_count, 1)
+        self.assertIn("INSERT `project.dataset.ingredient_batches`", query)
+        by_name = {param.name: param.value for param in params}
+        self.assertEqual((by_name["sku_1"], by_name["archived_0"], by_name["archived_1"]), ("B_2", False, True))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock
+
+from app.services.bigquery_service import BigQueryService
+
+
+class CodeCounterTests(unittest.TestCase):
+    def test_allocate_counter_uses_one_scripted_merge_job(self) -> None:
+        # Build a service instance without creating a real BigQuery client.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "project"
+        service.dataset_id = "dataset"
+        # Return the value read back by the script's final SELECT through the inline-rows fast path.
+        service._run_and_fetch = MagicMock(return_value=[{"allocated": 7}])
+
+        allocated = service.allocate_counter("set_code", "", 1)
+
+        self.assertEqual(allocated, 7)
+        service._run_and_fetch.assert_called_once()
+        query = service._run_and_fetch.call_args.args[0]
+        self.assertIn("BEGIN TRANSACTION", query)
+        self.assertIn("MERGE `project.dataset.code_counters`", query)
+
+    def test_allocate_counter_range_reserves_block_in_one_job(self) -> None:
+        # Confirm a multi-value range is reserved by the same MERGE instead of a follow-up compare-and-set UPDATE.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "project"
+        service.dataset_id = "dataset"
+        service._run = MagicMock()
+        service._run_and_fetch = MagicMock(return_value=[{"allocated": 3}])
+
+        start = service.allocate_counter_range("pellet_bag_sequence", "pellet_bag:global", 0, 4)
+
+        self.assertEqual(start, 3)
+        service._run.assert_not_called()
+        params = {param.name: param.value for param in service._run_and_fetch.call_args.args[1]}
+        self.assertEqual(params["count"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -97,6 +97,7 @@ class Conversion1ProductsTests(unittest.TestCase):
             return _FakeResult([])
 
         service._run = fake_run
+        service._run_and_fetch = lambda query, params: fake_run(query, params).result()
 
         service.list_conversion1_products(mixing_how="EV AB", mixed_product="0042", page=1, page_size=50)
 
@@ -107,5 +108,22 @@ class Conversion1ProductsTests(unittest.TestCase):
         self.assertEqual(parameter_map["mixed_product"], "0042")
 
 
+    def test_new_conversion1_context_is_merged_and_read_back_in_one_job(self) -> None:
+        # Confirm a first-time context code costs one lookup plus one insert-if-absent script, not insert plus re-read.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "project"
+        service.dataset_id = "dataset"
+        service._run = MagicMock()
+        service._run_and_fetch = MagicMock(side_effect=[[], [{"context_code": "EV AB 250101", "partner_code": "AB"}]])
+
+        context = service.create_or_get_conversion1_context("EV", "AB", "M1", "250101", "tester@example.com")
+
+        service._run.assert_not_called()
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+        script = service._run_and_fetch.call_args.args[0]
+        self.assertIn("WHEN NOT MATCHED THEN", script)
+        self.assertIn("; SELECT context_code", script)
+        self.assertEqual(context["context_code"], "EV AB 250101")
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pyarrow
+
+from app.services import bigquery_service
+from app.services.bigquery_service import BigQueryService
+
+
+def _build_service() -> BigQueryService:
+    # Build a service instance without creating a real BigQuery client.
+    service = BigQueryService.__new__(BigQueryService)
+    service.project_id = "project"
+    service.dataset_id = "dataset"
+    # Stub query execution so the generated SQL can be inspected.
+    fake_job = MagicMock()
+    fake_job.result.return_value = []
+    service._run = MagicMock(return_value=fake_job)
+    service._run_and_fetch = MagicMock(return_value=[])
+    return service
+
+
+class IngredientQueryTests(unittest.TestCase):
+    def test_duplicate_lookup_projects_match_columns(self) -> None:
+        # Confirm duplicate checks read only the identity columns instead of the whole row.
+        service = _build_service()
+
+        service.find_ingredient_duplicate(1, "Name", "Supplier", None, "Powder", 25, "KG")
+
+        query = service._run_and_fetch.call_args.args[0]
+        self.assertNotIn("SELECT *", query)
+        self.assertIn("SELECT sku, category_code, seq", query)
+        self.assertIn("LIMIT 1", query)
+        # Point lookups ask the fast path for one inline row only.
+        self.assertEqual(service._run_and_fetch.call_args.kwargs, {"max_results": 1})
+
+    def test_next_compounding_suffix_aggregates_with_max(self) -> None:
+        # Confirm the latest suffix is read with one MAX() aggregate instead of sorting every row.
+        service = _build_service()
+        service._run_and_fetch.return_value = [{"process_code_suffix": None}]
+
+        suffix = service.get_next_compounding_process_suffix()
+
+        query = service._run_and_fetch.call_args.args[0]
+        self.assertIn("MAX(process_code_suffix)", query)
+        self.assertNotIn("ORDER BY", query)
+        self.assertIsNone(suffix)
+
+    def test_compounding_existence_checks_share_prebuilt_sql(self) -> None:
+        # Confirm both processing-code checks submit the same per-instance SQL text instead of rebuilding it per call.
+        service = _build_service()
+
+        service.processing_code_exists("AB")
+        service.compounding_how_exists("AC")
+
+        (first_query, first_params), (second_query, second_params) = (call.args for call in service._run_and_fetch.call_args_list)
+        self.assertIs(first_query, service._sql.compounding_how_exists)
+        self.assertIs(second_query, first_query)
+        self.assertEqual([(param.name, param.value) for param in first_params + second_params], [("processing_code", "AB"), ("processing_code", "AC")])
+
+    def test_formulation_exists_falls_back_to_view_on_rollup_miss(self) -> None:
+        # Confirm a formulation missing from the roll-up (failed merge) is still found through the view.
+        service = _build_service()
+        service._run_and_fetch.side_effect = [[], [{"f0_": 1}]]
+
+        found = service.formulation_exists("AB", "AC", "AD")
+
+        rollup_query, view_query = (call.args[0] for call in service._run_and_fetch.call_args_list)
+        self.assertIn("`project.dataset.formulations_flat`", rollup_query)
+        self.assertIn("`project.dataset.v_formulations_flat`", view_query)
+        self.assertTrue(found)
+
+    def test_list_ingredients_uses_search_index_by_default(self) -> None:
+        # Confirm text search goes through SEARCH() with the raw token rather than a wildcard LIKE.
+        service = _build_service()
+
+        service.list_ingredients({"q": " Glycerin "})
+
+        query, params = service._run.call_args.args
+        self.assertIn("SEARCH(trade_name_inci, @q)", query)
+        self.assertNotIn("LIKE", query)
+        self.assertEqual(params[0].value, "Glycerin")
+
+    def test_list_ingredients_leading_star_uses_contains_substr(self) -> None:
+        # Confirm an explicit partial-match request bypasses SEARCH() and binds the remaining term for CONTAINS_SUBSTR.
+        service = _build_service()
+
+        service.list_ingredients({"q": "*Glyc"})
+
+        query, params = service._run.call_args.args
+        self.assertIn("CONTAINS_SUBSTR(trade_name_inci, @q)", query)
+        self.assertNotIn("SEARCH(", query)
+        self.assertNotIn("LIKE", query)
+        self.assertEqual(params[0].value, "Glyc")
+
+    def test_list_ingredients_reuses_sql_text_per_filter_combination(self) -> None:
+        # Confirm the same filter set yields the identical SQL object regardless of key order or values.
+        service = _build_service()
+
+        service.list_ingredients({"format": "Powder", "category_code": 1})
+        first_query = service._run.call_args.args[0]
+        service.list_ingredients({"category_code": 2, "format": "Liquid"})
+
+        query, params = service._run.call_args.args
+        self.assertIs(query, first_query)
+        self.assertLess(query.index("category_code = @category_code"), query.index("format = @format"))
+        self.assertEqual([param.name for param in params], ["category_code", "format"])
+
+    def test_list_ingredients_binds_boolean_filters_as_bool(self) -> None:
+        # Confirm is_active binds as BOOL rather than INT64, which BigQuery would reject against the BOOL column.
+        service = _build_service()
+
+        service.list_ingredients({"category_code": 1, "is_active": True})
+
+        params = service._run.call_args.args[1]
+        self.assertEqual([(param.name, param.type_) for param in params], [("category_code", "INT64"), ("is_active", "BOOL")])
+
+    def test_list_ingredients_materializes_rows_through_arrow(self) -> None:
+        # Confirm list results are decoded from one Arrow table, keeping repeated columns as Python lists.
+        service = _build_service()
+        rows = MagicMock()
+        rows.total_rows = 2
+        rows.to_arrow.return_value = pyarrow.table({"sku": ["A_1", "B_2"], "tags": [["x"], []]})
+        service._run.return_value.result.return_value = rows
+
+        items = service.list_ingredients({})
+
+        # Small results stay on REST so no Storage Read session is opened.
+        rows.to_arrow.assert_called_once_with(create_bqstorage_client=False)
+        self.assertEqual(items, [{"sku": "A_1", "tags": ["x"]}, {"sku": "B_2", "tags": []}])
+
+    def test_large_list_results_use_shared_storage_read_client(self) -> None:
+        # Confirm results above the threshold download through the process-wide Storage Read client.
+        service = _build_service()
+        rows = MagicMock()
+        rows.total_rows = bigquery_service.STORAGE_READ_MIN_ROWS + 1
+        rows.to_arrow.return_value = pyarrow.table({"sku": ["A_1"]})
+        service._run.return_value.result.return_value = rows
+
+        with patch.object(bigquery_service, "_get_read_client", return_value="read-client"):
+            service.list_ingredients({})
+
+        rows.to_arrow.assert_called_once_with(bqstorage_client="read-client")
+
+    def test_formulations_for_many_batches_run_as_one_job(self) -> None:
+        # Confirm several (sku, batch) pairs are matched by offset in a single query rather than one per pair.
+        service = _build_service()
+
+        service.list_formulations_by_batches([("B_2", "AC"), ("A_1", "AB"), ("A_1", "AB")])
+
+        query, params = service._run.call_args.args
+        self.assertEqual(service._run.call_count, 1)
+        self.assertIn("ON i.sku = pair_sku AND i.ingredient_batch_code = @batch_codes[OFFSET(pos)]", query)
+        # The join condition already restricts SKUs, so no redundant IN UNNEST filter is repeated.
+        self.assertNotIn("IN UNNEST(@skus)", query)
+        self.assertEqual([param.values for param in params], [["A_1", "B_2"], ["AB", "AC"]])
+
+    def test_formulation_sku_filter_matches_whole_elements(self) -> None:
+        # Confirm the SKU filter searches sku_list elements exactly instead of substring-matching its JSON text.
+        service = _build_service()
+
+        list(service.iter_formulations({"sku": " A_1 "}))
+
+        query, params = service._run.call_args.args
+        self.assertIn("SEARCH(sku_list, @sku, analyzer => 'NO_OP_ANALYZER')", query)
+        self.assertNotIn("TO_JSON_STRING", query)
+        self.assertEqual(params[0].value, "A_1")
+
+    def test_list_formulations_returns_every_row_without_limit(self) -> None:
+        # Confirm the full-list wrapper neither truncates at a fixed limit nor runs a count or offset.
+        service = _build_service()
+
+        service.list_formulations({"sku": "A_1"})
+
+        query, params = service._run.call_args.args
+        self.assertNotIn("LIMIT", query)
+        self.assertNotIn("OFFSET", query)
+        self.assertNotIn("COUNT(", query)
+        self.assertEqual([param.name for param in params], ["sku"])
+
+    def test_iter_formulations_yields_each_arrow_batch_lazily(self) -> None:
+        # Confirm formulations stream per record batch rather than materializing one list first.
+        service = _build_service()
+        rows = MagicMock()
+        rows.total_rows = 3
+        rows.to_arrow_iterable.return_value = iter(
+            [pyarrow.RecordBatch.from_pylist([{"set_code": "AB"}, {"set_code": "AC"}]), pyarrow.RecordBatch.from_pylist([{"set_code": "AD"}])]
+        )
+        service._run.return_value.result.return_value = rows
+
+        stream = service.iter_formulations({"sku": "A_1"})
+
+        self.assertEqual(next(stream), {"set_code": "AB"})
+        self.assertEqual([row["set_code"] for row in stream], ["AC", "AD"])
+        rows.to_arrow_iterable.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
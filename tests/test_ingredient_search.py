@@ -30,13 +30,13 @@ class IngredientSearchTests(unittest.TestCase):
         # Inject fake query runner so no external BigQuery calls are made.
         service._run = fake_run  # type: ignore[method-assign]
 
-        # Execute ingredient search with lower case input.
-        service.list_ingredients({"q": "agar"})
+        # Execute the substring fallback search with mixed case input.
+        service.list_ingredients({"q": "Agar"}, use_search_index=False)
 
-        # Assert SQL uses lower-cased comparisons for case-insensitive matching.
-        self.assertIn("LOWER(sku)", str(captured["query"]))
-        # Assert bound query parameter is normalised to lower case wildcard search.
-        self.assertEqual(captured["params"][0].value, "%agar%")
+        # Assert SQL uses CONTAINS_SUBSTR, which matches case-insensitively without LOWER() on every row.
+        self.assertIn("CONTAINS_SUBSTR(sku, @q)", str(captured["query"]))
+        # Assert the bound term is passed through as typed rather than wrapped in wildcards.
+        self.assertEqual(captured["params"][0].value, "Agar")
 
     def test_ingredients_are_sorted_by_sequence_not_sku(self) -> None:
         # Create a lightweight service instance without initialising a real BigQuery client.
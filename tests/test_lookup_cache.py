@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from cachetools import TTLCache
+
+from app.services.bigquery_service import BigQueryService
+
+
+def _build_cached_service(rows) -> BigQueryService:
+    # Build a service instance without a real client but with the lookup cache enabled.
+    service = BigQueryService.__new__(BigQueryService)
+    service.project_id = "project"
+    service.dataset_id = "dataset"
+    service._lookup_cache = TTLCache(maxsize=16, ttl=60)
+    service._lookup_lock = threading.RLock()
+    fake_job = MagicMock()
+    fake_job.result.return_value = rows
+    service._run = MagicMock(return_value=fake_job)
+    # Point reads take the inline-rows fast path, so they are counted separately from DML jobs.
+    service._run_and_fetch = MagicMock(return_value=rows)
+    return service
+
+
+class LookupCacheTests(unittest.TestCase):
+    def test_repeat_get_ingredient_is_served_from_cache_until_invalidated(self) -> None:
+        # Confirm the second read skips BigQuery and an MSDS update forces a fresh read.
+        service = _build_cached_service([{"sku": "A_1", "msds_filename": None}])
+
+        first = service.get_ingredient("A_1")
+        second = service.get_ingredient(sku="A_1")
+        self.assertEqual(first, second)
+        self.assertEqual(service._run_and_fetch.call_count, 1)
+
+        service.update_msds("A_1", "path", "file.pdf", "application/pdf")
+        service.get_ingredient("A_1")
+        # One cached read, one UPDATE, one fresh read after invalidation.
+        self.assertEqual(service._run.call_count, 1)
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+
+    def test_mutating_a_cached_listing_row_leaves_the_cache_intact(self) -> None:
+        # Confirm rows inside a cached list are copied too, so one request's edits never leak into the next.
+        service = _build_cached_service([{"partner_code": "AB", "partner_name": "Partner"}])
+
+        first = service.list_location_partners()
+        first[0]["partner_name"] = "Edited"
+        first.append({"partner_code": "ZZ"})
+        second = service.list_location_partners()
+
+        self.assertEqual(second, [{"partner_code": "AB", "partner_name": "Partner"}])
+        self.assertEqual(service._run_and_fetch.call_count, 1)
+
+    def test_missing_rows_are_not_cached(self) -> None:
+        # Confirm a miss is re-queried so records created after the miss are found.
+        service = _build_cached_service([])
+
+        self.assertIsNone(service.get_set_by_hash("hash"))
+        self.assertIsNone(service.get_set_by_hash("hash"))
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+
+    def test_partner_dropdown_is_cached_until_a_partner_is_added(self) -> None:
+        # Confirm repeat dropdown renders skip BigQuery and a new partner forces a fresh listing.
+        service = _build_cached_service([{"partner_code": "AB"}])
+
+        service.list_location_partners()
+        service.list_location_partners()
+        self.assertEqual(service._run_and_fetch.call_count, 1)
+
+        service._run.return_value.num_dml_affected_rows = 1
+        self.assertTrue(service.insert_location_partner("AC", "Partner", "Machine", "tester@example.com"))
+        service.list_location_partners()
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+        # The insert guards against an existing code in the same statement.
+        self.assertIn("WHEN NOT MATCHED THEN INSERT", service._run.call_args.args[0])
+
+    def test_formulation_code_dropdown_is_cached_until_a_variant_is_added(self) -> None:
+        # Confirm the location-code form's formulation options are reused until a new batch variant lands.
+        service = _build_cached_service([{"set_code": "AB", "weight_code": "AC", "batch_variant_code": "AD"}])
+
+        service.list_distinct_formulation_codes()
+        service.list_distinct_formulation_codes()
+        self.assertEqual(service._run.call_count, 1)
+
+        service.insert_batch_variant("AB", "AC", "AE", "hash", [("A_1", "AB")], "tester@example.com")
+        calls_after_insert = service._run.call_count
+        service.list_distinct_formulation_codes()
+        self.assertEqual(service._run.call_count, calls_after_insert + 1)
+
+    def test_compounding_code_dropdown_is_cached_until_a_code_is_created(self) -> None:
+        # Confirm the pellet-bag form's processing codes are reused until a new compounding how is saved.
+        service = _build_cached_service([{"processing_code": "AB AC AD AE 1"}])
+
+        self.assertEqual(service.list_compounding_how_codes(), ["AB AC AD AE 1"])
+        service.list_compounding_how_codes()
+        self.assertEqual(service._run_and_fetch.call_count, 1)
+
+        service.create_compounding_how("AB AC AD AE 2", "AB AC AD AE", "2", "N/A", None, None, None, "tester@example.com")
+        service.list_compounding_how_codes()
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+
+    def test_duplicate_checks_are_cached_per_match_key(self) -> None:
+        # Confirm repeated duplicate checks for the same ingredient identity reuse the found row.
+        service = _build_cached_service([{"sku": "1_1_25", "seq": 1}])
+
+        service.find_ingredient_duplicate(1, "Name", "Supplier", None, "Powder", 25, "KG")
+        service.find_ingredient_duplicate(1, "Name", "Supplier", None, "Powder", 25, "KG")
+        service.find_ingredient_duplicate(1, "Name", "Supplier", None, "Powder", 50, "KG")
+
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+
+    def test_bulk_ingredient_lookup_queries_only_uncached_skus(self) -> None:
+        # Confirm one IN UNNEST query resolves the misses and warms single-row lookups.
+        service = _build_cached_service([{"sku": "A_1"}, {"sku": "B_2"}])
+
+        rows = service.get_ingredients_bulk(["B_2", "A_1", "A_1"])
+        service.get_ingredient("A_1")
+
+        self.assertEqual(set(rows), {"A_1", "B_2"})
+        self.assertEqual(service._run_and_fetch.call_count, 1)
+        self.assertEqual(service._run_and_fetch.call_args.args[1][0].values, ["A_1", "B_2"])
+
+    def test_bulk_batch_lookup_matches_exact_pairs(self) -> None:
+        # Confirm cross-pair rows returned by the two IN filters are discarded.
+        service = _build_cached_service(
+            [
+                {"sku": "A_1", "ingredient_batch_code": "B1"},
+                {"sku": "A_1", "ingredient_batch_code": "B2"},
+            ]
+        )
+
+        rows = service.get_batches_bulk([("A_1", "B1"), ("C_3", "B2")])
+
+        self.assertEqual(list(rows), [("A_1", "B1")])
+
+    def test_bulk_msds_update_runs_one_job_and_invalidates_each_sku(self) -> None:
+        # Confirm N MSDS updates collapse into one UPDATE and every touched SKU is re-read afterwards.
+        service = _build_cached_service([{"sku": "A_1"}])
+        service.get_ingredient("A_1")
+
+        service.update_msds_bulk(
+            [
+                {"sku": "A_1", "object_path": "old", "filename": "a.pdf", "content_type": "application/pdf"},
+                {"sku": "B_2", "object_path": "b", "filename": "b.pdf", "content_type": "application/pdf"},
+                {"sku": "A_1", "object_path": "new", "filename": "a.pdf", "content_type": "application/pdf"},
+            ]
+        )
+        service.get_ingredient("A_1")
+
+        # One cached read, one bulk UPDATE, one fresh read after invalidation.
+        self.assertEqual(service._run.call_count, 1)
+        self.assertEqual(service._run_and_fetch.call_count, 2)
+        update_params = {param.name: param.values for param in service._run.call_args.args[1]}
+        self.assertEqual(update_params["skus"], ["A_1", "B_2"])
+        self.assertEqual(update_params["object_paths"], ["new", "b"])
+        self.assertEqual(update_params["updated_bys"], ["", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()
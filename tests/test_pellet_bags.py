@@ -107,23 +107,36 @@ class PelletBagTests(unittest.TestCase):
             return _FakeResult(compounding_row)
 
         service._run = fake_run
+        service._run_and_fetch = lambda query, params: fake_run(query, params).result()
         service.list_formulations_for_pellet_bag = MagicMock(return_value=[{"set_code": "AB"}])
 
         detail = service.get_pellet_bag_detail("AB")
 
         self.assertEqual(detail["formulations"], [{"set_code": "AB"}])
 
+    def test_restricted_pellet_formulations_omit_dry_weights_in_sql(self) -> None:
+        # Ensure restricted callers never select dry-weight percentages and the listing names its columns explicitly.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "test-project"
+        service.dataset_id = "test_dataset"
+        job = MagicMock()
+        job.result.return_value = []
+        service._run = MagicMock(return_value=job)
+
+        service.list_formulations_for_pellet_bag("AB", include_dry_weights=False)
+
+        query = service._run.call_args.args[0]
+        self.assertNotIn("f.*", query)
+        self.assertIn("f.batch_items", query)
+        self.assertNotIn("dry_weight_items", query)
+
     def test_list_compounding_how_codes_returns_only_codes(self) -> None:
         # Ensure compounding dropdown metadata uses processing codes only and keeps ordering from query results.
         service = BigQueryService.__new__(BigQueryService)
         service.project_id = "test-project"
         service.dataset_id = "test_dataset"
 
-        class _FakeResult:
-            def result(self):
-                return [{"processing_code": "ZZ"}, {"processing_code": "AA"}]
-
-        service._run = MagicMock(return_value=_FakeResult())
+        service._run_and_fetch = MagicMock(return_value=[{"processing_code": "ZZ"}, {"processing_code": "AA"}])
 
         codes = service.list_compounding_how_codes()
 
@@ -147,7 +160,7 @@ class PelletBagTests(unittest.TestCase):
 
         def fake_run(query, params):
             captured_queries.append(query)
-            if "FROM `test-project.test_dataset.v_formulations_flat`" in query and "SELECT set_code" in query:
+            if "FROM `test-project.test_dataset.formulations_flat`" in query and "SELECT set_code" in query:
                 return _FakeResult([])
             return _FakeResult([])
 
@@ -157,6 +170,26 @@ class PelletBagTests(unittest.TestCase):
 
         self.assertTrue(any("UNNEST(f.sku_list)" in query for query in captured_queries))
 
+    def test_get_sku_summary_submits_listing_jobs_before_waiting(self) -> None:
+        # Ensure the formulation and pellet listings run alongside the ingredient lookup instead of back to back.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "test-project"
+        service.dataset_id = "test_dataset"
+        events = []
+        service.get_ingredient = MagicMock(side_effect=lambda sku: events.append("ingredient"))
+
+        def fake_run(query, params):
+            events.append("submit")
+            job = MagicMock()
+            job.result.side_effect = lambda: events.append("wait") or []
+            return job
+
+        service._run = fake_run
+
+        service.get_sku_summary("ABC_001_25KG")
+
+        self.assertEqual(events, ["submit", "submit", "ingredient", "wait", "wait"])
+
     def test_status_option_normalization_exposes_received(self) -> None:
         # Ensure status list pages render canonical Received labels even when legacy source options include Recieved.
         options = get_allowed_status_options("long_moisture_status")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import unittest
 from types import SimpleNamespace
 from unittest.mock import MagicMock
@@ -170,6 +171,27 @@ class UserRolesSubmitTests(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("Batch Selection detail", response.text)
 
+    def test_page_queries_run_off_the_event_loop_thread(self) -> None:
+        # Confirm async page routes hand blocking BigQuery calls to worker threads instead of stalling the loop.
+        bigquery = MagicMock()
+        calls = []
+
+        def fake_detail(base_code):
+            # Worker threads have no running loop; the loop thread would return one here.
+            try:
+                asyncio.get_running_loop()
+                calls.append("event-loop")
+            except RuntimeError:
+                calls.append("worker")
+            return {"formulation": None}
+
+        bigquery.get_batch_selection_detail.side_effect = fake_detail
+        client = self._build_client(bigquery)
+
+        response = client.get("/batch_selection/GE%20AX%20AB")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(calls, ["worker"])
 
 if __name__ == "__main__":
     unittest.main()
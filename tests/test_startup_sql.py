@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services import bigquery_service
+from app.services.bigquery_service import BigQueryService, _schedule_statements, _split_sql_statements
+
+
+class StartupSqlScheduleTests(unittest.TestCase):
+    def test_independent_tables_share_a_layer_after_the_schema(self) -> None:
+        # Confirm unrelated CREATE TABLE statements run together once the dataset exists.
+        statements = [
+            "CREATE SCHEMA IF NOT EXISTS `p.d`",
+            "CREATE TABLE IF NOT EXISTS `p.d.a` (x INT64)",
+            "CREATE TABLE IF NOT EXISTS `p.d.b` (x INT64)",
+        ]
+
+        layers = _schedule_statements(statements)
+
+        self.assertEqual(layers, [[statements[0]], statements[1:]])
+
+    def test_same_table_and_view_dependencies_stay_ordered(self) -> None:
+        # Confirm ALTERs follow their CREATE and views follow every table and view they read.
+        statements = [
+            "CREATE TABLE IF NOT EXISTS `p.d.a` (x INT64)",
+            "ALTER TABLE `p.d.a` ADD COLUMN IF NOT EXISTS y INT64",
+            "CREATE OR REPLACE VIEW `p.d.v_a` AS SELECT * FROM `p.d.a`",
+            "CREATE OR REPLACE VIEW `p.d.v_flat` AS SELECT * FROM `p.d.v_a`",
+        ]
+
+        layers = _schedule_statements(statements)
+
+        self.assertEqual(layers, [[statement] for statement in statements])
+
+    def test_every_failure_in_a_layer_is_logged_before_raising(self) -> None:
+        # Confirm a failing layer reports all broken statements and stops before the next layer runs.
+        service = BigQueryService.__new__(BigQueryService)
+        submitted = []
+
+        def fake_run(statement, params):
+            submitted.append(statement)
+            job = MagicMock()
+            job.result.side_effect = RuntimeError(statement) if "broken" in statement else None
+            return job
+
+        service._run = fake_run
+        statements = [
+            "CREATE TABLE IF NOT EXISTS `p.d.broken_a` (x INT64)",
+            "CREATE TABLE IF NOT EXISTS `p.d.broken_b` (x INT64)",
+            "ALTER TABLE `p.d.broken_a` ADD COLUMN IF NOT EXISTS y INT64",
+        ]
+
+        with self.assertLogs(bigquery_service.LOGGER, level="ERROR") as logs, self.assertRaises(RuntimeError):
+            service._run_statements_concurrently(statements)
+
+        self.assertEqual(len(logs.records), 2)
+        self.assertNotIn(statements[2], submitted)
+
+
+class FormulationBackfillTests(unittest.TestCase):
+    def test_backfill_merges_only_when_rollup_is_behind(self) -> None:
+        # Confirm cold starts gate the full view MERGE behind cheap row counts instead of always evaluating the view.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "p"
+        service.dataset_id = "d"
+
+        script = service._sql.backfill_formulations
+
+        self.assertTrue(script.startswith("IF (SELECT COUNT(1) FROM `p.d.batch_variants`) > (SELECT COUNT(1) FROM `p.d.formulations_flat`) THEN"))
+        self.assertIn("MERGE `p.d.formulations_flat` t", script)
+        self.assertTrue(script.endswith("END IF"))
+
+
+class StartupSqlSplitTests(unittest.TestCase):
+    def test_semicolons_in_literals_comments_and_scripts_do_not_split(self) -> None:
+        # Confirm only top-level semicolons end a statement, so one BEGIN ... END script runs as one job.
+        sql = (
+            "-- seed rows; keep idempotent\n"
+            "INSERT `p.d.a` (x) VALUES ('a;b');\n"
+            "BEGIN\n"
+            "  IF NOT EXISTS (SELECT 1 FROM `p.d.a`) THEN SELECT 1; END IF;\n"
+            "  SELECT CASE WHEN TRUE THEN 'x' END;\n"
+            "END;\n"
+        )
+
+        statements = _split_sql_statements(sql)
+
+        self.assertEqual(len(statements), 2)
+        self.assertTrue(statements[0].endswith("VALUES ('a;b')"))
+        self.assertTrue(statements[1].startswith("BEGIN") and statements[1].endswith("END"))
+
+
+class QueryLocationTests(unittest.TestCase):
+    def test_unconfigured_location_is_read_from_the_dataset_once(self) -> None:
+        # Confirm the dataset's real location is looked up once and reused by every job.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "project"
+        service.dataset_id = "dataset"
+        service.bq_location = None
+        service.client = MagicMock()
+        service.client.get_dataset.return_value.location = "asia-northeast1"
+
+        with patch.dict("os.environ", {"BQ_LOCATION": "", "REGION": ""}):
+            service._run("SELECT 1", [])
+            service._run("SELECT 2", [])
+
+        service.client.get_dataset.assert_called_once_with("project.dataset")
+        self.assertEqual(service.client.query.call_args.kwargs["location"], "asia-northeast1")
+        # Every job also carries the per-query billing cap.
+        self.assertEqual(
+            service.client.query.call_args.kwargs["job_config"].maximum_bytes_billed,
+            bigquery_service.QUERY_MAX_BYTES_BILLED,
+        )
+        # Parameterless jobs reuse one read-only config instead of building a new one each time.
+        first_config, second_config = (call.kwargs["job_config"] for call in service.client.query.call_args_list)
+        self.assertIs(first_config, second_config)
+
+
+if __name__ == "__main__":
+    unittest.main()
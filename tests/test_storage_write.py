@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from google.cloud.bigquery_storage_v1 import BigQueryWriteClient, types
+
+from app.services.bigquery_service import BigQueryService
+from app.services.storage_write_service import StorageWriteService
+
+
+def _build_writer() -> StorageWriteService:
+    # Build a writer without opening a gRPC channel, capturing each append request instead.
+    writer = StorageWriteService.__new__(StorageWriteService)
+    writer.project_id = "project"
+    writer.dataset_id = "dataset"
+    writer._schemas = {}
+    writer._lock = threading.Lock()
+    writer.client = MagicMock()
+    writer.client.table_path = BigQueryWriteClient.table_path
+    writer.client.append_rows.return_value = iter([types.AppendRowsResponse()])
+    return writer
+
+
+class StorageWriteTests(unittest.TestCase):
+    def test_append_rows_encodes_typed_rows_for_the_default_stream(self) -> None:
+        # Confirm rows are proto-encoded with NULLs left unset and sent to the table's _default stream.
+        writer = _build_writer()
+        created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+
+        writer.append_rows(
+            "ingredient_set_items",
+            [("set_code", "STRING"), ("sku", "STRING"), ("created_at", "TIMESTAMP"), ("created_by", "STRING")],
+            [("AB", "A_1", created_at, None)],
+        )
+
+        request = next(writer.client.append_rows.call_args.args[0])
+        self.assertEqual(request.write_stream, "projects/project/datasets/dataset/tables/ingredient_set_items/streams/_default")
+        _, message_class = writer._schema(
+            "ingredient_set_items",
+            [("set_code", "STRING"), ("sku", "STRING"), ("created_at", "TIMESTAMP"), ("created_by", "STRING")],
+        )
+        row = message_class.FromString(request.proto_rows.rows.serialized_rows[0])
+        self.assertEqual(row.sku, "A_1")
+        self.assertEqual(row.created_at, 1704153600000000)
+        self.assertFalse(row.HasField("created_by"))
+
+    def test_append_rows_raises_on_row_errors(self) -> None:
+        # Confirm rejected rows surface as an error instead of being silently dropped.
+        writer = _build_writer()
+        response = types.AppendRowsResponse(row_errors=[types.RowError(index=0, message="bad row")])
+        writer.client.append_rows.return_value = iter([response])
+
+        with self.assertRaises(RuntimeError):
+            writer.append_rows("ingredient_sets", [("set_code", "STRING")], [("AB",)])
+
+    def test_service_routes_inserts_through_writer_instead_of_dml(self) -> None:
+        # Confirm an enabled writer replaces both the parent INSERT and the child multi-row INSERT.
+        service = BigQueryService.__new__(BigQueryService)
+        service.project_id = "project"
+        service.dataset_id = "dataset"
+        service._run = MagicMock()
+        service._row_writer = MagicMock()
+        service._row_writer.supports.return_value = True
+
+        service.insert_set("AB", "hash", ["A_1", "B_2"], "tester@example.com", None, None)
+
+        service._run.assert_not_called()
+        tables = [call.args[0] for call in service._row_writer.append_rows.call_args_list]
+        self.assertEqual(tables, ["ingredient_sets", "ingredient_set_items"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import unittest
+from datetime import datetime, timezone
+import threading
+from unittest.mock import MagicMock
+
+from cachetools import TTLCache
+
+from app.services.bigquery_service import BigQueryService
+
+
+def _build_service(*results: list, counts: tuple = ()) -> BigQueryService:
+    # Build a service instance without creating a real BigQuery client.
+    service = BigQueryService.__new__(BigQueryService)
+    service.project_id = "project"
+    service.dataset_id = "dataset"
+    # Return each canned result set in order so the number of submitted jobs can be asserted.
+    jobs = []
+    for rows in results:
+        job = MagicMock()
+        job.result.return_value = rows
+        jobs.append(job)
+    service._run = MagicMock(side_effect=jobs)
+    # Fallback counts take the inline-rows fast path and return rows directly.
+    service._run_and_fetch = MagicMock(side_effect=list(counts))
+    return service
+
+
+class WindowPaginationTests(unittest.TestCase):
+    def test_list_sets_reads_total_from_window_column(self) -> None:
+        # Confirm one job returns both the page rows and the filtered total.
+        created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        service = _build_service(
+            [
+                {"set_code": "AB", "created_at": created_at, "_total": 7},
+                {"set_code": "AC", "created_at": created_at, "_total": 7},
+            ]
+        )
+
+        items, total, next_cursor = service.list_sets_paginated(None, 1, 2)
+
+        self.assertEqual(service._run.call_count, 1)
+        self.assertIn("COUNT(1) OVER ()", service._run.call_args.args[0])
+        self.assertEqual(total, 7)
+        self.assertEqual(items, [{"set_code": "AB", "created_at": created_at}, {"set_code": "AC", "created_at": created_at}])
+        # A full page hands back an opaque cursor for the next seek page.
+        self.assertIsNotNone(next_cursor)
+
+    def test_list_batches_counts_separately_when_page_is_past_the_end(self) -> None:
+        # Confirm an empty later page still reports the real total via the fallback count.
+        service = _build_service([], counts=([{"total": 3}],))
+
+        items, total, next_cursor = service.list_batches_paginated(None, None, False, 5, 2)
+
+        self.assertEqual(service._run.call_count, 1)
+        self.assertEqual(service._run_and_fetch.call_count, 1)
+        self.assertEqual(items, [])
+        self.assertEqual(total, 3)
+        self.assertIsNone(next_cursor)
+
+    def test_list_batches_seeks_from_cursor_without_offset(self) -> None:
+        # Confirm cursor pages use a range predicate on the sort key instead of OFFSET.
+        created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        first_page = [{"created_at": created_at, "sku": "A_1", "ingredient_batch_code": "AB", "_total": 3}]
+        service = _build_service(first_page, [], counts=([{"total": 3}],))
+        _, _, cursor = service.list_batches_paginated(None, None, True, 1, 1)
+
+        items, total, _ = service.list_batches_paginated(None, None, True, 2, 1, cursor=cursor)
+
+        seek_query, seek_params = service._run.call_args_list[1].args
+        self.assertNotIn("OFFSET", seek_query)
+        self.assertIn("created_at > @cursor_0", seek_query)
+        self.assertEqual([param.value for param in seek_params if param.name.startswith("cursor_")], [created_at, "A_1", "AB"])
+        self.assertEqual((items, total), ([], 3))
+
+    def test_short_cursor_page_infers_total_without_count(self) -> None:
+        # Confirm the last (short) seek page derives the total from its position instead of running a count job.
+        created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        first_page = [
+            {"set_code": "AB", "created_at": created_at, "_total": 3},
+            {"set_code": "AC", "created_at": created_at, "_total": 3},
+        ]
+        service = _build_service(first_page, [{"set_code": "AD", "created_at": created_at}])
+        _, _, cursor = service.list_sets_paginated(None, 1, 2)
+
+        items, total, next_cursor = service.list_sets_paginated(None, 2, 2, cursor=cursor)
+
+        service._run_and_fetch.assert_not_called()
+        self.assertEqual((len(items), total, next_cursor), (1, 3, None))
+
+    def test_cursor_page_total_ignores_page_number_and_is_not_cached(self) -> None:
+        # Confirm the last seek page derives its total from the cursor's own offset, not a mismatched page parameter.
+        created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        first_page = [
+            {"set_code": "AB", "created_at": created_at, "_total": 3},
+            {"set_code": "AC", "created_at": created_at, "_total": 3},
+        ]
+        service = _build_service(first_page, [{"set_code": "AD", "created_at": created_at}])
+        _, _, cursor = service.list_sets_paginated(None, 1, 2)
+        service._lookup_cache = TTLCache(maxsize=16, ttl=60)
+        service._lookup_lock = threading.RLock()
+
+        _, total, _ = service.list_sets_paginated(None, 1, 2, cursor=cursor)
+
+        self.assertEqual(total, 3)
+        # A client-supplied token must never seed the shared total other users read.
+        self.assertEqual(len(service._lookup_cache), 0)
+
+    def test_want_total_false_skips_window_count(self) -> None:
+        # Confirm callers without page controls get rows without the COUNT(1) OVER () aggregate.
+        service = _build_service([{"set_code": "AB", "created_at": datetime(2024, 1, 2, tzinfo=timezone.utc)}])
+
+        _, total, _ = service.list_sets_paginated(None, 1, 1, want_total=False)
+
+        self.assertNotIn("COUNT(1) OVER ()", service._run.call_args.args[0])
+        self.assertIsNone(total)
+
+    def test_projection_keeps_sort_key_for_cursor(self) -> None:
+        # Confirm a narrowed projection still selects the sort columns the next cursor is built from.
+        service = _build_service([])
+
+        service.list_sets_paginated(None, 1, 10, projection=("set_code",))
+
+        query = service._run.call_args.args[0]
+        self.assertIn("SELECT set_code, created_at, COUNT(1) OVER ()", query)
+        self.assertNotIn("SELECT *", query)
+
+    def test_newest_first_listings_seek_backwards(self) -> None:
+        # Confirm descending listings order DESC and seek with "<" so cursors walk towards older rows.
+        created_at = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        first_page = [{"location_id": "AB AB AB", "created_at": created_at, "_total": 5}]
+        service = _build_service(first_page, [], counts=([{"total": 5}],))
+        _, _, cursor = service.list_location_codes_paginated(1, 1)
+
+        service.list_location_codes_paginated(2, 1, cursor=cursor)
+
+        seek_query = service._run.call_args.args[0]
+        self.assertIn("created_at < @cursor_0", seek_query)
+        self.assertIn("ORDER BY created_at DESC, location_id DESC", seek_query)
+        self.assertNotIn("OFFSET", seek_query)
+
+    def test_location_code_filter_uses_search_unless_partial(self) -> None:
+        # Confirm whole-token filters use SEARCH() and a leading * falls back to a substring scan.
+        service = _build_service([], [])
+
+        service.list_location_codes_paginated(1, 10, q="AB AC")
+        service.list_location_codes_paginated(1, 10, q="*2501")
+
+        token_query, token_params = service._run.call_args_list[0].args
+        partial_query, partial_params = service._run.call_args_list[1].args
+        self.assertIn("SEARCH(location_id, @query)", token_query)
+        self.assertEqual(token_params[0].value, "AB AC")
+        self.assertIn("CONTAINS_SUBSTR(location_id, @query)", partial_query)
+        self.assertEqual(partial_params[0].value, "2501")
+
+    def test_conversion1_how_entries_share_one_job_for_rows_and_total(self) -> None:
+        # Confirm offset-paged conversion listings read the total from the window column instead of a count job.
+        service = _build_service([{"conversion1_how_code": "AB", "_total": 4}])
+
+        items, total = service.list_conversion1_how_entries(None, 1, 1)
+
+        service._run_and_fetch.assert_not_called()
+        self.assertIn("COUNT(1) OVER ()", service._run.call_args.args[0])
+        self.assertEqual((items, total), ([{"conversion1_how_code": "AB"}], 4))
+
+    def test_deep_offset_pages_require_a_cursor(self) -> None:
+        # Confirm page numbers past the offset bound are refused before any job is submitted.
+        service = _build_service()
+
+        with self.assertRaises(ValueError):
+            service.list_formulations_paginated({}, 1000, 200)
+
+        service._run.assert_not_called()
+
+    def test_list_sets_rejects_malformed_cursor(self) -> None:
+        # Confirm tampered cursors surface as ValueError so the API can answer 400.
+        service = _build_service()
+
+        with self.assertRaises(ValueError):
+            service.list_sets_paginated(None, 2, 10, cursor="not-a-cursor")
+
+
+if __name__ == "__main__":
+    unittest.main()